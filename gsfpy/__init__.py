@@ -1,4 +1,8 @@
 import os
+import struct
+import sys
+from importlib import import_module
+from typing import List, Optional, Tuple, Union
 
 
 def get_default_gsf_version() -> str:
@@ -57,4 +61,174 @@ def mirror_default_gsf_version_submodule(
         )
 
 
-mirror_default_gsf_version_submodule(globals())
+# Versions of GSF that the version-specific packages are built for, from oldest to
+# newest. Each package also reads files written with earlier versions of GSF.
+_GSF_PACKAGE_VERSIONS = ((3, 8), (3, 9))
+
+# Every GSF file begins with a header record, whose data is the GSF version string
+_HEADER_RECORD = struct.Struct(">II12s")
+_RECORD_ID_MASK = 0x003FFFFF
+_GSF_RECORD_HEADER = 1
+_VERSION_PREFIX = b"GSF-v"
+
+
+def read_gsf_version(path: Union[str, os.PathLike]) -> Tuple[int, int]:
+    """
+    read_gsf_version() reads the version of GSF that a file was written with from its
+    header record, without opening the file with libgsf.
+
+    Params:
+        path: Location of the GSF file
+
+    Returns: Tuple[int, int] - The major and minor version e.g. (3, 9)
+
+    Raises: ValueError - if the file does not begin with a GSF header record
+    """
+    with open(path, "rb") as gsf_file:
+        header = gsf_file.read(_HEADER_RECORD.size)
+
+    if len(header) == _HEADER_RECORD.size:
+        _, record_id, version = _HEADER_RECORD.unpack(header)
+        version = version.rstrip(b"\0")
+        if record_id & _RECORD_ID_MASK == _GSF_RECORD_HEADER and version.startswith(
+            _VERSION_PREFIX
+        ):
+            major, _, minor = version[len(_VERSION_PREFIX) :].partition(b".")
+            if major.isdigit() and minor.isdigit():
+                return int(major), int(minor)
+    raise ValueError(f"{path} does not begin with a GSF header record")
+
+
+def get_gsf_package_version(gsf_version: Tuple[int, int]) -> str:
+    """
+    get_gsf_package_version() chooses the version-specific package to read files
+    written with a version of GSF: the package for the earliest version of GSF that is
+    no older than it, or the package for the newest version if none is.
+
+    Params:
+        gsf_version: The major and minor version e.g. (3, 6)
+
+    Returns: str - The version of the package in the form "X_XX" e.g. "3_08"
+    """
+    major, minor = next(
+        (
+            package_version
+            for package_version in _GSF_PACKAGE_VERSIONS
+            if package_version >= tuple(gsf_version)
+        ),
+        _GSF_PACKAGE_VERSIONS[-1],
+    )
+    return f"{major}_{minor:02d}"
+
+
+def open_any(
+    path: Union[str, os.PathLike],
+    mode: Optional[int] = None,
+    buffer_size: Optional[int] = None,
+):
+    """
+    open_any() opens a GSF file with the version-specific package for the version of
+    GSF it was written with (see read_gsf_version() and get_gsf_package_version()),
+    whatever the default GSF version, so that files written with different versions
+    of GSF may be read together. Each package is imported, and loads its libgsf, only
+    once, when the first file needing it is opened.
+
+    Params:
+        path: Location of the GSF file
+        mode: FileMode to open the file in (read-only by default), which may not be
+              GSF_CREATE as the file must already exist
+        buffer_size: If a value is provided then a buffer will be used to read the
+                     file
+
+    Returns: GsfFile - Of the version-specific package, e.g. gsfpy3_09.GsfFile
+
+    Raises:
+        ValueError - if the file does not begin with a GSF header record
+        GsfException - if anything else went wrong
+    """
+    package_name = f"gsfpy{get_gsf_package_version(read_gsf_version(path))}"
+    file_mode = import_module(f"{package_name}.enums").FileMode
+    mode = file_mode.GSF_READONLY if mode is None else file_mode(mode)
+    if mode == file_mode.GSF_CREATE:
+        raise ValueError("Files opened with open_any() must already exist")
+    return import_module(package_name).open_gsf(path, mode, buffer_size)
+
+
+def inspect(path: Union[str, os.PathLike], use_index: bool = False):
+    """
+    inspect() summarises what a GSF file holds, e.g. for a catalogue of many files,
+    with the version-specific package for the version of GSF it was written with (see
+    open_any()): how many records of each type, the time span, sensors, numbers of
+    beams, beam arrays and scale factors of its pings, and its size. Only one pass is
+    made over the file.
+
+    Params:
+        path: Location of the GSF file
+        use_index: Whether to count the records through the file's index, which
+                   libgsf builds alongside the file on first use and reuses after
+                   that, rather than by reading through the file
+
+    Returns: FileInventory - Of the version-specific package, e.g.
+             gsfpy3_09.inventory.FileInventory
+
+    Raises:
+        ValueError - if the file does not begin with a GSF header record
+        GsfException - if anything else went wrong
+    """
+    package_name = f"gsfpy{get_gsf_package_version(read_gsf_version(path))}"
+    return import_module(f"{package_name}.inventory").inspect(path, use_index)
+
+
+# Record structure modules of the version-specific package, which it imports only once
+# they are used, but which have always been mirrored here
+_STRUCTURE_SUBMODULES = (
+    "GSF_POSITION",
+    "GSF_POSITION_OFFSETS",
+    "gsfMBParams",
+    "gsfRecords",
+)
+
+
+# Whether the version-specific package has been mirrored. Reloading gsfpy mirrors it
+# again straight away, as the default GSF version may have changed.
+_remirror = globals().get("_mirrored", False)
+_mirrored = False
+
+
+def _mirror_default_gsf_version():
+    global _mirrored
+    if _mirrored:
+        return
+
+    for submodule_name in _STRUCTURE_SUBMODULES:
+        __import__(f"gsfpy{get_default_gsf_version()}.{submodule_name}")
+    mirror_default_gsf_version_submodule(globals())
+    _mirrored = True
+
+
+def __getattr__(name: str):
+    """
+    Mirrors the version-specific package once any of its members is first used (see
+    PEP 562), so that importing gsfpy, or a submodule of it such as gsfpy.enums, does
+    not import the whole of the package.
+    """
+    if name.startswith("__") and name != "__all__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    _mirror_default_gsf_version()
+    if name == "__all__":
+        return [member for member in globals() if not member.startswith("_")]
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def __dir__() -> List[str]:
+    _mirror_default_gsf_version()
+    return sorted(globals())
+
+
+# Modules cannot define __getattr__() before Python 3.7
+if _remirror or sys.version_info < (3, 7):
+    _mirror_default_gsf_version()
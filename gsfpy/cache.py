@@ -0,0 +1,3 @@
+from gsfpy import mirror_default_gsf_version_submodule
+
+mirror_default_gsf_version_submodule(globals(), "cache")
@@ -0,0 +1,445 @@
+"""
+Catalogue of an archive of GSF files, held in a SQLite database and updated
+incrementally by crawling directory trees with a pool of processes. Files are
+summarised with inspect(), whatever the version of GSF they were written with, and
+only files that are new, or whose size or modification time has changed since they
+were last catalogued, are read. The catalogue may then be queried by time span and
+bounding box.
+
+The gsfpy-catalog command (see main()) does both from the command line.
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+from calendar import timegm
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from gsfpy import inspect, read_gsf_version
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    gsf_version TEXT,
+    number_pings INTEGER,
+    start_time REAL,
+    end_time REAL,
+    min_latitude REAL,
+    min_longitude REAL,
+    max_latitude REAL,
+    max_longitude REAL,
+    record_counts TEXT,
+    sensor_ids TEXT,
+    number_beams TEXT,
+    subrecords TEXT,
+    scaled_subrecords TEXT,
+    contains_amplitude INTEGER,
+    contains_imagery INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS files_time ON files (start_time, end_time);
+CREATE INDEX IF NOT EXISTS files_latitude ON files (min_latitude, max_latitude);
+"""
+
+# Columns of the files table filled in from the inventory of a file
+_INVENTORY_COLUMNS = (
+    "gsf_version",
+    "number_pings",
+    "start_time",
+    "end_time",
+    "min_latitude",
+    "min_longitude",
+    "max_latitude",
+    "max_longitude",
+    "record_counts",
+    "sensor_ids",
+    "number_beams",
+    "subrecords",
+    "scaled_subrecords",
+    "contains_amplitude",
+    "contains_imagery",
+)
+_COLUMNS = ("path", "size", "mtime_ns", *_INVENTORY_COLUMNS, "error")
+_INSERT = (
+    f"INSERT OR REPLACE INTO files ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
+
+DEFAULT_SUFFIXES = (".gsf",)
+
+# Number of files catalogued between commits, which bounds the work lost if a crawl
+# is interrupted without making every file a transaction of its own
+_COMMIT_EVERY = 1000
+
+# Number of files queued per process, which keeps every process busy without holding
+# the whole archive in memory
+_QUEUED_PER_WORKER = 4
+
+
+class CatalogUpdate(NamedTuple):
+    """Number of files of each outcome of update_catalog()"""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # Files that could not be read, which are catalogued with the error until they
+    # change
+    failed: int = 0
+    removed: int = 0
+
+
+def connect(catalog: Union[str, os.PathLike]) -> sqlite3.Connection:
+    """
+    :param catalog: Location of the SQLite database, which is created if need be
+    :return: Connection to the catalogue
+    """
+    connection = sqlite3.connect(os.fspath(catalog))
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def iter_gsf_files(
+    roots: Iterable[Union[str, os.PathLike]],
+    suffixes: Sequence[str] = DEFAULT_SUFFIXES,
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Walks directory trees for GSF files, without following symbolic links to
+    directories
+    :param roots: Directories to walk
+    :param suffixes: Suffixes of the names of GSF files, matched case-insensitively
+    :return: Iterator of the absolute path, size and modification time in nanoseconds
+             of each file
+    """
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+    directories = [os.path.abspath(root) for root in roots]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime_ns
+
+
+def _real(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _inspect_file(path: str, use_index: bool) -> Tuple[Optional[tuple], Optional[str]]:
+    """
+    Inspects a file in a process of the pool
+    :return: Values of the _INVENTORY_COLUMNS, or the error that the file could not be
+             inspected because of
+    """
+    try:
+        major, minor = read_gsf_version(path)
+        inventory = inspect(path, use_index)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+    return (
+        (
+            f"{major}.{minor:02d}",
+            inventory.number_pings,
+            _real(inventory.start_time),
+            _real(inventory.end_time),
+            _real(inventory.min_latitude),
+            _real(inventory.min_longitude),
+            _real(inventory.max_latitude),
+            _real(inventory.max_longitude),
+            json.dumps(
+                {
+                    record_type.name: count
+                    for record_type, count in inventory.record_counts.items()
+                }
+            ),
+            json.dumps(inventory.sensor_ids),
+            json.dumps(inventory.number_beams),
+            json.dumps([subrecord.name for subrecord in inventory.subrecords]),
+            json.dumps([subrecord.name for subrecord in inventory.scaled_subrecords]),
+            int(inventory.contains_amplitude),
+            int(inventory.contains_imagery),
+        ),
+        None,
+    )
+
+
+def _is_under(roots: List[str]):
+    prefixes = tuple(os.path.join(root, "") for root in roots)
+    return lambda path: path.startswith(prefixes)
+
+
+def update_catalog(
+    catalog: Union[str, os.PathLike],
+    roots: Iterable[Union[str, os.PathLike]],
+    max_workers: Optional[int] = None,
+    use_index: bool = False,
+    suffixes: Sequence[str] = DEFAULT_SUFFIXES,
+    force: bool = False,
+    prune: bool = False,
+) -> CatalogUpdate:
+    """
+    Crawls directory trees for GSF files, inspecting those that are new or have
+    changed since they were last catalogued in a pool of processes, one file per
+    task, and stores their inventories in the catalogue. Files are walked, and results
+    written, as other files are being inspected, so crawls of archives of any size
+    start straight away and hold only a few files in memory at once.
+    :param catalog: Location of the SQLite database, which is created if need be
+    :param roots: Directories to crawl
+    :param max_workers: Maximum number of processes, by default the number of CPUs
+    :param use_index: Whether to count the records of each file through its index,
+                      which libgsf builds alongside the file on first use
+    :param suffixes: Suffixes of the names of GSF files, matched case-insensitively
+    :param force: Whether to inspect files again even when they have not changed
+    :param prune: Whether to remove files under the roots that no longer exist from
+                  the catalogue
+    :return: CatalogUpdate
+    """
+    roots = [os.path.abspath(root) for root in roots]
+    max_workers = max_workers or os.cpu_count() or 1
+    outcomes: Dict[str, int] = dict.fromkeys(CatalogUpdate._fields, 0)
+    pending = {}
+    uncommitted = 0
+
+    connection = connect(catalog)
+    if prune:
+        connection.execute("CREATE TEMP TABLE seen (path TEXT PRIMARY KEY)")
+
+    def store(return_when: str):
+        nonlocal uncommitted
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            path, size, mtime_ns, known = pending.pop(future)
+            values, error = future.result()
+            if values is None:
+                values = (None,) * len(_INVENTORY_COLUMNS)
+                outcomes["failed"] += 1
+            else:
+                outcomes["updated" if known else "added"] += 1
+            connection.execute(_INSERT, (path, size, mtime_ns, *values, error))
+            uncommitted += 1
+        if uncommitted >= _COMMIT_EVERY:
+            connection.commit()
+            uncommitted = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers) as executor:
+            for path, size, mtime_ns in iter_gsf_files(roots, suffixes):
+                if prune:
+                    connection.execute("INSERT INTO seen VALUES (?)", (path,))
+                catalogued = connection.execute(
+                    "SELECT size, mtime_ns FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if catalogued == (size, mtime_ns) and not force:
+                    outcomes["unchanged"] += 1
+                    continue
+
+                future = executor.submit(_inspect_file, path, use_index)
+                pending[future] = path, size, mtime_ns, catalogued is not None
+                if len(pending) >= max_workers * _QUEUED_PER_WORKER:
+                    store(FIRST_COMPLETED)
+            store(ALL_COMPLETED)
+
+        if prune:
+            connection.create_function("is_under", 1, _is_under(roots))
+            outcomes["removed"] = connection.execute(
+                "DELETE FROM files WHERE is_under(path) "
+                "AND path NOT IN (SELECT path FROM seen)"
+            ).rowcount
+        connection.commit()
+    finally:
+        connection.close()
+
+    return CatalogUpdate(**outcomes)
+
+
+def query_catalog(
+    catalog: Union[str, os.PathLike],
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    bounds: Optional[Sequence[float]] = None,
+) -> List[str]:
+    """
+    Finds the catalogued files whose pings overlap a time span and bounding box
+    :param catalog: Location of the SQLite database
+    :param start_time: Seconds since the beginning of the epoch from which pings must
+                       overlap, by default from any time
+    :param end_time: Seconds since the beginning of the epoch until which pings must
+                     overlap, by default until any time
+    :param bounds: Minimum latitude, minimum longitude, maximum latitude and maximum
+                   longitude of the box that ping positions must overlap, in
+                   degrees, by default anywhere
+    :return: Paths of the files, in order
+    """
+    conditions = ["error IS NULL", "number_pings > 0"]
+    parameters = []
+    if start_time is not None:
+        conditions.append("end_time >= ?")
+        parameters.append(start_time)
+    if end_time is not None:
+        conditions.append("start_time <= ?")
+        parameters.append(end_time)
+    if bounds is not None:
+        min_latitude, min_longitude, max_latitude, max_longitude = bounds
+        conditions.extend(
+            [
+                "max_latitude >= ?",
+                "min_latitude <= ?",
+                "max_longitude >= ?",
+                "min_longitude <= ?",
+            ]
+        )
+        parameters.extend([min_latitude, max_latitude, min_longitude, max_longitude])
+
+    connection = connect(catalog)
+    try:
+        rows = connection.execute(
+            f"SELECT path FROM files WHERE {' AND '.join(conditions)} ORDER BY path",
+            parameters,
+        ).fetchall()
+    finally:
+        connection.close()
+    return [path for path, in rows]
+
+
+def _parse_time(text: str) -> float:
+    """
+    :param text: Seconds since the beginning of the epoch, or a UTC date and time of
+                 the form YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS
+    :return: Seconds since the beginning of the epoch
+    """
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for time_format in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+        try:
+            return float(timegm(datetime.strptime(text, time_format).timetuple()))
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"invalid time: {text!r}")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gsfpy-catalog",
+        description="Catalogue archives of GSF files in a SQLite database",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    update = commands.add_parser(
+        "update", help="crawl directories and catalogue new and changed files"
+    )
+    update.add_argument("catalog", help="SQLite database, created if need be")
+    update.add_argument("roots", nargs="+", help="directories to crawl")
+    update.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes (default: number of CPUs)",
+    )
+    update.add_argument(
+        "--use-index",
+        action="store_true",
+        help="count records through the index libgsf builds alongside each file",
+    )
+    update.add_argument(
+        "--suffix",
+        dest="suffixes",
+        action="append",
+        help=f"GSF file name suffix, repeatable (default: {DEFAULT_SUFFIXES[0]})",
+    )
+    update.add_argument(
+        "--force", action="store_true", help="inspect unchanged files again"
+    )
+    update.add_argument(
+        "--prune",
+        action="store_true",
+        help="remove files under the directories that no longer exist",
+    )
+
+    query = commands.add_parser(
+        "query", help="list files overlapping a time span and bounding box"
+    )
+    query.add_argument("catalog", help="SQLite database")
+    query.add_argument(
+        "--start",
+        type=_parse_time,
+        help="seconds since the epoch, or UTC YYYY-MM-DD[THH:MM:SS]",
+    )
+    query.add_argument(
+        "--end",
+        type=_parse_time,
+        help="seconds since the epoch, or UTC YYYY-MM-DD[THH:MM:SS]",
+    )
+    query.add_argument(
+        "--bounds",
+        nargs=4,
+        type=float,
+        metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"),
+        help="bounding box in degrees",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the gsfpy-catalog command, e.g.
+
+        gsfpy-catalog update archive.sqlite /data/surveys --prune
+        gsfpy-catalog query archive.sqlite --start 2016-03-23 --bounds 8 167 9 168
+
+    :param argv: Command line arguments, by default those of the process
+    :return: Exit status
+    """
+    arguments = _parser().parse_args(argv)
+
+    if arguments.command == "update":
+        if arguments.workers is not None and arguments.workers < 1:
+            _parser().error("the number of workers must be at least 1")
+        update = update_catalog(
+            arguments.catalog,
+            arguments.roots,
+            max_workers=arguments.workers,
+            use_index=arguments.use_index,
+            suffixes=arguments.suffixes or DEFAULT_SUFFIXES,
+            force=arguments.force,
+            prune=arguments.prune,
+        )
+        print(
+            ", ".join(
+                f"{outcome} {count}" for outcome, count in update._asdict().items()
+            )
+        )
+        return 0
+
+    for path in query_catalog(
+        arguments.catalog, arguments.start, arguments.end, arguments.bounds
+    ):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
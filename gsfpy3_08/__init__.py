@@ -1,7 +1,17 @@
+import sys
 from ctypes import byref, c_int
-from os import fsencode
-from pathlib import Path
-from typing import Optional, Tuple, Union
+from os import fsencode, fspath
+from threading import Lock, RLock
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from gsfpy3_08.bindings import (
     gsfClose,
@@ -14,19 +24,50 @@ from gsfpy3_08.bindings import (
     gsfStringError,
     gsfWrite,
 )
-from gsfpy3_08.enums import FileMode, RecordType, SeekOption
+from gsfpy3_08.constants import (
+    GSF_CHECKSUM_FAILURE,
+    GSF_PARTIAL_RECORD_AT_END_OF_FILE,
+    GSF_READ_ERROR,
+    GSF_READ_TO_END_OF_FILE,
+    GSF_RECORD_SIZE_ERROR,
+    GSF_STREAM_DECODE_FAILURE,
+    GSF_TOO_MANY_OPEN_FILES,
+)
+from gsfpy3_08.enums import FileMode, ReadStatus, RecordType, SeekOption
 from gsfpy3_08.gsfDataID import c_gsfDataID
-from gsfpy3_08.gsfRecords import c_gsfRecords
+
+# c_gsfRecords is made up of every record structure, which take as long to import as
+# the rest of gsfpy3_08, so it is only imported once records are read or written (see
+# __getattr__())
+if TYPE_CHECKING or sys.version_info < (3, 7):
+    from gsfpy3_08.gsfRecords import c_gsfRecords
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from gsfpy3_08.params import MBParams
+
+# libgsf decodes and encodes the records of every file through one static buffer, and
+# reports errors through one global error code, so calls into it are serialised across
+# threads. Work done on the records afterwards, e.g. in NumPy, still runs in parallel.
+_LIBGSF_LOCK = Lock()
 
 
 class GsfException(Exception):
     """
-    Generates an exception based on the last error code
+    Generates an exception based on the given error code and message, by default the
+    last error code, in which case it must be created while holding the lock on
+    libgsf that was held for the failing call (see _call()). Errors that callers
+    commonly handle have subclasses of their own (see _exception()).
     """
 
-    def __init__(self):
-        self._error_code = gsfIntError()
-        self._error_message = gsfStringError().decode()
+    def __init__(
+        self, error_code: Optional[int] = None, error_message: Optional[str] = None
+    ):
+        self._error_code = gsfIntError() if error_code is None else error_code
+        self._error_message = (
+            gsfStringError().decode() if error_message is None else error_message
+        )
         super().__init__(f"[{self._error_code}] {self._error_message}")
 
     @property
@@ -38,14 +79,80 @@ class GsfException(Exception):
         return self._error_message
 
 
+class GsfEndOfFile(GsfException):
+    """
+    Raised when a read reaches the end of the file
+    """
+
+
+class GsfReadError(GsfException):
+    """
+    Raised when a record cannot be read, because the file is unreadable or corrupt
+    """
+
+
+class GsfTooManyOpenFiles(GsfException):
+    """
+    Raised when opening a file would exceed the number of files libgsf allows to be
+    open at once
+    """
+
+
+_EXCEPTIONS = {
+    GSF_READ_TO_END_OF_FILE: GsfEndOfFile,
+    GSF_TOO_MANY_OPEN_FILES: GsfTooManyOpenFiles,
+    GSF_READ_ERROR: GsfReadError,
+    GSF_RECORD_SIZE_ERROR: GsfReadError,
+    GSF_CHECKSUM_FAILURE: GsfReadError,
+    GSF_STREAM_DECODE_FAILURE: GsfReadError,
+    GSF_PARTIAL_RECORD_AT_END_OF_FILE: GsfReadError,
+}
+
+
+def _exception(
+    error_code: Optional[int] = None, error_message: Optional[str] = None
+) -> GsfException:
+    """
+    :param error_code: Error code, by default the last error code
+    :param error_message: Error message, by default that of the last error code
+    :return: Exception of the class for the error code
+    """
+    error_code = gsfIntError() if error_code is None else error_code
+    return _EXCEPTIONS.get(error_code, GsfException)(error_code, error_message)
+
+
+class ReadResult(NamedTuple):
+    """
+    Outcome of GsfFile.try_read()
+    """
+
+    status: ReadStatus
+    data_id: c_gsfDataID
+    records: "c_gsfRecords"
+    # Error code and message, unless the status is OK
+    error_code: int = 0
+    error_message: Optional[str] = None
+
+    def exception(self) -> Optional[GsfException]:
+        """
+        :return: Exception describing why the read failed, or None if it succeeded
+        """
+        if self.status == ReadStatus.OK:
+            return None
+        return _exception(self.error_code, self.error_message)
+
+
 class GsfFile:
     """
-    Represents an open connection to a GSF file
+    Represents an open connection to a GSF file. Each operation on the file holds its
+    lock, so a file may be shared between threads.
     """
 
     def __init__(self, handle: c_int, file_mode: FileMode):
         self._handle = handle
         self._file_mode = file_mode
+        self._lock = RLock()
+        self._mb_params: Optional["MBParams"] = None
 
     def __enter__(self):
         return self
@@ -60,25 +167,54 @@ class GsfFile:
         """
         return self._file_mode
 
+    @property
+    def handle(self) -> c_int:
+        """
+        Handle of the open file, for use with the functions in the bindings module
+        """
+        return self._handle
+
+    @property
+    def lock(self) -> RLock:
+        """
+        Lock held by each operation on the file. Threads sharing the file may hold it
+        across a sequence of operations, e.g. a seek followed by reads, to keep the
+        operations of other threads from interleaving with them.
+        """
+        return self._lock
+
+    @property
+    def mb_params(self) -> Optional["MBParams"]:
+        """
+        Processing parameters of the processing parameters record most recently read
+        from the file, parsed once as the record is read and replaced as each later
+        one is read, so pings read after it may use them without parsing them again.
+        None if no processing parameters record has been read, or the last one could
+        not be parsed.
+        """
+        return self._mb_params
+
     def close(self):
         """
         Once this method has been called further operations will fail
         :raises GsfException: Raised if anything went wrong
         """
-        _handle_failure(gsfClose(self._handle))
+        with self._lock:
+            _call(gsfClose, self._handle)
 
     def seek(self, option: SeekOption):
         """
         :param option: Where to seek to
         :raises GsfException: Raised if anything went wrong
         """
-        _handle_failure(gsfSeek(self._handle, option))
+        with self._lock:
+            _call(gsfSeek, self._handle, option)
 
     def read(
         self,
         desired_record: RecordType = RecordType.GSF_NEXT_RECORD,
         record_number: int = 0,
-    ) -> Tuple[c_gsfDataID, c_gsfRecords]:
+    ) -> Tuple[c_gsfDataID, "c_gsfRecords"]:
         """
         When the file is open in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode then the
         record_number parameter may be used to indicate which instance of the record to
@@ -86,21 +222,75 @@ class GsfFile:
         :param desired_record: Record type to read
         :param record_number: nth occurrence of the record to read from, starting from 1
         :return: Tuple of c_gsfDataID and c_gsfRecords
-        :raises GsfException: Raised if anything went wrong
+        :raises GsfEndOfFile: Raised if the read reached the end of the file
+        :raises GsfException: Raised if anything else went wrong
         """
+        from gsfpy3_08.gsfRecords import c_gsfRecords
+
         data_id = c_gsfDataID()
         data_id.record_number = record_number
 
         records = c_gsfRecords()
 
-        _handle_failure(
-            gsfRead(self._handle, desired_record, byref(data_id), byref(records))
-        )
+        with self._lock:
+            _call(gsfRead, self._handle, desired_record, byref(data_id), byref(records))
+            self._track_mb_params(data_id, records)
 
         return data_id, records
 
+    def try_read(
+        self,
+        desired_record: RecordType = RecordType.GSF_NEXT_RECORD,
+        record_number: int = 0,
+        data_id: Optional[c_gsfDataID] = None,
+        records: Optional["c_gsfRecords"] = None,
+    ) -> ReadResult:
+        """
+        Reads a record as read() does, but reports reaching the end of the file or
+        failing in the status of the result rather than raising an exception, and may
+        read into the given buffers rather than new ones, so suits tight loops.
+        :param desired_record: Record type to read
+        :param record_number: nth occurrence of the record to read from, starting from 1
+        :param data_id: Buffer to read the record identifier into, if any
+        :param records: Buffer to read the record into, if any
+        :return: ReadResult
+        """
+        from gsfpy3_08.gsfRecords import c_gsfRecords
+
+        data_id = c_gsfDataID() if data_id is None else data_id
+        data_id.record_number = record_number
+        records = c_gsfRecords() if records is None else records
+
+        with self._lock:
+            with _LIBGSF_LOCK:
+                return_code = gsfRead(
+                    self._handle, desired_record, byref(data_id), byref(records)
+                )
+                if return_code < 0:
+                    error_code = gsfIntError()
+                    error_message = gsfStringError().decode()
+            if return_code >= 0:
+                self._track_mb_params(data_id, records)
+                return ReadResult(ReadStatus.OK, data_id, records)
+        status = (
+            ReadStatus.END_OF_FILE
+            if error_code == GSF_READ_TO_END_OF_FILE
+            else ReadStatus.ERROR
+        )
+        return ReadResult(status, data_id, records, error_code, error_message)
+
+    def _track_mb_params(self, data_id: c_gsfDataID, records: "c_gsfRecords"):
+        if data_id.recordID != RecordType.GSF_RECORD_PROCESSING_PARAMETERS:
+            return
+        from gsfpy3_08.params import MBParams
+
+        try:
+            self._mb_params = MBParams.from_records(records)
+        except GsfException:
+            self._mb_params = None
+
     def write(
-        self, records: c_gsfRecords, record_type: RecordType, record_number: int = 0
+        self, records: "c_gsfRecords", record_type: RecordType, record_number: int = 0
     ):
         """
         When the file is open in GSF_UPDATE_INDEX mode then the record_number parameter
@@ -114,7 +304,8 @@ class GsfFile:
         data_id.recordID = record_type
         data_id.record_number = record_number
 
-        _handle_failure(gsfWrite(self._handle, byref(data_id), byref(records)))
+        with self._lock:
+            _call(gsfWrite, self._handle, byref(data_id), byref(records))
 
     def get_number_records(self, desired_record: RecordType) -> int:
         """
@@ -123,13 +314,12 @@ class GsfFile:
         :param desired_record: Specifies the type of record to count
         :return: Number of records of type desired_record, otherwise -1
         """
-        count = gsfGetNumberRecords(self._handle, desired_record)
-        _handle_failure(count)
-        return count
+        with self._lock:
+            return _call(gsfGetNumberRecords, self._handle, desired_record)
 
 
 def open_gsf(
-    path: Union[str, Path],
+    path: Union[str, "Path"],
     mode: FileMode = FileMode.GSF_READONLY,
     buffer_size: Optional[int] = None,
 ) -> GsfFile:
@@ -144,26 +334,152 @@ def open_gsf(
     """
     handle = c_int(0)
 
-    if isinstance(path, Path):
-        path = str(path)
+    path = fspath(path)
 
-    _handle_failure(
-        gsfOpen(fsencode(path), mode, byref(handle))
-        if buffer_size is None
-        else gsfOpenBuffered(path.encode(), mode, byref(handle), buffer_size)
-    )
+    if buffer_size is None:
+        _call(gsfOpen, fsencode(path), mode, byref(handle))
+    else:
+        _call(gsfOpenBuffered, path.encode(), mode, byref(handle), buffer_size)
 
     return GsfFile(handle, mode)
 
 
+def _iter_records(
+    gsf_file: GsfFile, desired_record: RecordType
+) -> Iterator["c_gsfRecords"]:
+    """
+    Reads every record of the given type in turn. Files open in GSF_READONLY_INDEX or
+    GSF_UPDATE_INDEX mode are read by record number, otherwise the file is rewound
+    before and after reading, holding its lock throughout so that other threads
+    cannot move it in between. The file is rewound and its lock released as soon as
+    the iterator is exhausted, fails or is closed, so a caller stopping early must
+    close it (e.g. with contextlib.closing) in the thread that iterated it.
+    :param gsf_file: File to read from
+    :param desired_record: Record type to read
+    :return: Iterator of the records read
+    :raises GsfException: Raised if anything went wrong
+    """
+    if gsf_file.file_mode in (FileMode.GSF_READONLY_INDEX, FileMode.GSF_UPDATE_INDEX):
+        for record_number in range(1, gsf_file.get_number_records(desired_record) + 1):
+            _, records = gsf_file.read(desired_record, record_number)
+            yield records
+        return
+
+    with gsf_file.lock:
+        gsf_file.seek(SeekOption.GSF_REWIND)
+        try:
+            while True:
+                result = gsf_file.try_read(desired_record)
+                if result.status == ReadStatus.END_OF_FILE:
+                    break
+                if result.status == ReadStatus.ERROR:
+                    raise result.exception()
+                yield result.records
+        finally:
+            gsf_file.seek(SeekOption.GSF_REWIND)
+
+
+def _read_next(
+    gsf_file: GsfFile,
+    desired_record: RecordType,
+    data_id: c_gsfDataID,
+    records: "c_gsfRecords",
+) -> bool:
+    """
+    Reads the next record of the given type into the given buffers
+    :param gsf_file: File to read from
+    :param desired_record: Record type to read
+    :param data_id: Buffer for the identifier of the record
+    :param records: Buffer for the record
+    :return: True if a record was read, False at the end of the file
+    :raises GsfException: Raised if anything else went wrong
+    """
+    result = gsf_file.try_read(desired_record, 0, data_id, records)
+    if result.status == ReadStatus.ERROR:
+        raise result.exception()
+    return result.status == ReadStatus.OK
+
+
+def _read_into(
+    gsf_file: GsfFile,
+    desired_record: RecordType,
+    data_id: c_gsfDataID,
+    records: "c_gsfRecords",
+    record_number: int = 0,
+):
+    """
+    Reads a record into the given buffers, as GsfFile.read() does into new ones
+    :param gsf_file: File to read from
+    :param desired_record: Record type to read
+    :param data_id: Buffer for the identifier of the record
+    :param records: Buffer for the record
+    :param record_number: nth occurrence of the record to read from, starting from 1
+    :raises GsfEndOfFile: Raised if the read reached the end of the file
+    :raises GsfException: Raised if anything else went wrong
+    """
+    result = gsf_file.try_read(desired_record, record_number, data_id, records)
+    if result.status != ReadStatus.OK:
+        raise result.exception()
+
+
+def _write_record(
+    gsf_file: GsfFile, data_id: c_gsfDataID, records: "c_gsfRecords"
+) -> int:
+    """
+    Writes a record with the given identifier, e.g. that of a record just read from
+    another file, holding the lock of the file as GsfFile.write() does
+    :param gsf_file: File to write to
+    :param data_id: Identifier of the record
+    :param records: Record to write
+    :return: Number of bytes written
+    :raises GsfException: Raised if anything went wrong
+    """
+    with gsf_file.lock:
+        return _call(gsfWrite, gsf_file.handle, byref(data_id), byref(records))
+
+
 _ERROR_CODE = -1
 
 
+def _call(function: Callable[..., int], *args) -> int:
+    """
+    Calls one of the functions in the gsfpy3_08.bindings package while holding the
+    lock on libgsf, so that on failure the error code and message are those of this
+    call, and not of a call made meanwhile in another thread
+    :param function: Function to call
+    :param args: Arguments to call the function with
+    :return: The return code of the function
+    :raises GsfException: Raised if the function failed
+    """
+    with _LIBGSF_LOCK:
+        return_code = function(*args)
+        if return_code == _ERROR_CODE:
+            raise _exception()
+    return return_code
+
+
 def _handle_failure(return_code: int):
     """
-    Error handling logic
+    Error handling logic. Prefer _call(), which captures the error atomically with the
+    failing call.
     :param return_code: The return code from one of functions in the gsfpy3_08.bindings
                         package
     """
     if return_code == _ERROR_CODE:
-        raise GsfException()
+        with _LIBGSF_LOCK:
+            raise _exception()
+
+
+def __getattr__(name: str):
+    """
+    Imports c_gsfRecords once it is first used (see PEP 562)
+    """
+    if name == "c_gsfRecords":
+        from gsfpy3_08.gsfRecords import c_gsfRecords
+
+        return c_gsfRecords
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), "c_gsfRecords"})
@@ -0,0 +1,14 @@
+"""Helpers for the files that GSF files are read from and derived data is kept in"""
+import os
+from pathlib import Path
+from typing import Tuple, Union
+
+
+def _file_stamp(path: Union[str, Path]) -> Tuple[int, int]:
+    """
+    :param path: Location of a file
+    :return: Size of the file in bytes and the time it was last modified in
+             nanoseconds, which together tell whether data derived from it is stale
+    """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
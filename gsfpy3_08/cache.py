@@ -0,0 +1,186 @@
+"""On-disk cache of the decoded swath bathymetry pings of GSF files"""
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08._files import _file_stamp
+from gsfpy3_08.columnar import (
+    BEAM_ARRAY_SUBRECORDS,
+    DEFAULT_BLOCK_SIZE,
+    PING_FIELDS,
+    PingBlock,
+    iter_ping_blocks,
+)
+
+_MANIFEST_FILE = "cache.json"
+_CACHE_VERSION = 1
+_CHUNK_PATTERN = "chunk_*.npz"
+
+
+class PingCache:
+    """
+    Decoded pings of a GSF file held in a directory as compressed chunks, one .npz
+    file per block of pings holding one array per field. Fields are decompressed
+    only as they are read, so reading a few fields costs little more than their
+    share of the cache.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        :param directory: Directory holding the cache
+        :raises FileNotFoundError: Raised if there is no cache in the directory
+        """
+        self._directory = Path(directory)
+        manifest_path = self._directory / _MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No ping cache in {directory}")
+        self._manifest = json.loads(manifest_path.read_text())
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def source_path(self) -> Path:
+        return Path(self._manifest["source_path"])
+
+    @property
+    def beam_fields(self) -> List[str]:
+        return list(self._manifest["beam_fields"])
+
+    @property
+    def number_pings(self) -> int:
+        return sum(self._manifest["chunks"])
+
+    def is_current(self) -> bool:
+        """
+        :return: Whether the cache was written by this version of gsfpy from the
+                 current contents of its source file, judged by its size and
+                 modification time, and the source file still exists
+        """
+        if not self.source_path.exists():
+            return False
+        return self._manifest["version"] == _CACHE_VERSION and _file_stamp(
+            self.source_path
+        ) == (self._manifest["source_size"], self._manifest["source_mtime_ns"])
+
+    def iter_ping_blocks(
+        self, beam_fields: Optional[Iterable[str]] = None
+    ) -> Iterator[PingBlock]:
+        """
+        Reads the cached pings in blocks, as columnar.iter_ping_blocks() reads them
+        from the source file, but without decoding any records
+        :param beam_fields: Names of the cached beam arrays to read, all of them by
+                            default
+        :return: Iterator of PingBlock objects, one per chunk
+        :raises ValueError: Raised if a beam array is not cached
+        """
+        beam_fields = self.beam_fields if beam_fields is None else list(beam_fields)
+        missing = set(beam_fields).difference(self.beam_fields)
+        if missing:
+            raise ValueError(f"Beam array fields not cached: {sorted(missing)}")
+
+        for number in range(len(self._manifest["chunks"])):
+            with np.load(self._directory / _chunk_file(number)) as chunk:
+                yield PingBlock(
+                    chunk["record_numbers"],
+                    chunk["ping_time"],
+                    {name: chunk[name] for name in (*PING_FIELDS, *beam_fields)},
+                )
+
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, Path],
+        directory: Union[str, Path],
+        beam_fields: Optional[Iterable[str]] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "PingCache":
+        """
+        Decodes the pings of a GSF file into a cache, replacing any cache already in
+        the directory. The manifest is written last, so an interrupted build leaves
+        no cache rather than a partial one.
+        :param path: Location of the GSF file
+        :param directory: Directory to hold the cache, created if necessary
+        :param beam_fields: Names of the beam arrays to cache (see
+                            columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+        :param block_size: Maximum number of pings per chunk
+        :return: PingCache
+        :raises GsfException: Raised if anything went wrong
+        """
+        directory = Path(directory)
+        beam_fields = list(
+            BEAM_ARRAY_SUBRECORDS if beam_fields is None else beam_fields
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest_path = directory / _MANIFEST_FILE
+        if manifest_path.exists():
+            manifest_path.unlink()
+        for chunk_path in directory.glob(_CHUNK_PATTERN):
+            chunk_path.unlink()
+
+        # Stamped before reading, so that changes made while reading invalidate
+        size, mtime_ns = _file_stamp(path)
+        chunks = []
+        with open_gsf(path) as gsf_file:
+            for block in iter_ping_blocks(gsf_file, beam_fields, block_size):
+                np.savez_compressed(
+                    directory / _chunk_file(len(chunks)),
+                    record_numbers=block.record_numbers,
+                    ping_time=block.ping_time,
+                    **{field: block[field] for field in block.fields},
+                )
+                chunks.append(block.number_pings)
+
+        manifest = {
+            "version": _CACHE_VERSION,
+            "source_path": str(Path(path).resolve()),
+            "source_size": size,
+            "source_mtime_ns": mtime_ns,
+            "beam_fields": beam_fields,
+            "chunks": chunks,
+        }
+        temp_path = directory / f"{_MANIFEST_FILE}.{os.getpid()}.tmp"
+        temp_path.write_text(json.dumps(manifest))
+        os.replace(temp_path, manifest_path)
+        return cls(directory)
+
+
+def _chunk_file(number: int) -> str:
+    return f"chunk_{number:06d}.npz"
+
+
+def materialise(
+    path: Union[str, Path],
+    store_dir: Union[str, Path],
+    beam_fields: Optional[Iterable[str]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> PingCache:
+    """
+    Opens the cache of a GSF file, first decoding the file into it if the cache is
+    missing, out of date, from another file or lacks any of the beam arrays.
+    :param path: Location of the GSF file
+    :param store_dir: Directory to hold the cache, created if necessary
+    :param beam_fields: Names of the beam arrays to cache (see
+                        columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+    :param block_size: Maximum number of pings per chunk when decoding the file
+    :return: PingCache
+    :raises GsfException: Raised if anything went wrong
+    """
+    beam_fields = list(BEAM_ARRAY_SUBRECORDS if beam_fields is None else beam_fields)
+    try:
+        cache = PingCache(store_dir)
+    except FileNotFoundError:
+        pass
+    else:
+        if (
+            cache.source_path == Path(path).resolve()
+            and cache.is_current()
+            and set(beam_fields).issubset(cache.beam_fields)
+        ):
+            return cache
+    return PingCache.build(path, store_dir, beam_fields, block_size)
@@ -0,0 +1,593 @@
+"""Columnar (NumPy) access to swath bathymetry ping records"""
+from contextlib import closing
+from ctypes import byref, c_double
+from math import floor
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _call, _read_into, _read_next, _write_record, open_gsf
+from gsfpy3_08.bindings import gsfGetSwathBathyArrayMinMax, gsfLoadScaleFactor
+from gsfpy3_08.enums import (
+    FileMode,
+    PingFlag,
+    RecordType,
+    ScaledSwathBathySubRecord,
+    ScaleFactorCompressionFlags,
+    SeekOption,
+)
+from gsfpy3_08.gsfDataID import c_gsfDataID
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_08.timespec import timespec_to_seconds
+
+DEFAULT_BLOCK_SIZE = 1000
+
+# Precision used when a scale factor has to be created for a beam array that has
+# none, e.g. meters for the depth array.
+DEFAULT_PRECISION = 0.01
+
+_SUBRECORD = ScaledSwathBathySubRecord
+
+# Beam array fields of c_gsfSwathBathyPing, with the subrecord each is stored in
+BEAM_ARRAY_SUBRECORDS: Dict[str, ScaledSwathBathySubRecord] = {
+    "depth": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_DEPTH_ARRAY,
+    "across_track": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_ACROSS_TRACK_ARRAY,
+    "along_track": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_ALONG_TRACK_ARRAY,
+    "travel_time": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_TRAVEL_TIME_ARRAY,
+    "beam_angle": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_BEAM_ANGLE_ARRAY,
+    "mc_amplitude": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_MEAN_CAL_AMPLITUDE_ARRAY,
+    "mr_amplitude": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_MEAN_REL_AMPLITUDE_ARRAY,
+    "echo_width": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_ECHO_WIDTH_ARRAY,
+    "quality_factor": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_QUALITY_FACTOR_ARRAY,
+    "receive_heave": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_RECEIVE_HEAVE_ARRAY,
+    "depth_error": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_DEPTH_ERROR_ARRAY,
+    "across_track_error": (
+        _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_ACROSS_TRACK_ERROR_ARRAY
+    ),
+    "along_track_error": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_ALONG_TRACK_ERROR_ARRAY,
+    "nominal_depth": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_NOMINAL_DEPTH_ARRAY,
+    "quality_flags": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_QUALITY_FLAGS_ARRAY,
+    "beam_flags": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_BEAM_FLAGS_ARRAY,
+    "signal_to_noise": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_SIGNAL_TO_NOISE_ARRAY,
+    "beam_angle_forward": (
+        _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_BEAM_ANGLE_FORWARD_ARRAY
+    ),
+    "vertical_error": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_VERTICAL_ERROR_ARRAY,
+    "horizontal_error": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_HORIZONTAL_ERROR_ARRAY,
+    "sector_number": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_SECTOR_NUMBER_ARRAY,
+    "detection_info": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_DETECTION_INFO_ARRAY,
+    "incident_beam_adj": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_INCIDENT_BEAM_ADJ_ARRAY,
+    "system_cleaning": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_SYSTEM_CLEANING_ARRAY,
+    "doppler_corr": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_DOPPLER_CORRECTION_ARRAY,
+    "sonar_vert_uncert": _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_SONAR_VERT_UNCERT_ARRAY,
+}
+
+# Per-ping scalar fields of c_gsfSwathBathyPing
+PING_FIELDS = (
+    "latitude",
+    "longitude",
+    "height",
+    "sep",
+    "number_beams",
+    "center_beam",
+    "ping_flags",
+    "tide_corrector",
+    "gps_tide_corrector",
+    "depth_corrector",
+    "heading",
+    "pitch",
+    "roll",
+    "heave",
+    "course",
+    "speed",
+    "sensor_id",
+)
+
+_CTYPES = dict(c_gsfSwathBathyPing._fields_)
+_PING_DTYPES = {name: np.dtype(_CTYPES[name]) for name in PING_FIELDS}
+_BEAM_DTYPES = {name: np.dtype(_CTYPES[name]._type_) for name in BEAM_ARRAY_SUBRECORDS}
+_INDEXED_MODES = (FileMode.GSF_READONLY_INDEX, FileMode.GSF_UPDATE_INDEX)
+_DEPTH_SUBRECORDS = (
+    _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_DEPTH_ARRAY,
+    _SUBRECORD.GSF_SWATH_BATHY_SUBRECORD_NOMINAL_DEPTH_ARRAY,
+)
+_FIELD_SIZE = ScaleFactorCompressionFlags
+_FIELD_SIZE_MASK = 0xF0
+# Largest unsigned value that fits in each field size, assuming two bytes by default
+_MAX_ENCODED = {
+    _FIELD_SIZE.GSF_FIELD_SIZE_DEFAULT: 0xFFFF,
+    _FIELD_SIZE.GSF_FIELD_SIZE_ONE: 0xFF,
+    _FIELD_SIZE.GSF_FIELD_SIZE_TWO: 0xFFFF,
+    _FIELD_SIZE.GSF_FIELD_SIZE_FOUR: 0xFFFFFFFF,
+}
+
+
+class PingBlock:
+    """
+    A block of swath bathymetry pings held as NumPy arrays. Per-ping fields are one
+    dimensional, beam array fields are two dimensional (ping, beam) and padded out to
+    the largest number of beams in the block, with NaN for floating point fields and
+    zero for integer fields. Pings in which a beam array is absent are padded in the
+    same way.
+    """
+
+    def __init__(
+        self,
+        record_numbers: np.ndarray,
+        ping_time: np.ndarray,
+        columns: Dict[str, np.ndarray],
+    ):
+        self._record_numbers = record_numbers
+        self._ping_time = ping_time
+        self._columns = columns
+
+    @property
+    def record_numbers(self) -> np.ndarray:
+        """
+        Record number of each ping, i.e. its position amongst the pings in the file,
+        counting from 1
+        """
+        return self._record_numbers
+
+    @property
+    def ping_time(self) -> np.ndarray:
+        """
+        Time of each ping in seconds since the beginning of the epoch
+        """
+        return self._ping_time
+
+    @property
+    def number_pings(self) -> int:
+        return len(self._record_numbers)
+
+    @property
+    def number_beams(self) -> np.ndarray:
+        return self._columns["number_beams"]
+
+    @property
+    def beam_mask(self) -> np.ndarray:
+        """
+        Boolean (ping, beam) array, True where the beam exists in the ping
+        """
+        max_beams = max((column.shape[1] for column in self._beam_columns()), default=0)
+        return np.arange(max_beams) < self.number_beams[:, np.newaxis]
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._columns)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._columns
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self._columns[field]
+
+    def select(self, pings: Union[slice, np.ndarray]) -> "PingBlock":
+        """
+        :param pings: Slice, indices or boolean mask selecting pings of this block
+        :return: PingBlock of the selected pings
+        """
+        return PingBlock(
+            self._record_numbers[pings],
+            self._ping_time[pings],
+            {field: column[pings] for field, column in self._columns.items()},
+        )
+
+    def _beam_columns(self) -> Iterator[np.ndarray]:
+        return (
+            column
+            for field, column in self._columns.items()
+            if field in BEAM_ARRAY_SUBRECORDS
+        )
+
+
+def accepted_beams(block: PingBlock) -> np.ndarray:
+    """
+    :param block: Pings read with at least the depth and beam_flags beam arrays
+    :return: Boolean (ping, beam) array, True where a beam exists and has a depth,
+             its beam flags are clear and its ping is not flagged to be ignored
+    """
+    pings = (block["ping_flags"] & PingFlag.GSF_IGNORE_PING) == 0
+    return (
+        block.beam_mask
+        & pings[:, np.newaxis]
+        & (block["beam_flags"] == 0)
+        & ~np.isnan(block["depth"])
+    )
+
+
+class _PingBlockBuilder:
+    def __init__(self, beam_fields: Sequence[str]):
+        self._beam_fields = beam_fields
+        self._record_numbers: List[int] = []
+        self._ping_time: List[float] = []
+        self._pings: Dict[str, list] = {name: [] for name in PING_FIELDS}
+        self._beams: Dict[str, list] = {name: [] for name in beam_fields}
+
+    def __len__(self) -> int:
+        return len(self._record_numbers)
+
+    def append(self, record_number: int, mb_ping: c_gsfSwathBathyPing):
+        self._record_numbers.append(record_number)
+        self._ping_time.append(timespec_to_seconds(mb_ping.ping_time))
+        for name, values in self._pings.items():
+            values.append(getattr(mb_ping, name))
+
+        number_beams = mb_ping.number_beams
+        for name, rows in self._beams.items():
+            pointer = getattr(mb_ping, name)
+            rows.append(
+                np.ctypeslib.as_array(pointer, (number_beams,)).copy()
+                if pointer and number_beams > 0
+                else None
+            )
+
+    def build(self) -> PingBlock:
+        columns = {
+            name: np.array(values, dtype=_PING_DTYPES[name])
+            for name, values in self._pings.items()
+        }
+        max_beams = int(columns["number_beams"].max(initial=0))
+        for name, rows in self._beams.items():
+            dtype = _BEAM_DTYPES[name]
+            fill = np.nan if dtype.kind == "f" else 0
+            column = np.full((len(rows), max_beams), fill, dtype=dtype)
+            for row, values in zip(column, rows):
+                if values is not None:
+                    row[: len(values)] = values
+            columns[name] = column
+
+        return PingBlock(
+            np.array(self._record_numbers, dtype=np.int64),
+            np.array(self._ping_time, dtype=np.float64),
+            columns,
+        )
+
+
+def iter_ping_blocks(
+    gsf_file: GsfFile,
+    beam_fields: Optional[Iterable[str]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    record_numbers: Optional[Iterable[int]] = None,
+) -> Iterator[PingBlock]:
+    """
+    Reads every swath bathymetry ping in the file, from the beginning, and yields
+    them in blocks. A single record buffer is reused for all reads. When the file is
+    open in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode pings are read by record
+    number, so records may be written back between blocks. Otherwise the file is
+    read sequentially and rewound once all pings have been read, or once the iterator
+    is closed.
+    :param gsf_file: File to read from
+    :param beam_fields: Names of the beam arrays to read (see BEAM_ARRAY_SUBRECORDS),
+                        all of them by default
+    :param block_size: Maximum number of pings per block
+    :param record_numbers: Record numbers of the pings to read, in order, by default
+                           all of them. May only be given when the file is open for
+                           direct access.
+    :return: Iterator of PingBlock objects
+    :raises GsfException: Raised if anything went wrong
+    """
+    beam_fields = list(BEAM_ARRAY_SUBRECORDS if beam_fields is None else beam_fields)
+    unknown = set(beam_fields).difference(BEAM_ARRAY_SUBRECORDS)
+    if unknown:
+        raise ValueError(f"Unknown beam array fields: {sorted(unknown)}")
+    if record_numbers is not None and gsf_file.file_mode not in _INDEXED_MODES:
+        raise ValueError("Pings may only be read by record number in indexed modes")
+
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    builder = _PingBlockBuilder(beam_fields)
+
+    # Closing this iterator early closes the reader too, releasing the file
+    with closing(_read_pings(gsf_file, data_id, records, record_numbers)) as pings:
+        for record_number in pings:
+            builder.append(record_number, records.mb_ping)
+            if len(builder) == block_size:
+                yield builder.build()
+                builder = _PingBlockBuilder(beam_fields)
+
+    if len(builder):
+        yield builder.build()
+
+
+def _read_pings(
+    gsf_file: GsfFile,
+    data_id: c_gsfDataID,
+    records: c_gsfRecords,
+    record_numbers: Optional[Iterable[int]] = None,
+    desired_record: RecordType = RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING,
+) -> Iterator[int]:
+    """
+    Reads each ping, or each record of another type, into the given buffers in turn,
+    yielding its record number. Files read sequentially are locked from the first
+    rewind to the last, so that other threads cannot move them in between, and are
+    rewound and unlocked even if the iterator is closed before it is exhausted.
+    """
+    if gsf_file.file_mode in _INDEXED_MODES:
+        if record_numbers is None:
+            record_numbers = range(1, gsf_file.get_number_records(desired_record) + 1)
+        for record_number in record_numbers:
+            _read_into(gsf_file, desired_record, data_id, records, record_number)
+            yield record_number
+    else:
+        with gsf_file.lock:
+            gsf_file.seek(SeekOption.GSF_REWIND)
+            record_number = 0
+            try:
+                while _read_next(gsf_file, desired_record, data_id, records):
+                    record_number += 1
+                    yield record_number
+            finally:
+                gsf_file.seek(SeekOption.GSF_REWIND)
+
+
+def count_pings(gsf_file: GsfFile) -> int:
+    """
+    May only be used when the file is open for direct access (GSF_READONLY_INDEX or
+    GSF_UPDATE_INDEX).
+    :param gsf_file: File to count the pings of
+    :return: Number of swath bathymetry ping records in the file
+    :raises GsfException: Raised if anything went wrong
+    """
+    return gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+
+def set_beam_array(
+    mb_ping: c_gsfSwathBathyPing,
+    field: str,
+    values: np.ndarray,
+    precision: Optional[float] = None,
+):
+    """
+    Copies values into a beam array of a ping, allocating the array if the ping does
+    not have it yet. Non-finite values leave the existing value of the beam
+    unchanged. A scale factor is loaded for newly allocated arrays, and reloaded for
+    existing arrays whenever the existing one cannot represent the new values,
+    keeping its field size so that the size of the record does not change.
+    :param mb_ping: Ping to update
+    :param field: Name of the beam array (see BEAM_ARRAY_SUBRECORDS)
+    :param values: At least number_beams values
+    :param precision: Precision to use if a scale factor has to be loaded, defaulting
+                      to that of the existing scale factor or DEFAULT_PRECISION
+    :raises GsfException: Raised if anything went wrong
+    """
+    subrecord_id = BEAM_ARRAY_SUBRECORDS[field]
+    dtype = _BEAM_DTYPES[field]
+    number_beams = mb_ping.number_beams
+    values = np.asarray(values)[:number_beams]
+
+    allocate = not getattr(mb_ping, field)
+    if allocate:
+        setattr(mb_ping, field, (_CTYPES[field]._type_ * number_beams)())
+    array = np.ctypeslib.as_array(getattr(mb_ping, field), (number_beams,))
+
+    if dtype.kind == "f":
+        finite = np.isfinite(values)
+        array[finite] = values[finite]
+    else:
+        array[:] = values
+
+    if number_beams > 0:
+        _ensure_scale_factor(mb_ping, subrecord_id, array, precision, allocate)
+
+
+def _ensure_scale_factor(
+    mb_ping: c_gsfSwathBathyPing,
+    subrecord_id: ScaledSwathBathySubRecord,
+    values: np.ndarray,
+    precision: Optional[float],
+    new_array: bool,
+):
+    scale_info = mb_ping.scaleFactors.scaleTable[subrecord_id - 1]
+    low, high = float(values.min()), float(values.max())
+    is_depth = subrecord_id in _DEPTH_SUBRECORDS
+
+    # Pings may carry stale scale factors for arrays they do not hold
+    if scale_info.multiplier > 0 and not new_array:
+        if is_depth:
+            fits = _depth_scale_factor_fits(scale_info, low, high)
+        else:
+            min_value = c_double()
+            max_value = c_double()
+            _call(
+                gsfGetSwathBathyArrayMinMax,
+                byref(mb_ping),
+                subrecord_id,
+                byref(min_value),
+                byref(max_value),
+            )
+            fits = min_value.value <= low and high <= max_value.value
+        if fits:
+            return
+        if precision is None:
+            precision = 1.0 / scale_info.multiplier
+
+    if precision is None:
+        precision = DEFAULT_PRECISION
+
+    # Depths are encoded as unsigned values relative to a whole meter offset, as
+    # libgsf does for the scale factors it loads itself
+    max_encoded = _max_encoded(scale_info.compressionFlag)
+    if is_depth:
+        offset = -floor(low)
+        max_value = high + offset
+    else:
+        offset = 0
+        max_value = max(abs(low), abs(high))
+        max_encoded //= 2
+
+    # The field size is kept, so that records can still be updated in place, at the
+    # cost of a coarser precision when the values would not otherwise fit
+    if max_value / precision > max_encoded:
+        precision = 1.0 / max(floor(max_encoded / max_value), 1)
+
+    _call(
+        gsfLoadScaleFactor,
+        byref(mb_ping.scaleFactors),
+        subrecord_id,
+        scale_info.compressionFlag,
+        precision,
+        offset,
+    )
+
+
+def _depth_scale_factor_fits(scale_info, low: float, high: float) -> bool:
+    return low + scale_info.offset >= 0 and (
+        high + scale_info.offset
+    ) * scale_info.multiplier <= _max_encoded(scale_info.compressionFlag)
+
+
+def _max_encoded(compression_flag: int) -> int:
+    return _MAX_ENCODED.get(compression_flag & _FIELD_SIZE_MASK, 0xFFFF)
+
+
+def write_beam_columns(
+    gsf_file: GsfFile,
+    record_numbers: Sequence[int],
+    columns: Mapping[str, np.ndarray],
+    precisions: Optional[Mapping[str, float]] = None,
+):
+    """
+    Writes (ping, beam) arrays back over the beam arrays of existing pings, reusing a
+    single record buffer. The file must be open in GSF_UPDATE_INDEX mode and, as
+    records cannot grow when updated in place, every ping must already hold the
+    beam arrays being written (see rewrite_beam_columns() otherwise).
+    :param gsf_file: File to update
+    :param record_numbers: Record number of the ping each row of the columns belongs to
+    :param columns: Values to write, keyed by beam array name. See set_beam_array()
+                    for the handling of non-finite values and scale factors.
+    :param precisions: Precisions to use for any scale factors that must be loaded,
+                       keyed by beam array name
+    :raises GsfException: Raised if anything went wrong
+    """
+    if gsf_file.file_mode != FileMode.GSF_UPDATE_INDEX:
+        raise ValueError("File must be open in GSF_UPDATE_INDEX mode")
+
+    precisions = precisions or {}
+    desired_record = RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+
+    for row, record_number in enumerate(record_numbers):
+        # Each ping is read and written back without other threads moving the file
+        with gsf_file.lock:
+            _read_into(gsf_file, desired_record, data_id, records, int(record_number))
+
+            for field, values in columns.items():
+                if not getattr(records.mb_ping, field):
+                    raise ValueError(
+                        f"Ping {record_number} has no {field} array, which cannot be "
+                        "added in place"
+                    )
+                set_beam_array(
+                    records.mb_ping, field, values[row], precisions.get(field)
+                )
+
+            data_id.recordID = desired_record
+            data_id.record_number = int(record_number)
+            _write_record(gsf_file, data_id, records)
+
+
+def rewrite_beam_columns(
+    source_path: Union[str, Path],
+    target_path: Union[str, Path],
+    compute: Callable[[PingBlock], Mapping[str, np.ndarray]],
+    beam_fields: Optional[Iterable[str]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    precisions: Optional[Mapping[str, float]] = None,
+) -> int:
+    """
+    Copies a GSF file record by record to a new file, setting the beam arrays of each
+    ping from columns computed a block of pings at a time. Unlike
+    write_beam_columns(), beam arrays may be added to pings that do not have them.
+    The source file is read through two handles in step, one yielding blocks of pings
+    and the other every record, so memory use is bounded by the block size.
+    :param source_path: Location of the GSF file to copy
+    :param target_path: Location of the GSF file to create
+    :param compute: Function called with each block of pings, returning the (ping,
+                    beam) arrays to set keyed by beam array name. See
+                    set_beam_array() for the handling of non-finite values.
+    :param beam_fields: Beam arrays to read into the blocks, all of them by default
+    :param block_size: Maximum number of pings per block
+    :param precisions: Precisions to use for any scale factors that must be loaded,
+                       keyed by beam array name
+    :return: Number of pings written
+    :raises GsfException: Raised if anything went wrong
+    """
+    precisions = precisions or {}
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    number_pings = 0
+
+    with open_gsf(source_path) as block_file, open_gsf(
+        source_path
+    ) as source_file, open_gsf(target_path, FileMode.GSF_CREATE) as target_file:
+        blocks = iter_ping_blocks(block_file, beam_fields, block_size)
+        columns: Mapping[str, np.ndarray] = {}
+        row = block_pings = 0
+
+        while _read_next(source_file, RecordType.GSF_NEXT_RECORD, data_id, records):
+            if data_id.recordID == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING:
+                if row == block_pings:
+                    block = next(blocks)
+                    columns = compute(block)
+                    row, block_pings = 0, block.number_pings
+                for field, values in columns.items():
+                    set_beam_array(
+                        records.mb_ping, field, values[row], precisions.get(field)
+                    )
+                row += 1
+                number_pings += 1
+            _write_record(target_file, data_id, records)
+
+    return number_pings
+
+
+def update_beam_columns(
+    path: Union[str, Path],
+    compute: Callable[[PingBlock], Mapping[str, np.ndarray]],
+    beam_fields: Optional[Iterable[str]] = None,
+    target_path: Optional[Union[str, Path]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    precisions: Optional[Mapping[str, float]] = None,
+) -> int:
+    """
+    Sets beam arrays of every ping in a GSF file from columns computed a block of
+    pings at a time. The file is updated in place with write_beam_columns() unless a
+    target path is given, in which case an updated copy is written there with
+    rewrite_beam_columns() instead.
+    :param path: Location of the GSF file to update
+    :param compute: See rewrite_beam_columns()
+    :param beam_fields: Beam arrays to read into the blocks, all of them by default
+    :param target_path: Location of the updated copy to create, if any
+    :param block_size: Maximum number of pings per block
+    :param precisions: Precisions to use for any scale factors that must be loaded,
+                       keyed by beam array name
+    :return: Number of pings updated
+    :raises GsfException: Raised if anything went wrong
+    """
+    if target_path is not None:
+        return rewrite_beam_columns(
+            path, target_path, compute, beam_fields, block_size, precisions
+        )
+
+    number_pings = 0
+    with open_gsf(path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        for block in iter_ping_blocks(gsf_file, beam_fields, block_size):
+            write_beam_columns(
+                gsf_file, block.record_numbers, compute(block), precisions
+            )
+            number_pings += block.number_pings
+    return number_pings
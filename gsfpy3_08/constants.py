@@ -2,3 +2,20 @@
 # See also ScaledSwathBathySubRecord, which identifies which
 # specific subrecords reside at indices 1 to GSF_MAX_PING_ARRAY_SUBRECORDS
 GSF_MAX_PING_ARRAY_SUBRECORDS = 27
+
+# Error code reported by gsfIntError() once a read reaches the end of the file
+GSF_READ_TO_END_OF_FILE = -23
+
+# Error codes reported by gsfIntError() when a record cannot be read
+GSF_READ_ERROR = -4
+GSF_RECORD_SIZE_ERROR = -7
+GSF_CHECKSUM_FAILURE = -8
+GSF_STREAM_DECODE_FAILURE = -14
+GSF_PARTIAL_RECORD_AT_END_OF_FILE = -52
+
+# Maximum number of files libgsf allows to be open at once
+GSF_MAX_OPEN_FILES = 4
+
+# Error code reported by gsfIntError() when opening a file would exceed
+# GSF_MAX_OPEN_FILES
+GSF_TOO_MANY_OPEN_FILES = -11
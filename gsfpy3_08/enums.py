@@ -93,7 +93,96 @@ class ScaledSwathBathySubRecord(IntEnum):
     GSF_SWATH_BATHY_SUBRECORD_SONAR_VERT_UNCERT_ARRAY = 27
 
 
+class ScaleFactorCompressionFlags(IntEnum):
+    # Default values for field size are used for all beam arrays
+    GSF_FIELD_SIZE_DEFAULT = 0x00
+    # Value saved as a one byte value after applying scale and offset
+    GSF_FIELD_SIZE_ONE = 0x10
+    # Value saved as a two byte value after applying scale and offset
+    GSF_FIELD_SIZE_TWO = 0x20
+    # Value saved as a four byte value after applying scale and offset
+    GSF_FIELD_SIZE_FOUR = 0x40
+
+
 class SeekOption(IntEnum):
     GSF_REWIND = 1
     GSF_END_OF_FILE = 2
     GSF_PREVIOUS_RECORD = 3
+
+
+class ReadStatus(IntEnum):
+    """Outcome of a read that does not raise exceptions (see GsfFile.try_read())"""
+
+    OK = 0
+    END_OF_FILE = 1
+    ERROR = 2
+
+
+class SensorSpecificSubRecord(IntEnum):
+    """
+    Identifiers of the sensor specific subrecords of swath bathymetry pings, held in
+    c_gsfSwathBathyPing.sensor_id, which say which member of the sensor_data union
+    applies to the ping
+    """
+
+    GSF_SWATH_BATHY_SUBRECORD_UNKNOWN = 0
+    GSF_SWATH_BATHY_SUBRECORD_SEABEAM_SPECIFIC = 102
+    GSF_SWATH_BATHY_SUBRECORD_EM12_SPECIFIC = 103
+    GSF_SWATH_BATHY_SUBRECORD_EM100_SPECIFIC = 104
+    GSF_SWATH_BATHY_SUBRECORD_EM950_SPECIFIC = 105
+    GSF_SWATH_BATHY_SUBRECORD_EM121A_SPECIFIC = 106
+    GSF_SWATH_BATHY_SUBRECORD_EM121_SPECIFIC = 107
+    GSF_SWATH_BATHY_SUBRECORD_SASS_SPECIFIC = 108  # obsolete
+    GSF_SWATH_BATHY_SUBRECORD_SEAMAP_SPECIFIC = 109
+    GSF_SWATH_BATHY_SUBRECORD_SEABAT_SPECIFIC = 110
+    GSF_SWATH_BATHY_SUBRECORD_EM1000_SPECIFIC = 111
+    GSF_SWATH_BATHY_SUBRECORD_TYPEIII_SEABEAM_SPECIFIC = 112  # obsolete
+    GSF_SWATH_BATHY_SUBRECORD_SB_AMP_SPECIFIC = 113
+    GSF_SWATH_BATHY_SUBRECORD_SEABAT_II_SPECIFIC = 114
+    GSF_SWATH_BATHY_SUBRECORD_SEABAT_8101_SPECIFIC = 115
+    GSF_SWATH_BATHY_SUBRECORD_SEABEAM_2112_SPECIFIC = 116
+    GSF_SWATH_BATHY_SUBRECORD_ELAC_MKII_SPECIFIC = 117
+    GSF_SWATH_BATHY_SUBRECORD_EM3000_SPECIFIC = 118
+    GSF_SWATH_BATHY_SUBRECORD_EM1002_SPECIFIC = 119
+    GSF_SWATH_BATHY_SUBRECORD_EM300_SPECIFIC = 120
+    GSF_SWATH_BATHY_SUBRECORD_CMP_SASS_SPECIFIC = 121
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8101_SPECIFIC = 122
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8111_SPECIFIC = 123
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8124_SPECIFIC = 124
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8125_SPECIFIC = 125
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8150_SPECIFIC = 126
+    GSF_SWATH_BATHY_SUBRECORD_RESON_8160_SPECIFIC = 127
+    GSF_SWATH_BATHY_SUBRECORD_EM120_SPECIFIC = 128
+    GSF_SWATH_BATHY_SUBRECORD_EM3002_SPECIFIC = 129
+    GSF_SWATH_BATHY_SUBRECORD_EM3000D_SPECIFIC = 130
+    GSF_SWATH_BATHY_SUBRECORD_EM3002D_SPECIFIC = 131
+    GSF_SWATH_BATHY_SUBRECORD_EM121A_SIS_SPECIFIC = 132
+    GSF_SWATH_BATHY_SUBRECORD_EM710_SPECIFIC = 133
+    GSF_SWATH_BATHY_SUBRECORD_EM302_SPECIFIC = 134
+    GSF_SWATH_BATHY_SUBRECORD_EM122_SPECIFIC = 135
+    GSF_SWATH_BATHY_SUBRECORD_GEOSWATH_PLUS_SPECIFIC = 136
+    GSF_SWATH_BATHY_SUBRECORD_KLEIN_5410_BSS_SPECIFIC = 137
+    GSF_SWATH_BATHY_SUBRECORD_RESON_7125_SPECIFIC = 138
+    GSF_SWATH_BATHY_SUBRECORD_EM2000_SPECIFIC = 139
+    GSF_SWATH_BATHY_SUBRECORD_EM300_RAW_SPECIFIC = 140
+    GSF_SWATH_BATHY_SUBRECORD_EM1002_RAW_SPECIFIC = 141
+    GSF_SWATH_BATHY_SUBRECORD_EM2000_RAW_SPECIFIC = 142
+    GSF_SWATH_BATHY_SUBRECORD_EM3000_RAW_SPECIFIC = 143
+    GSF_SWATH_BATHY_SUBRECORD_EM120_RAW_SPECIFIC = 144
+    GSF_SWATH_BATHY_SUBRECORD_EM3002_RAW_SPECIFIC = 145
+    GSF_SWATH_BATHY_SUBRECORD_EM3000D_RAW_SPECIFIC = 146
+    GSF_SWATH_BATHY_SUBRECORD_EM3002D_RAW_SPECIFIC = 147
+    GSF_SWATH_BATHY_SUBRECORD_EM121A_SIS_RAW_SPECIFIC = 148
+    GSF_SWATH_BATHY_SUBRECORD_EM2040_SPECIFIC = 149
+    GSF_SWATH_BATHY_SUBRECORD_DELTA_T_SPECIFIC = 150
+    GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2022_SPECIFIC = 151
+    GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2024_SPECIFIC = 152
+    GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2020_SPECIFIC = 153
+    GSF_SWATH_BATHY_SUBRECORD_RESON_TSERIES_SPECIFIC = 155
+    GSF_SWATH_BATHY_SB_SUBRECORD_ECHOTRAC_SPECIFIC = 201
+    GSF_SWATH_BATHY_SB_SUBRECORD_BATHY2000_SPECIFIC = 202
+    GSF_SWATH_BATHY_SB_SUBRECORD_MGD77_SPECIFIC = 203
+    GSF_SWATH_BATHY_SB_SUBRECORD_BDB_SPECIFIC = 204
+    GSF_SWATH_BATHY_SB_SUBRECORD_NOSHDB_SPECIFIC = 205
+    GSF_SWATH_BATHY_SB_SUBRECORD_PDD_SPECIFIC = 206
+    GSF_SWATH_BATHY_SB_SUBRECORD_NAVISOUND_SPECIFIC = 207
@@ -0,0 +1,409 @@
+"""Streaming, tiled gridding of swath bathymetry soundings"""
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from math import floor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.columnar import (
+    DEFAULT_BLOCK_SIZE,
+    PingBlock,
+    accepted_beams,
+    iter_ping_blocks,
+)
+from gsfpy3_08.spatial import beam_positions
+from gsfpy3_08.tpu import CONFIDENCE_95
+
+GRID_BEAM_FIELDS = ("depth", "across_track", "along_track", "beam_flags")
+
+DEFAULT_TILE_SIZE = 256
+
+# Per-cell accumulators held in each tile. They merge associatively: counts, means
+# and sums of squared deviations from the mean combine pairwise (Chan et al.), as do
+# minima, maxima and the sums of weights and of weighted depths.
+TILE_DTYPE = np.dtype(
+    [
+        ("count", np.int64),
+        ("mean", np.float64),
+        ("m2", np.float64),
+        ("min", np.float64),
+        ("max", np.float64),
+        ("weight", np.float64),
+        ("weighted_sum", np.float64),
+    ]
+)
+
+# Statistics that may be derived from the accumulators of a cell
+STATISTICS = ("count", "mean", "min", "max", "std", "weighted_mean")
+
+_SPEC_FILE = "grid.json"
+
+
+class GridSpec(NamedTuple):
+    """
+    Geographic grid of square cells, cell_size degrees a side, whose rows run north
+    from min_latitude and columns east from min_longitude. The grid is stored in
+    square tiles of tile_size cells a side.
+    """
+
+    min_latitude: float
+    min_longitude: float
+    cell_size: float
+    number_rows: int
+    number_columns: int
+    tile_size: int = DEFAULT_TILE_SIZE
+
+    @staticmethod
+    def from_bounds(
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        cell_size: float,
+        tile_size: int = DEFAULT_TILE_SIZE,
+    ) -> "GridSpec":
+        """
+        :return: GridSpec of the smallest grid covering the given extents (degrees)
+        """
+        return GridSpec(
+            min_latitude=min_latitude,
+            min_longitude=min_longitude,
+            cell_size=cell_size,
+            number_rows=floor((max_latitude - min_latitude) / cell_size) + 1,
+            number_columns=floor((max_longitude - min_longitude) / cell_size) + 1,
+            tile_size=tile_size,
+        )
+
+    @property
+    def number_tile_columns(self) -> int:
+        return -(-self.number_columns // self.tile_size)
+
+    def cell_indices(
+        self, latitude: np.ndarray, longitude: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param latitude: Degrees, positive going north
+        :param longitude: Degrees, positive going east
+        :return: Row and column of the cell holding each position, and a mask that is
+                 True for positions within the grid
+        """
+        with np.errstate(invalid="ignore"):
+            rows = np.floor((latitude - self.min_latitude) / self.cell_size)
+            columns = np.floor((longitude - self.min_longitude) / self.cell_size)
+            inside = (
+                (rows >= 0)
+                & (rows < self.number_rows)
+                & (columns >= 0)
+                & (columns < self.number_columns)
+            )
+        rows = np.where(inside, rows, 0).astype(np.int64)
+        columns = np.where(inside, columns, 0).astype(np.int64)
+        return rows, columns, inside
+
+
+class Grid:
+    """
+    Gridded statistics of soundings, accumulated a block of soundings at a time into
+    memory-mapped tiles held in a directory. Tiles are created as soundings first
+    fall into them, so only the tiles being updated are ever mapped into memory.
+    """
+
+    def __init__(self, directory: Union[str, Path], spec: Optional[GridSpec] = None):
+        """
+        :param directory: Directory holding the grid, created if necessary
+        :param spec: Layout of the grid, which must match that of any existing grid
+                     in the directory, or None to open an existing grid
+        :raises ValueError: Raised if the layout does not match the existing grid
+        """
+        self._directory = Path(directory)
+        spec_path = self._directory / _SPEC_FILE
+
+        if spec_path.exists():
+            existing = GridSpec(**json.loads(spec_path.read_text()))
+            if spec is not None and spec != existing:
+                raise ValueError(f"Grid in {directory} has a different layout")
+            spec = existing
+        elif spec is None:
+            raise FileNotFoundError(f"No grid in {directory}")
+        else:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            spec_path.write_text(json.dumps(spec._asdict()))
+
+        self._spec = spec
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def spec(self) -> GridSpec:
+        return self._spec
+
+    def tile_keys(self) -> List[Tuple[int, int]]:
+        """
+        :return: (tile_row, tile_column) of every tile holding soundings
+        """
+        keys = (path.stem.split("_")[1:] for path in self._directory.glob("tile_*.npy"))
+        return sorted((int(row), int(column)) for row, column in keys)
+
+    def _tile(self, key: Tuple[int, int], create: bool = False) -> Optional[np.memmap]:
+        path = self._directory / f"tile_{key[0]}_{key[1]}.npy"
+        if path.exists():
+            return np.lib.format.open_memmap(path, mode="r+")
+        if not create:
+            return None
+        size = self._spec.tile_size
+        tile = np.lib.format.open_memmap(
+            path, mode="w+", dtype=TILE_DTYPE, shape=(size, size)
+        )
+        tile["min"] = np.inf
+        tile["max"] = -np.inf
+        return tile
+
+    def add_soundings(
+        self,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        depth: np.ndarray,
+        vertical_error: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Accumulates soundings into the grid. Soundings outside the grid or without a
+        position or depth are left out.
+        :param latitude: Degrees, positive going north
+        :param longitude: Degrees, positive going east
+        :param depth: Meters
+        :param vertical_error: Uncertainty at the 95% confidence level (meters), used
+                               to weight depths by their inverse variance. Soundings
+                               without a positive uncertainty carry no weight.
+        :return: Number of soundings accumulated
+        """
+        latitude = np.ravel(latitude)
+        longitude = np.ravel(longitude)
+        depth = np.ravel(depth)
+        rows, columns, inside = self._spec.cell_indices(latitude, longitude)
+        inside &= ~np.isnan(depth)
+
+        weight = np.zeros_like(depth)
+        if vertical_error is not None:
+            sigma = np.ravel(vertical_error) / CONFIDENCE_95
+            with np.errstate(divide="ignore", invalid="ignore"):
+                weight = np.where(sigma > 0, 1.0 / sigma ** 2, 0.0)
+
+        size = self._spec.tile_size
+        tiles = (rows // size) * self._spec.number_tile_columns + columns // size
+        cells = (rows % size) * size + columns % size
+        keys = (tiles * size * size + cells)[inside]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        depth = depth[inside][order]
+        weight = weight[inside][order]
+        if keys.size == 0:
+            return 0
+
+        keys, starts = np.unique(keys, return_index=True)
+        counts = np.diff(np.append(starts, depth.size))
+        partial = np.empty(keys.size, dtype=TILE_DTYPE)
+        partial["count"] = counts
+        partial["mean"] = np.add.reduceat(depth, starts) / counts
+        partial["m2"] = np.add.reduceat(
+            (depth - np.repeat(partial["mean"], counts)) ** 2, starts
+        )
+        partial["min"] = np.minimum.reduceat(depth, starts)
+        partial["max"] = np.maximum.reduceat(depth, starts)
+        partial["weight"] = np.add.reduceat(weight, starts)
+        partial["weighted_sum"] = np.add.reduceat(weight * depth, starts)
+
+        tiles, tile_starts = np.unique(keys // (size * size), return_index=True)
+        for tile_number, start, end in zip(
+            tiles, tile_starts, np.append(tile_starts[1:], keys.size)
+        ):
+            key = divmod(int(tile_number), self._spec.number_tile_columns)
+            tile = self._tile(key, create=True)
+            _merge_cells(
+                tile.reshape(-1), keys[start:end] % (size * size), partial[start:end]
+            )
+            tile.flush()
+
+        return depth.size
+
+    def add_block(self, block: PingBlock, use_uncertainty: bool = False) -> int:
+        """
+        Accumulates the soundings of a block of pings, leaving out those of pings
+        flagged to be ignored and those with non-zero beam flags.
+        :param block: Pings read with at least the GRID_BEAM_FIELDS beam arrays, and
+                      vertical_error if use_uncertainty is True
+        :param use_uncertainty: Weight depths by their vertical_error
+        :return: Number of soundings accumulated
+        """
+        accepted = accepted_beams(block)
+        latitude, longitude = beam_positions(block)
+        vertical_error = None
+        if use_uncertainty and "vertical_error" in block:
+            vertical_error = block["vertical_error"][accepted]
+        return self.add_soundings(
+            latitude[accepted],
+            longitude[accepted],
+            block["depth"][accepted],
+            vertical_error,
+        )
+
+    def merge(self, other: "Grid"):
+        """
+        Accumulates the soundings of another grid of the same layout into this one.
+        :param other: Grid to merge
+        :raises ValueError: Raised if the grids have different layouts
+        """
+        if other.spec != self._spec:
+            raise ValueError("Cannot merge grids with different layouts")
+        for key in other.tile_keys():
+            source = other._tile(key).reshape(-1)
+            cells = np.flatnonzero(source["count"])
+            tile = self._tile(key, create=True)
+            _merge_cells(tile.reshape(-1), cells, source[cells])
+            tile.flush()
+
+    def tile_statistic(self, key: Tuple[int, int], statistic: str) -> np.ndarray:
+        """
+        :param key: (tile_row, tile_column) of the tile
+        :param statistic: One of STATISTICS
+        :return: (row, column) array of the statistic over the cells of the tile,
+                 NaN (or zero counts) for cells without soundings
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unknown statistic: {statistic}")
+
+        tile = self._tile(key)
+        size = self._spec.tile_size
+        if tile is None:
+            tile = np.zeros((size, size), dtype=TILE_DTYPE)
+        if statistic == "count":
+            return np.array(tile["count"])
+
+        count = tile["count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if statistic == "std":
+                values = np.sqrt(tile["m2"] / count)
+            elif statistic == "weighted_mean":
+                values = tile["weighted_sum"] / tile["weight"]
+            else:
+                values = np.array(tile[statistic])
+        return np.where(count > 0, values, np.nan)
+
+    def surface(self, statistic: str) -> np.ndarray:
+        """
+        Assembles a statistic over the whole grid from its tiles.
+        :param statistic: One of STATISTICS
+        :return: (row, column) array of the statistic, rows running north and columns
+                 east, NaN (or zero counts) for cells without soundings
+        """
+        spec = self._spec
+        size = spec.tile_size
+        tile_rows = -(-spec.number_rows // size)
+        dtype = np.int64 if statistic == "count" else np.float64
+        fill = 0 if statistic == "count" else np.nan
+        values = np.full(
+            (tile_rows * size, spec.number_tile_columns * size), fill, dtype=dtype
+        )
+        for row, column in self.tile_keys():
+            values[
+                row * size : (row + 1) * size, column * size : (column + 1) * size
+            ] = self.tile_statistic((row, column), statistic)
+        return values[: spec.number_rows, : spec.number_columns]
+
+
+def _merge_cells(tile: np.ndarray, cells: np.ndarray, partial: np.ndarray):
+    """
+    Merges partial accumulators into the given cells of a flattened tile
+    """
+    current = tile[cells]
+    count = current["count"] + partial["count"]
+    fraction = partial["count"] / count
+    delta = partial["mean"] - current["mean"]
+
+    current["mean"] += delta * fraction
+    current["m2"] += partial["m2"] + delta ** 2 * current["count"] * fraction
+    current["count"] = count
+    current["min"] = np.minimum(current["min"], partial["min"])
+    current["max"] = np.maximum(current["max"], partial["max"])
+    current["weight"] += partial["weight"]
+    current["weighted_sum"] += partial["weighted_sum"]
+    tile[cells] = current
+
+
+def grid_file(
+    path: Union[str, Path],
+    grid: Grid,
+    use_uncertainty: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Streams the soundings of a GSF file into a grid, a block of pings at a time.
+    :param path: Location of the GSF file
+    :param grid: Grid to accumulate into
+    :param use_uncertainty: Weight depths by their vertical_error
+    :param block_size: Maximum number of pings per block
+    :return: Number of soundings accumulated
+    :raises GsfException: Raised if anything went wrong
+    """
+    beam_fields = GRID_BEAM_FIELDS + (("vertical_error",) if use_uncertainty else ())
+    with open_gsf(path) as gsf_file:
+        return sum(
+            grid.add_block(block, use_uncertainty)
+            for block in iter_ping_blocks(gsf_file, beam_fields, block_size)
+        )
+
+
+def grid_files(
+    paths: Iterable[Union[str, Path]],
+    directory: Union[str, Path],
+    spec: Optional[GridSpec] = None,
+    use_uncertainty: bool = False,
+    max_workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, int]:
+    """
+    Grids many files in a pool of processes, one file per task. Each file is
+    gridded into a grid of its own, and these are merged into the grid in the
+    directory in the order the files are given.
+    :param paths: Locations of the GSF files to grid
+    :param directory: Directory of the grid to accumulate into
+    :param spec: Layout of the grid, if it does not yet exist
+    :param use_uncertainty: Weight depths by their vertical_error
+    :param max_workers: Maximum number of processes, by default the number of CPUs
+    :param block_size: Maximum number of pings per block
+    :return: Number of soundings accumulated from each file, keyed by path
+    :raises GsfException: Raised if anything went wrong
+    """
+    grid = Grid(directory, spec)
+    with tempfile.TemporaryDirectory(dir=grid.directory) as scratch_dir:
+        with ProcessPoolExecutor(max_workers) as executor:
+            tasks = [
+                (str(path), Path(scratch_dir) / str(file_number))
+                for file_number, path in enumerate(paths)
+            ]
+            futures = [
+                executor.submit(
+                    _grid_path, path, file_dir, grid.spec, use_uncertainty, block_size
+                )
+                for path, file_dir in tasks
+            ]
+            counts = {}
+            for (path, file_dir), future in zip(tasks, futures):
+                counts[path] = future.result()
+                grid.merge(Grid(file_dir))
+    return counts
+
+
+def _grid_path(
+    path: Union[str, Path],
+    directory: Path,
+    spec: GridSpec,
+    use_uncertainty: bool,
+    block_size: int,
+) -> int:
+    return grid_file(path, Grid(directory, spec), use_uncertainty, block_size)
@@ -0,0 +1,197 @@
+"""Summaries of the contents of GSF files, for cataloguing them"""
+from collections import Counter
+from ctypes import byref, c_int, c_longlong
+from os import fsencode, fspath
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Union
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _call, _read_next, open_gsf
+from gsfpy3_08.bindings import (
+    gsfFileContainsMBAmplitude,
+    gsfFileContainsMBImagery,
+    gsfStat,
+)
+from gsfpy3_08.columnar import BEAM_ARRAY_SUBRECORDS, _read_pings
+from gsfpy3_08.enums import FileMode, RecordType, ScaledSwathBathySubRecord, SeekOption
+from gsfpy3_08.gsfDataID import c_gsfDataID
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_08.structured import as_structured
+from gsfpy3_08.timespec import timespec_to_seconds
+
+_PING = RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+# libgsf records unknown positions as 91 degrees of latitude and 181 of longitude
+_MAX_LATITUDE = 90.0
+_MAX_LONGITUDE = 180.0
+
+
+class FileInventory(NamedTuple):
+    """What a GSF file holds, without any of its data"""
+
+    path: str
+    # Size of the file in bytes
+    size: int
+    # Number of records of each type the file holds, leaving out those it holds none of
+    record_counts: Dict[RecordType, int]
+    # Seconds since the beginning of the epoch of the earliest and latest pings, which
+    # are NaN when the file holds no pings
+    start_time: float
+    end_time: float
+    # Bounding box of the positions of the pings in degrees, which is NaN when no ping
+    # has a known position. Boxes crossing the antimeridian span every longitude in
+    # between.
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+    # Distinct sensor ids of the pings, in ascending order
+    sensor_ids: List[int]
+    # Number of pings with each number of beams
+    number_beams: Dict[int, int]
+    # Beam arrays that any ping holds, in ascending order
+    subrecords: List[ScaledSwathBathySubRecord]
+    # Beam arrays that any ping has a scale factor for, in ascending order. Writers may
+    # record scale factors for arrays their pings do not hold.
+    scaled_subrecords: List[ScaledSwathBathySubRecord]
+    # Whether the pings hold average amplitudes or imagery time series per beam
+    contains_amplitude: bool
+    contains_imagery: bool
+
+    @property
+    def number_pings(self) -> int:
+        return self.record_counts.get(_PING, 0)
+
+
+class _PingSummary:
+    """Accumulates the facts about pings that FileInventory holds"""
+
+    def __init__(self):
+        self.start_time = np.inf
+        self.end_time = -np.inf
+        # Minimum then maximum latitude and longitude
+        self.bounds = [np.inf, np.inf, -np.inf, -np.inf]
+        self.sensor_ids = set()
+        self.number_beams = Counter()
+        self.held = set()
+        self.scaled = np.zeros(len(ScaledSwathBathySubRecord), dtype=bool)
+
+    def add(self, mb_ping: c_gsfSwathBathyPing):
+        ping_time = timespec_to_seconds(mb_ping.ping_time)
+        self.start_time = min(self.start_time, ping_time)
+        self.end_time = max(self.end_time, ping_time)
+        latitude, longitude = mb_ping.latitude, mb_ping.longitude
+        if abs(latitude) <= _MAX_LATITUDE and abs(longitude) <= _MAX_LONGITUDE:
+            bounds = self.bounds
+            bounds[:] = (
+                min(bounds[0], latitude),
+                min(bounds[1], longitude),
+                max(bounds[2], latitude),
+                max(bounds[3], longitude),
+            )
+        self.sensor_ids.add(mb_ping.sensor_id)
+        self.number_beams[mb_ping.number_beams] += 1
+        self.held.update(
+            subrecord_id
+            for field, subrecord_id in BEAM_ARRAY_SUBRECORDS.items()
+            if subrecord_id not in self.held and getattr(mb_ping, field)
+        )
+        multipliers = as_structured(mb_ping.scaleFactors)["scaleTable"]["multiplier"]
+        self.scaled |= multipliers[0, : len(self.scaled)] > 0
+
+    def scaled_subrecords(self) -> List[ScaledSwathBathySubRecord]:
+        return [
+            ScaledSwathBathySubRecord(index + 1)
+            for index in np.flatnonzero(self.scaled)
+        ]
+
+
+def _file_size(path: str) -> int:
+    size = c_longlong(0)
+    _call(gsfStat, fsencode(path), byref(size))
+    return size.value
+
+
+def _contains(gsf_file: GsfFile, function) -> bool:
+    status = c_int(0)
+    _call(function, gsf_file.handle, byref(status))
+    return bool(status.value)
+
+
+def _count_and_summarise(gsf_file: GsfFile, summary: _PingSummary) -> Counter:
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    if gsf_file.file_mode == FileMode.GSF_READONLY_INDEX:
+        counts = Counter(
+            {
+                record_type: gsf_file.get_number_records(record_type)
+                for record_type in RecordType
+                if record_type != RecordType.GSF_NEXT_RECORD
+            }
+        )
+        # libgsf does not index the header record, which begins every file
+        counts[RecordType.GSF_RECORD_HEADER] = 1
+        for _ in _read_pings(gsf_file, data_id, records):
+            summary.add(records.mb_ping)
+        return counts
+
+    # Every record is read once, in turn, whatever its type
+    counts = Counter()
+    with gsf_file.lock:
+        gsf_file.seek(SeekOption.GSF_REWIND)
+        while _read_next(gsf_file, RecordType.GSF_NEXT_RECORD, data_id, records):
+            record_type = RecordType(data_id.recordID)
+            counts[record_type] += 1
+            if record_type == _PING:
+                summary.add(records.mb_ping)
+        gsf_file.seek(SeekOption.GSF_REWIND)
+    return counts
+
+
+def inspect(path: Union[str, Path], use_index: bool = False) -> FileInventory:
+    """
+    Summarises what a GSF file holds: how many records of each type, the time span,
+    bounding box, sensors, numbers of beams, beam arrays and scale factors of its
+    pings, and its size. The file is read in a single pass, decoding each record
+    once, or, when use_index is set, records are counted from the file's index and
+    only the pings are read.
+    :param path: Location of the GSF file
+    :param use_index: Whether to count the records through the file's index, which
+                      libgsf builds alongside the file on first use and reuses after
+                      that, rather than by reading through the file
+    :return: FileInventory
+    :raises GsfException: Raised if anything went wrong
+    """
+    path = fspath(path)
+    mode = FileMode.GSF_READONLY_INDEX if use_index else FileMode.GSF_READONLY
+    summary = _PingSummary()
+    with open_gsf(path, mode) as gsf_file:
+        contains_amplitude = _contains(gsf_file, gsfFileContainsMBAmplitude)
+        contains_imagery = _contains(gsf_file, gsfFileContainsMBImagery)
+        counts = _count_and_summarise(gsf_file, summary)
+
+    has_pings = bool(summary.number_beams)
+    bounds = summary.bounds if np.isfinite(summary.bounds[0]) else [np.nan] * 4
+    min_latitude, min_longitude, max_latitude, max_longitude = bounds
+    return FileInventory(
+        path=path,
+        size=_file_size(path),
+        record_counts={
+            record_type: count
+            for record_type, count in sorted(counts.items())
+            if count > 0
+        },
+        start_time=summary.start_time if has_pings else np.nan,
+        end_time=summary.end_time if has_pings else np.nan,
+        min_latitude=min_latitude,
+        min_longitude=min_longitude,
+        max_latitude=max_latitude,
+        max_longitude=max_longitude,
+        sensor_ids=sorted(summary.sensor_ids),
+        number_beams=dict(sorted(summary.number_beams.items())),
+        subrecords=sorted(summary.held),
+        scaled_subrecords=summary.scaled_subrecords(),
+        contains_amplitude=contains_amplitude,
+        contains_imagery=contains_imagery,
+    )
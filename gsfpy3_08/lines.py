@@ -0,0 +1,135 @@
+"""Segmentation of swath bathymetry pings into survey lines"""
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile
+from gsfpy3_08.columnar import DEFAULT_BLOCK_SIZE, iter_ping_blocks
+from gsfpy3_08.summary import SUMMARY_BEAM_FIELDS, SwathSummary
+
+# Number of headings first searched for the next line break, doubled on each retry,
+# so that the search costs time in proportion to the distance to the break
+_SEARCH_WINDOW = 256
+
+
+# Heading change (degrees) beyond which libgsf starts a new line when the heading
+# crosses north, whatever the azimuth change given
+_CHANGE_ACROSS_NORTH = 10.0
+
+
+def is_new_line(
+    heading: np.ndarray, last_heading: float, azimuth_change: float
+) -> np.ndarray:
+    """
+    Applies the test of gsfIsNewSurveyLine() to each heading. A heading starts a new
+    line when it differs from the last heading by more than azimuth_change or, where
+    the difference crosses north, by more than 10 degrees.
+    :param heading: Degrees
+    :param last_heading: Heading (degrees) of the ping that started the current line
+    :param azimuth_change: Heading change (degrees) beyond which a new line starts
+    :return: Boolean array, True for headings that start a new line
+    """
+    change = np.abs(np.asarray(heading, dtype=np.float64) - last_heading)
+    return (change > azimuth_change) & (
+        (change <= 180.0) | (360.0 - change > _CHANGE_ACROSS_NORTH)
+    )
+
+
+def new_line_indices(
+    heading: np.ndarray, azimuth_change: float, last_heading: Optional[float] = None
+) -> np.ndarray:
+    """
+    Vectorised equivalent of calling gsfIsNewSurveyLine() for each ping in turn. A
+    ping starts a new line when its heading differs from that of the ping that
+    started the current line (see is_new_line()), and its heading becomes the
+    current line's heading.
+    :param heading: Heading of each ping (degrees)
+    :param azimuth_change: Heading change (degrees) beyond which a new line starts
+    :param last_heading: Heading of the current line before the first ping, by
+                         default the heading of the first ping
+    :return: Indices of the pings that start a new line, in ascending order
+    """
+    heading = np.asarray(heading, dtype=np.float64)
+    if heading.size == 0:
+        return np.empty(0, dtype=np.int64)
+    reference = heading[0] if last_heading is None else last_heading
+
+    indices: List[int] = []
+    start = 0
+    window = _SEARCH_WINDOW
+    while start < heading.size:
+        end = min(start + window, heading.size)
+        exceeded = np.flatnonzero(
+            is_new_line(heading[start:end], reference, azimuth_change)
+        )
+        if exceeded.size:
+            index = start + int(exceeded[0])
+            indices.append(index)
+            reference = heading[index]
+            start = index + 1
+            window = _SEARCH_WINDOW
+        else:
+            start = end
+            window *= 2
+
+    return np.array(indices, dtype=np.int64)
+
+
+class SurveyLine(NamedTuple):
+    """
+    A run of consecutive pings, identified by the record numbers of its first and
+    last pings
+    """
+
+    first_record_number: int
+    last_record_number: int
+    summary: SwathSummary
+
+    @property
+    def number_pings(self) -> int:
+        return self.last_record_number - self.first_record_number + 1
+
+
+def find_survey_lines(
+    gsf_file: GsfFile, azimuth_change: float, block_size: int = DEFAULT_BLOCK_SIZE
+) -> List[SurveyLine]:
+    """
+    Segments the pings of a file into survey lines (see new_line_indices()), with the
+    summary of each line.
+    :param gsf_file: File to read from
+    :param azimuth_change: Heading change (degrees) beyond which a new line starts
+    :param block_size: Maximum number of pings per block
+    :return: SurveyLine of each line in the file, in record order
+    :raises GsfException: Raised if anything went wrong
+    """
+    lines: List[SurveyLine] = []
+    first_record_number = last_record_number = 0
+    summary = SwathSummary()
+    last_heading = None
+
+    for block in iter_ping_blocks(gsf_file, SUMMARY_BEAM_FIELDS, block_size):
+        heading = block["heading"]
+        breaks = new_line_indices(heading, azimuth_change, last_heading)
+        if last_heading is None:
+            first_record_number = int(block.record_numbers[0])
+            last_heading = float(heading[0])
+
+        start = 0
+        for index in breaks:
+            summary = summary.merge(
+                SwathSummary.from_ping_block(block.select(slice(start, index)))
+            )
+            record_number = int(block.record_numbers[index])
+            lines.append(SurveyLine(first_record_number, record_number - 1, summary))
+            first_record_number = record_number
+            summary = SwathSummary()
+            last_heading = float(heading[index])
+            start = index
+        summary = summary.merge(
+            SwathSummary.from_ping_block(block.select(slice(start, None)))
+        )
+        last_record_number = int(block.record_numbers[-1])
+
+    if last_heading is not None:
+        lines.append(SurveyLine(first_record_number, last_record_number, summary))
+    return lines
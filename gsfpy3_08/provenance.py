@@ -0,0 +1,126 @@
+"""Bulk extraction of the comment and history records of GSF files"""
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import string_at
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _iter_records, open_gsf
+from gsfpy3_08.enums import FileMode, RecordType
+from gsfpy3_08.timespec import timespec_to_seconds
+
+
+class Comments(NamedTuple):
+    """Comment records of a file, in the order they were read"""
+
+    # Seconds since the beginning of the epoch
+    time: np.ndarray
+    comment: List[str]
+
+
+class History(NamedTuple):
+    """History records of a file, in the order they were read"""
+
+    # Seconds since the beginning of the epoch
+    time: np.ndarray
+    host_name: List[str]
+    operator_name: List[str]
+    command_line: List[str]
+    comment: List[str]
+
+
+class Provenance(NamedTuple):
+    """Comment and history records of a file"""
+
+    comments: Comments
+    history: History
+
+
+def _text(pointer, length: Optional[int] = None) -> str:
+    """
+    Decodes text held through a POINTER(c_char), up to its first NUL, which is an
+    empty string where the pointer is NULL
+    """
+    if not pointer:
+        return ""
+    raw = string_at(pointer) if length is None else string_at(pointer, length)
+    return raw.split(b"\0", 1)[0].decode(errors="replace")
+
+
+def read_comments(gsf_file: GsfFile) -> Comments:
+    """
+    Reads every comment record of the file, skipping the other records undecoded
+    :param gsf_file: File to read from, rewound before and after reading unless open
+                     in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode, in which case the
+                     records are found through the index
+    :return: Comments
+    :raises GsfException: Raised if anything went wrong
+    """
+    time = []
+    comment = []
+    for records in _iter_records(gsf_file, RecordType.GSF_RECORD_COMMENT):
+        record = records.comment
+        time.append(timespec_to_seconds(record.comment_time))
+        comment.append(_text(record.comment, max(record.comment_length, 0)))
+    return Comments(np.array(time, dtype=np.float64), comment)
+
+
+def read_history(gsf_file: GsfFile) -> History:
+    """
+    Reads every history record of the file, skipping the other records undecoded
+    :param gsf_file: File to read from, rewound before and after reading unless open
+                     in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode, in which case the
+                     records are found through the index
+    :return: History
+    :raises GsfException: Raised if anything went wrong
+    """
+    history = History([], [], [], [], [])
+    for records in _iter_records(gsf_file, RecordType.GSF_RECORD_HISTORY):
+        record = records.history
+        history.time.append(timespec_to_seconds(record.history_time))
+        history.host_name.append(record.host_name.decode(errors="replace"))
+        history.operator_name.append(record.operator_name.decode(errors="replace"))
+        history.command_line.append(_text(record.command_line))
+        history.comment.append(_text(record.comment))
+    return history._replace(time=np.array(history.time, dtype=np.float64))
+
+
+def read_provenance(path: Union[str, Path], use_index: bool = False) -> Provenance:
+    """
+    Reads every comment and history record of a GSF file. Only those records are
+    decoded, pings and all other records being skipped over. Unless the index is
+    used, this takes two passes over the file, one per record type: libgsf skips the
+    records of other types by their headers alone, which is several times faster
+    than a single pass with GSF_NEXT_RECORD, as that decodes every ping.
+    :param path: Location of the GSF file
+    :param use_index: Whether to find the records through the file's index, which
+                      libgsf builds alongside the file on first use and reuses after
+                      that, rather than by reading through the file
+    :return: Provenance
+    :raises GsfException: Raised if anything went wrong
+    """
+    mode = FileMode.GSF_READONLY_INDEX if use_index else FileMode.GSF_READONLY
+    with open_gsf(path, mode) as gsf_file:
+        return Provenance(read_comments(gsf_file), read_history(gsf_file))
+
+
+def read_provenance_files(
+    paths: Iterable[Union[str, Path]],
+    use_index: bool = False,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Provenance]:
+    """
+    Runs read_provenance() over many files in a pool of processes, one file per task
+    :param paths: Locations of the GSF files
+    :param use_index: Whether to find the records through the index of each file
+    :param max_workers: Maximum number of processes, by default the number of CPUs
+    :return: Provenance of each file, keyed by path
+    :raises GsfException: Raised if anything went wrong
+    """
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {
+            str(path): executor.submit(read_provenance, path, use_index)
+            for path in paths
+        }
+        return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,431 @@
+"""Constant-gradient ray tracing of swath bathymetry pings"""
+from ctypes import byref, c_int
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _call, open_gsf
+from gsfpy3_08.bindings import (
+    gsfFileSupportsRecalculateNominalDepth,
+    gsfFileSupportsRecalculateXYZ,
+)
+from gsfpy3_08.columnar import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_PRECISION,
+    PingBlock,
+    iter_ping_blocks,
+    update_beam_columns,
+    write_beam_columns,
+)
+from gsfpy3_08.enums import FileMode
+from gsfpy3_08.svp import NOMINAL_SOUND_SPEED, SvpCatalogue, SvpLayers
+
+RAY_TRACE_BEAM_FIELDS = ("travel_time", "beam_angle", "beam_angle_forward")
+
+# Layers with a smaller sound speed gradient (1/second) than this are treated as
+# having a constant sound speed
+_MIN_GRADIENT = 1e-9
+
+
+class XYZ(NamedTuple):
+    """
+    Sounding positions relative to the vessel, in the layout of the c_gsfSwathBathyPing
+    beam arrays. Beams that could not be traced are NaN.
+    """
+
+    # Depth below the sea surface (meters)
+    depth: np.ndarray
+    # Across track distance, positive to starboard (meters)
+    across_track: np.ndarray
+    # Along track distance, positive forward (meters)
+    along_track: np.ndarray
+
+
+def launch_vectors(
+    beam_angle: np.ndarray,
+    beam_angle_forward: Optional[np.ndarray] = None,
+    roll: Union[float, np.ndarray] = 0.0,
+    pitch: Union[float, np.ndarray] = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts GSF beam angles to unit launch vectors in a level frame aligned with the
+    vessel heading. beam_angle is the athwartship angle from vertical, positive to
+    port, and beam_angle_forward the angle between the beam and the forward axis of
+    the vessel, 90 degrees for a beam with no fore/aft component. Roll (positive port
+    up) and pitch (positive bow up) are applied when the beam angles are not already
+    compensated for attitude. All angles are in degrees and all arguments must
+    broadcast together.
+    :return: Tuple of the starboard, forward and downward components
+    """
+    across = np.radians(beam_angle)
+    forward = np.radians(90.0 if beam_angle_forward is None else beam_angle_forward)
+    forward = np.where(np.isnan(forward), np.pi / 2, forward)
+
+    x = -np.sin(forward) * np.sin(across)
+    y = np.cos(forward) * np.ones_like(across)
+    z = np.sin(forward) * np.cos(across)
+
+    roll = np.radians(roll)
+    x, z = x * np.cos(roll) - z * np.sin(roll), x * np.sin(roll) + z * np.cos(roll)
+
+    pitch = np.radians(pitch)
+    y, z = y * np.cos(pitch) - z * np.sin(pitch), y * np.sin(pitch) + z * np.cos(pitch)
+
+    return x, y, z
+
+
+def ray_trace(
+    layers: SvpLayers,
+    travel_time: np.ndarray,
+    beam_angle: np.ndarray,
+    beam_angle_forward: Optional[np.ndarray] = None,
+    roll: Union[float, np.ndarray] = 0.0,
+    pitch: Union[float, np.ndarray] = 0.0,
+    transducer_depth: Union[float, np.ndarray] = 0.0,
+) -> XYZ:
+    """
+    Traces rays through a layered sound velocity profile, within each layer of which
+    the sound speed varies linearly with depth, so that rays follow circular arcs.
+    All rays are traced together, one layer at a time. Beyond the deepest layer the
+    sound speed is held constant.
+    :param layers: Layer table of the sound velocity profile
+    :param travel_time: Two-way travel times (seconds)
+    :param beam_angle: See launch_vectors()
+    :param beam_angle_forward: See launch_vectors()
+    :param roll: See launch_vectors()
+    :param pitch: See launch_vectors()
+    :param transducer_depth: Depth of the transducer below the sea surface (meters)
+    :return: XYZ with the broadcast shape of the arguments
+    """
+    x, y, z = launch_vectors(beam_angle, beam_angle_forward, roll, pitch)
+    travel_time, transducer_depth, x, y, z = np.broadcast_arrays(
+        travel_time, transducer_depth, x, y, z
+    )
+    shape = travel_time.shape
+
+    time_left = travel_time.ravel() / 2.0
+    depth = np.array(transducer_depth, dtype=np.float64).ravel()
+    sin_launch = np.hypot(x, y).ravel()
+    cos_launch = np.clip(z.ravel(), -1.0, 1.0)
+    azimuth = np.arctan2(x, y).ravel()
+    horizontal = np.zeros_like(time_left)
+    valid = np.isfinite(time_left) & np.isfinite(sin_launch) & (cos_launch > 0)
+
+    # Sound speed at the transducer fixes the ray parameter (Snell's law) of each ray
+    speed = np.interp(depth, layers.depth, layers.sound_speed)
+    ray_parameter = sin_launch / speed
+
+    active = valid.copy()
+    for top, bottom, speed_top, speed_bottom in zip(
+        layers.depth[:-1],
+        layers.depth[1:],
+        layers.sound_speed[:-1],
+        layers.sound_speed[1:],
+    ):
+        if not active.any():
+            break
+        in_layer = active & (depth < bottom)
+        if not in_layer.any():
+            continue
+
+        p = ray_parameter[in_layer]
+        z0 = depth[in_layer]
+        gradient = (speed_bottom - speed_top) / (bottom - top)
+        c0 = speed_top + gradient * (z0 - top)
+
+        sin0 = p * c0
+        sin1 = p * speed_bottom
+        turned = sin1 >= 1.0
+        cos0 = np.sqrt(1.0 - np.minimum(sin0, 1.0) ** 2)
+        cos1 = np.sqrt(1.0 - np.minimum(sin1, 1.0) ** 2)
+
+        if abs(gradient) < _MIN_GRADIENT:
+            dt, dx = _straight_layer(c0, sin0, cos0, bottom - z0)
+        else:
+            dt, dx = _curved_layer(p, gradient, c0, speed_bottom, cos0, cos1)
+
+        t_left = time_left[in_layer]
+        ends_here = (t_left <= dt) | turned
+        crosses = ~ends_here
+
+        # Rays leaving the layer through its base
+        time_left[in_layer] = np.where(crosses, t_left - dt, t_left)
+        horizontal[in_layer] += np.where(crosses, dx, 0.0)
+        depth[in_layer] = np.where(crosses, bottom, z0)
+
+        # Rays whose travel time runs out within the layer
+        ends = np.flatnonzero(in_layer)[ends_here]
+        if ends.size:
+            end_depth, end_horizontal = _partial_layer(
+                p[ends_here],
+                gradient,
+                c0[ends_here],
+                sin0[ends_here],
+                cos0[ends_here],
+                t_left[ends_here],
+            )
+            depth[ends] += end_depth
+            horizontal[ends] += end_horizontal
+            active[ends] = False
+
+    # Constant sound speed beyond the deepest layer
+    if active.any():
+        c = layers.sound_speed[-1]
+        sin_final = np.minimum(ray_parameter[active] * c, 1.0)
+        cos_final = np.sqrt(1.0 - sin_final ** 2)
+        depth[active] += c * cos_final * time_left[active]
+        horizontal[active] += c * sin_final * time_left[active]
+
+    depth[~valid] = np.nan
+    horizontal[~valid] = np.nan
+
+    return XYZ(
+        depth=depth.reshape(shape),
+        across_track=(horizontal * np.sin(azimuth)).reshape(shape),
+        along_track=(horizontal * np.cos(azimuth)).reshape(shape),
+    )
+
+
+def _straight_layer(c0, sin0, cos0, thickness):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dt = thickness / (c0 * cos0)
+        dx = thickness * sin0 / cos0
+    return dt, dx
+
+
+def _curved_layer(p, gradient, c0, c1, cos0, cos1):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dt = np.log((c1 / c0) * (1.0 + cos0) / (1.0 + cos1)) / gradient
+        dx = np.where(p > 0, (cos0 - cos1) / (p * gradient), 0.0)
+    return dt, dx
+
+
+def _partial_layer(p, gradient, c0, sin0, cos0, time_left):
+    """
+    Position reached by rays that run out of travel time within a layer, relative to
+    where they entered it
+    """
+    if abs(gradient) < _MIN_GRADIENT:
+        return c0 * cos0 * time_left, c0 * sin0 * time_left
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Along an arc tan(theta / 2) grows exponentially with travel time
+        theta0 = np.arcsin(np.minimum(sin0, 1.0))
+        theta = 2.0 * np.arctan(np.tan(theta0 / 2.0) * np.exp(gradient * time_left))
+        c = np.where(p > 0, np.sin(theta) / p, c0 * np.exp(gradient * time_left))
+        dz = (c - c0) / gradient
+        dx = np.where(p > 0, (cos0 - np.cos(theta)) / (p * gradient), 0.0)
+    return dz, dx
+
+
+def trace_ping_block(
+    block: PingBlock,
+    catalogue: SvpCatalogue,
+    apply_attitude: bool = False,
+    transducer_depth: float = 0.0,
+) -> XYZ:
+    """
+    Ray traces every beam of a block of pings, each with the sound velocity profile
+    in effect at its ping time.
+    :param block: Pings read with at least the RAY_TRACE_BEAM_FIELDS beam arrays
+    :param catalogue: Sound velocity profiles
+    :param apply_attitude: Whether to apply the ping roll and pitch to the beam
+                           angles, for files in which they are not compensated
+    :param transducer_depth: Depth of the transducer below the sea surface (meters)
+    :return: XYZ arrays in the (ping, beam) layout of the block
+    """
+    travel_time = block["travel_time"]
+    depth = np.full(travel_time.shape, np.nan)
+    across_track = np.full(travel_time.shape, np.nan)
+    along_track = np.full(travel_time.shape, np.nan)
+
+    roll, pitch = _attitude(block, apply_attitude)
+
+    profile_indices = catalogue.indices_at(block.ping_time)
+    for profile_index in np.unique(profile_indices):
+        pings = profile_indices == profile_index
+        xyz = ray_trace(
+            catalogue.layers(int(profile_index)),
+            travel_time[pings],
+            block["beam_angle"][pings],
+            block["beam_angle_forward"][pings],
+            roll[pings],
+            pitch[pings],
+            transducer_depth,
+        )
+        depth[pings] = xyz.depth
+        across_track[pings] = xyz.across_track
+        along_track[pings] = xyz.along_track
+
+    return XYZ(depth=depth, across_track=across_track, along_track=along_track)
+
+
+def nominal_depth(
+    travel_time: np.ndarray,
+    beam_angle: np.ndarray,
+    beam_angle_forward: Optional[np.ndarray] = None,
+    roll: Union[float, np.ndarray] = 0.0,
+    pitch: Union[float, np.ndarray] = 0.0,
+    transducer_depth: Union[float, np.ndarray] = 0.0,
+) -> np.ndarray:
+    """
+    Calculates depths for a sound speed of NOMINAL_SOUND_SPEED throughout the water
+    column, along which rays travel in straight lines. Arguments are as for
+    ray_trace().
+    :return: Nominal depths with the broadcast shape of the arguments, NaN for beams
+             that do not point downwards
+    """
+    _, _, z = launch_vectors(beam_angle, beam_angle_forward, roll, pitch)
+    depth = transducer_depth + np.asarray(travel_time) / 2.0 * NOMINAL_SOUND_SPEED * z
+    return np.where(z > 0, depth, np.nan)
+
+
+def compute_nominal_depth(
+    block: PingBlock,
+    apply_attitude: bool = False,
+    transducer_depth: float = 0.0,
+) -> np.ndarray:
+    """
+    :param block: Pings read with at least the RAY_TRACE_BEAM_FIELDS beam arrays
+    :param apply_attitude: See trace_ping_block()
+    :param transducer_depth: See trace_ping_block()
+    :return: Nominal depths in the (ping, beam) layout of the block
+    """
+    roll, pitch = _attitude(block, apply_attitude)
+    return nominal_depth(
+        block["travel_time"],
+        block["beam_angle"],
+        block["beam_angle_forward"],
+        roll,
+        pitch,
+        transducer_depth,
+    )
+
+
+def _attitude(block: PingBlock, apply_attitude: bool) -> Tuple[np.ndarray, np.ndarray]:
+    if apply_attitude:
+        return block["roll"][:, np.newaxis], block["pitch"][:, np.newaxis]
+    no_attitude = np.zeros((block.number_pings, 1))
+    return no_attitude, no_attitude
+
+
+def supports_recalculate_xyz(gsf_file: GsfFile) -> bool:
+    """
+    :param gsf_file: File to check
+    :return: True if libgsf reports that the file holds sufficient information for a
+             full recalculation of the platform relative XYZ values
+    :raises GsfException: Raised if anything went wrong
+    """
+    status = c_int(0)
+    _call(gsfFileSupportsRecalculateXYZ, gsf_file.handle, byref(status))
+    return bool(status.value)
+
+
+def recalculate_xyz(
+    gsf_file: GsfFile,
+    catalogue: Optional[SvpCatalogue] = None,
+    write: bool = False,
+    apply_attitude: bool = False,
+    transducer_depth: float = 0.0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[Tuple[PingBlock, XYZ]]:
+    """
+    Recalculates the depth, across_track and along_track arrays of every ping in the
+    file by ray tracing, a block of pings at a time. Note that this is a generator, so
+    nothing is calculated (or written) until it is iterated over.
+    :param gsf_file: File to process, which must be open in GSF_UPDATE_INDEX mode if
+                     write is True
+    :param catalogue: Sound velocity profiles to use, by default those in the file
+    :param write: Whether to write the recalculated arrays back to the file
+    :param apply_attitude: See trace_ping_block()
+    :param transducer_depth: See trace_ping_block()
+    :param block_size: Maximum number of pings per block
+    :return: Iterator of blocks of pings, with their recalculated XYZ arrays
+    :raises GsfException: Raised if anything went wrong
+    """
+    if write and gsf_file.file_mode != FileMode.GSF_UPDATE_INDEX:
+        raise ValueError("File must be open in GSF_UPDATE_INDEX mode to write")
+    if catalogue is None:
+        catalogue = SvpCatalogue.from_gsf_file(gsf_file)
+
+    for block in iter_ping_blocks(gsf_file, RAY_TRACE_BEAM_FIELDS, block_size):
+        xyz = trace_ping_block(block, catalogue, apply_attitude, transducer_depth)
+        if write:
+            write_beam_columns(gsf_file, block.record_numbers, xyz._asdict())
+        yield block, xyz
+
+
+def update_xyz(
+    path: Union[str, Path],
+    catalogue: Optional[SvpCatalogue] = None,
+    apply_attitude: bool = False,
+    transducer_depth: float = 0.0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Recalculates the XYZ arrays of every ping in a GSF file in place. See
+    recalculate_xyz().
+    :param path: Location of the GSF file to update
+    :return: Number of pings updated
+    :raises GsfException: Raised if anything went wrong
+    """
+    number_pings = 0
+    with open_gsf(path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        for block, _ in recalculate_xyz(
+            gsf_file, catalogue, True, apply_attitude, transducer_depth, block_size
+        ):
+            number_pings += block.number_pings
+    return number_pings
+
+
+def supports_recalculate_nominal_depth(gsf_file: GsfFile) -> bool:
+    """
+    :param gsf_file: File to check
+    :return: True if libgsf reports that the file holds sufficient information for
+             the nominal depth array to be calculated
+    :raises GsfException: Raised if anything went wrong
+    """
+    status = c_int(0)
+    _call(gsfFileSupportsRecalculateNominalDepth, gsf_file.handle, byref(status))
+    return bool(status.value)
+
+
+def update_nominal_depth(
+    path: Union[str, Path],
+    target_path: Optional[Union[str, Path]] = None,
+    apply_attitude: bool = False,
+    transducer_depth: float = 0.0,
+    precision: float = DEFAULT_PRECISION,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Fills the nominal_depth array of every ping in a GSF file. The file is updated in
+    place unless a target path is given, in which case an updated copy is written
+    there instead. In place updates require every ping to hold the array already, as
+    records cannot grow when updated in place.
+    :param path: Location of the GSF file to update
+    :param target_path: Location of the updated copy to create, if any
+    :param apply_attitude: See trace_ping_block()
+    :param transducer_depth: See trace_ping_block()
+    :param precision: Precision of the scale factor loaded for the array (meters)
+    :param block_size: Maximum number of pings per block
+    :return: Number of pings updated
+    :raises GsfException: Raised if anything went wrong
+    """
+
+    def compute(block: PingBlock) -> Dict[str, np.ndarray]:
+        return {
+            "nominal_depth": compute_nominal_depth(
+                block, apply_attitude, transducer_depth
+            )
+        }
+
+    return update_beam_columns(
+        path,
+        compute,
+        RAY_TRACE_BEAM_FIELDS,
+        target_path,
+        block_size,
+        {"nominal_depth": precision},
+    )
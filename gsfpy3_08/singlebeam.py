@@ -0,0 +1,95 @@
+"""Columnar (NumPy) access to single beam ping records"""
+from ctypes import addressof, memmove, sizeof
+from typing import Iterable, Optional
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile
+from gsfpy3_08.columnar import _INDEXED_MODES, _read_pings
+from gsfpy3_08.enums import RecordType
+from gsfpy3_08.gsfDataID import c_gsfDataID
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.gsfSingleBeamPing import c_gsfSingleBeamPing
+from gsfpy3_08.structured import SINGLE_BEAM_PING_DTYPE, stack_structures
+
+_SINGLE_BEAM_PING = RecordType.GSF_RECORD_SINGLE_BEAM_PING
+
+
+def read_single_beam_pings(
+    gsf_file: GsfFile, record_numbers: Optional[Iterable[int]] = None
+) -> np.ndarray:
+    """
+    Reads every single beam ping in the file, from the beginning, into one structured
+    array of SINGLE_BEAM_PING_DTYPE, which has the layout of c_gsfSingleBeamPing, so
+    each ping is copied out of a single record buffer as it is read and nothing is
+    converted. The file is read as by columnar.iter_ping_blocks(), by record number
+    when it is open in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode and otherwise
+    sequentially, rewinding it once all pings have been read.
+    :param gsf_file: File to read from
+    :param record_numbers: Record numbers of the pings to read, in order, by default
+                           all of them. May only be given when the file is open for
+                           direct access.
+    :return: Structured array of one element per ping, see single_beam_ping_times()
+             for their times
+    :raises GsfException: Raised if anything went wrong
+    """
+    if record_numbers is not None and gsf_file.file_mode not in _INDEXED_MODES:
+        raise ValueError("Pings may only be read by record number in indexed modes")
+
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    return stack_structures(
+        (
+            records.sb_ping
+            for _ in _read_pings(
+                gsf_file, data_id, records, record_numbers, _SINGLE_BEAM_PING
+            )
+        ),
+        c_gsfSingleBeamPing,
+    )
+
+
+def write_single_beam_pings(
+    gsf_file: GsfFile,
+    pings: np.ndarray,
+    record_numbers: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Writes single beam pings held as read by read_single_beam_pings(), through a
+    single record buffer
+    :param gsf_file: File to write to
+    :param pings: Structured array of SINGLE_BEAM_PING_DTYPE
+    :param record_numbers: Record numbers of the pings to write over, one per ping,
+                           when the file is open in GSF_UPDATE_INDEX mode. By default
+                           the pings are written at the current position of the file,
+                           e.g. appended to a file being created.
+    :return: Number of pings written
+    :raises ValueError: Raised if the array is not of SINGLE_BEAM_PING_DTYPE
+    :raises GsfException: Raised if anything went wrong
+    """
+    if pings.dtype != SINGLE_BEAM_PING_DTYPE:
+        raise ValueError("Single beam pings must be of SINGLE_BEAM_PING_DTYPE")
+    pings = np.ascontiguousarray(pings).reshape(-1)
+    if record_numbers is None:
+        record_numbers = [0] * len(pings)
+    else:
+        record_numbers = list(record_numbers)
+        if len(record_numbers) != len(pings):
+            raise ValueError("There must be one record number per ping")
+
+    records = c_gsfRecords()
+    address = addressof(records.sb_ping)
+    size = sizeof(c_gsfSingleBeamPing)
+    for index, record_number in enumerate(record_numbers):
+        memmove(address, pings.ctypes.data + index * size, size)
+        gsf_file.write(records, _SINGLE_BEAM_PING, record_number)
+    return len(pings)
+
+
+def single_beam_ping_times(pings: np.ndarray) -> np.ndarray:
+    """
+    :param pings: Structured array of SINGLE_BEAM_PING_DTYPE
+    :return: Time of each ping in seconds since the beginning of the epoch
+    """
+    ping_time = pings["ping_time"]
+    return ping_time["tv_sec"] + ping_time["tv_nsec"] * 1e-9
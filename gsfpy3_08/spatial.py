@@ -0,0 +1,556 @@
+"""Spatial index of swath bathymetry ping footprints"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, open_gsf
+from gsfpy3_08._files import _file_stamp
+from gsfpy3_08.columnar import DEFAULT_BLOCK_SIZE, PingBlock, iter_ping_blocks
+from gsfpy3_08.enums import FileMode, RecordType
+from gsfpy3_08.gsfRecords import c_gsfRecords
+
+FOOTPRINT_BEAM_FIELDS = ("across_track", "along_track")
+
+# Suffix appended to the name of a GSF file to give the name of its sidecar index
+SIDECAR_SUFFIX = ".footprints.npz"
+_SIDECAR_VERSION = 1
+
+# Number of consecutive pings grouped under each bounding box of the upper level of
+# a FootprintIndex. Consecutive pings lie close together along the survey line, so
+# the groups' bounding boxes stay tight.
+DEFAULT_NODE_SIZE = 64
+
+# Length of a degree of latitude, and of longitude at the equator (meters)
+_METERS_PER_DEGREE = 111319.49
+
+# Columns of footprint arrays
+_MIN_LAT, _MIN_LON, _MAX_LAT, _MAX_LON = range(4)
+
+
+class BoundingBox(NamedTuple):
+    """
+    Extents in degrees, latitude positive going north and longitude positive going
+    east. Longitudes are not wrapped, so a box cannot span the antimeridian.
+    """
+
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+
+    def intersects(self, other: "BoundingBox") -> bool:
+        return bool(_intersects(np.array([other]), self)[0])
+
+
+def _intersects(boxes: np.ndarray, box: BoundingBox) -> np.ndarray:
+    """
+    Vectorised bounding box intersection test, False for boxes holding NaN
+    """
+    return (
+        (boxes[:, _MIN_LAT] <= box.max_latitude)
+        & (boxes[:, _MAX_LAT] >= box.min_latitude)
+        & (boxes[:, _MIN_LON] <= box.max_longitude)
+        & (boxes[:, _MAX_LON] >= box.min_longitude)
+    )
+
+
+def _polygon_vertices(polygon: Sequence[Tuple[float, float]]) -> np.ndarray:
+    vertices = np.asarray(polygon, dtype=np.float64)
+    if vertices.ndim != 2 or vertices.shape[1] != 2 or len(vertices) < 3:
+        raise ValueError(
+            "Polygons must have at least three (latitude, longitude) pairs"
+        )
+    return vertices
+
+
+def _polygon_bbox(vertices: np.ndarray) -> BoundingBox:
+    return BoundingBox(*vertices.min(axis=0), *vertices.max(axis=0))
+
+
+def _in_polygon(
+    latitudes: np.ndarray, longitudes: np.ndarray, vertices: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorised even-odd point in polygon test, treating latitude and longitude as
+    plane coordinates, False for points holding NaN
+    """
+    inside = np.zeros(np.shape(latitudes), dtype=bool)
+    for (lat_a, lon_a), (lat_b, lon_b) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        # Edges crossing the parallel of the point, to the east of the point
+        crosses = (lat_a > latitudes) != (lat_b > latitudes)
+        crossing_longitude = lon_a + (latitudes - lat_a) * (lon_b - lon_a) / (
+            lat_b - lat_a if lat_b != lat_a else 1.0
+        )
+        inside ^= crosses & (longitudes < crossing_longitude)
+    return inside
+
+
+def ping_footprints(block: PingBlock) -> np.ndarray:
+    """
+    Approximates the footprint of each ping by the bounding box of the ping position
+    and of the port-most and starboard-most beams, placed using the heading of the
+    ping and the beams' across track and along track distances. Beams without an
+    across track distance are left out.
+    :param block: Pings read with at least the across_track beam array
+    :return: Array of (min_latitude, min_longitude, max_latitude, max_longitude)
+             rows, one per ping
+    """
+    pings = np.arange(block.number_pings)[:, np.newaxis]
+    across_track = np.zeros((block.number_pings, 1))
+    along_track = np.zeros((block.number_pings, 1))
+
+    if "across_track" in block and block["across_track"].shape[1] > 0:
+        valid = block.beam_mask & ~np.isnan(block["across_track"])
+        across = np.where(valid, block["across_track"], 0.0)
+        along = (
+            np.where(valid, np.nan_to_num(block["along_track"]), 0.0)
+            if "along_track" in block
+            else np.zeros_like(across)
+        )
+        beams = np.stack((across.argmin(axis=1), across.argmax(axis=1)), axis=1)
+        across_track = np.hstack((across_track, across[pings, beams]))
+        along_track = np.hstack((along_track, along[pings, beams]))
+
+    latitudes, longitudes = _offset_positions(block, across_track, along_track)
+
+    return np.stack(
+        (
+            latitudes.min(axis=1),
+            longitudes.min(axis=1),
+            latitudes.max(axis=1),
+            longitudes.max(axis=1),
+        ),
+        axis=1,
+    )
+
+
+def beam_positions(block: PingBlock) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Places each beam relative to the ping position using the heading of the ping
+    and the beam's across track and along track distances, on a locally flat earth.
+    :param block: Pings read with at least the across_track beam array
+    :return: Latitude and longitude (degrees) arrays in the (ping, beam) layout of
+             the block, NaN for beams without an across track distance
+    """
+    along_track = (
+        np.nan_to_num(block["along_track"])
+        if "along_track" in block
+        else np.zeros_like(block["across_track"])
+    )
+    return _offset_positions(block, block["across_track"], along_track)
+
+
+def _pings_in_polygon(block: PingBlock, vertices: np.ndarray) -> np.ndarray:
+    """
+    Whether the position or any beam of each ping lies within the polygon
+    """
+    found = _in_polygon(block["latitude"], block["longitude"], vertices)
+    if block["across_track"].shape[1] > 0:
+        latitudes, longitudes = beam_positions(block)
+        beams = _in_polygon(latitudes, longitudes, vertices)
+        found |= (beams & block.beam_mask[:, : beams.shape[1]]).any(axis=1)
+    return found
+
+
+def _offset_positions(
+    block: PingBlock, across_track: np.ndarray, along_track: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    heading = np.radians(block["heading"])[:, np.newaxis]
+    north = along_track * np.cos(heading) - across_track * np.sin(heading)
+    east = along_track * np.sin(heading) + across_track * np.cos(heading)
+
+    latitude = block["latitude"][:, np.newaxis]
+    longitude = block["longitude"][:, np.newaxis]
+    return (
+        latitude + north / _METERS_PER_DEGREE,
+        longitude + east / (_METERS_PER_DEGREE * np.cos(np.radians(latitude))),
+    )
+
+
+class FootprintIndex:
+    """
+    Ping footprints of one GSF file, indexed for bounding box queries. The index has
+    two levels: the bounding boxes of groups of consecutive pings, and the footprints
+    of the pings within the groups that intersect a query.
+    """
+
+    def __init__(
+        self,
+        record_numbers: np.ndarray,
+        footprints: np.ndarray,
+        node_size: int = DEFAULT_NODE_SIZE,
+    ):
+        self._record_numbers = record_numbers
+        self._footprints = footprints
+        self._node_size = node_size
+        starts = np.arange(0, len(record_numbers), node_size)
+        if len(starts):
+            self._nodes = np.stack(
+                (
+                    np.fmin.reduceat(footprints[:, _MIN_LAT], starts),
+                    np.fmin.reduceat(footprints[:, _MIN_LON], starts),
+                    np.fmax.reduceat(footprints[:, _MAX_LAT], starts),
+                    np.fmax.reduceat(footprints[:, _MAX_LON], starts),
+                ),
+                axis=1,
+            )
+        else:
+            self._nodes = np.empty((0, 4))
+
+    @classmethod
+    def build(
+        cls, gsf_file: GsfFile, block_size: int = DEFAULT_BLOCK_SIZE
+    ) -> "FootprintIndex":
+        """
+        :param gsf_file: File to index
+        :param block_size: Maximum number of pings per block
+        :return: FootprintIndex of every ping in the file
+        :raises GsfException: Raised if anything went wrong
+        """
+        record_numbers = [np.empty(0, dtype=np.int64)]
+        footprints = [np.empty((0, 4))]
+        for block in iter_ping_blocks(gsf_file, FOOTPRINT_BEAM_FIELDS, block_size):
+            record_numbers.append(block.record_numbers)
+            footprints.append(ping_footprints(block))
+        return cls(np.concatenate(record_numbers), np.concatenate(footprints))
+
+    def __len__(self) -> int:
+        return len(self._record_numbers)
+
+    @property
+    def record_numbers(self) -> np.ndarray:
+        return self._record_numbers
+
+    @property
+    def footprints(self) -> np.ndarray:
+        """
+        Footprint of each ping, as (min_latitude, min_longitude, max_latitude,
+        max_longitude) rows
+        """
+        return self._footprints
+
+    @property
+    def bounds(self) -> Optional[BoundingBox]:
+        """
+        Bounding box of every footprint, if there are any pings
+        """
+        if len(self) == 0:
+            return None
+        return BoundingBox(
+            min_latitude=float(np.fmin.reduce(self._nodes[:, _MIN_LAT])),
+            min_longitude=float(np.fmin.reduce(self._nodes[:, _MIN_LON])),
+            max_latitude=float(np.fmax.reduce(self._nodes[:, _MAX_LAT])),
+            max_longitude=float(np.fmax.reduce(self._nodes[:, _MAX_LON])),
+        )
+
+    def query_bbox(self, bbox: BoundingBox) -> np.ndarray:
+        """
+        :param bbox: Area to search
+        :return: Record numbers of the pings whose footprints intersect the area, in
+                 ascending order
+        """
+        starts = np.flatnonzero(_intersects(self._nodes, bbox)) * self._node_size
+        candidates = (starts[:, np.newaxis] + np.arange(self._node_size)).ravel()
+        candidates = candidates[candidates < len(self)]
+        hits = candidates[_intersects(self._footprints[candidates], bbox)]
+        return self._record_numbers[hits]
+
+    def save(self, path: Union[str, Path], source_path: Union[str, Path]):
+        """
+        Writes the index to a sidecar file, replacing it atomically. The size and
+        modification time of the indexed file are recorded so that a stale sidecar
+        may be detected.
+        :param path: Location of the sidecar file
+        :param source_path: Location of the indexed GSF file
+        """
+        size, mtime_ns = _file_stamp(source_path)
+        temp_path = Path(f"{path}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as sidecar:
+            np.savez(
+                sidecar,
+                version=_SIDECAR_VERSION,
+                source_size=size,
+                source_mtime_ns=mtime_ns,
+                record_numbers=self._record_numbers,
+                footprints=self._footprints,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], source_path: Union[str, Path]
+    ) -> Optional["FootprintIndex"]:
+        """
+        :param path: Location of the sidecar file
+        :param source_path: Location of the indexed GSF file
+        :return: FootprintIndex read from the sidecar file, or None if the sidecar
+                 does not exist or is out of date with respect to the GSF file
+        """
+        if not Path(path).exists():
+            return None
+        with np.load(path) as sidecar:
+            stamp = (int(sidecar["source_size"]), int(sidecar["source_mtime_ns"]))
+            if int(sidecar["version"]) != _SIDECAR_VERSION or stamp != _file_stamp(
+                source_path
+            ):
+                return None
+            return cls(sidecar["record_numbers"], sidecar["footprints"])
+
+
+def sidecar_path(path: Union[str, Path]) -> Path:
+    """
+    :param path: Location of a GSF file
+    :return: Location of the sidecar file holding its FootprintIndex
+    """
+    path = Path(path)
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def load_footprint_index(
+    path: Union[str, Path], block_size: int = DEFAULT_BLOCK_SIZE
+) -> FootprintIndex:
+    """
+    Loads the FootprintIndex of a GSF file from its sidecar file, first building the
+    index and writing the sidecar if it is missing or out of date.
+    :param path: Location of the GSF file
+    :param block_size: Maximum number of pings per block when building the index
+    :return: FootprintIndex
+    :raises GsfException: Raised if anything went wrong
+    """
+    index = FootprintIndex.load(sidecar_path(path), path)
+    if index is None:
+        with open_gsf(path) as gsf_file:
+            index = FootprintIndex.build(gsf_file, block_size)
+        index.save(sidecar_path(path), path)
+    return index
+
+
+class _SurveyEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    bounds: Optional[BoundingBox]
+
+
+def _survey_entry(path: str, block_size: int) -> _SurveyEntry:
+    bounds = load_footprint_index(path, block_size).bounds
+    return _SurveyEntry(*_file_stamp(path), bounds)
+
+
+class GsfDataset:
+    """
+    Survey-level spatial index over many GSF files. Each file's pings are indexed in
+    a sidecar file alongside it (see load_footprint_index()), and the bounds of every
+    file are held at the survey level, optionally saved to a survey index file. A
+    query loads the sidecars of only those files whose bounds intersect it, and
+    caches them.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Union[str, Path]],
+        index_path: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        """
+        Files that are new to the survey index, or have changed since it was saved,
+        have their sidecar files loaded, or built in a pool of processes where
+        missing or out of date, one file per task.
+        :param paths: Locations of the GSF files of the survey
+        :param index_path: Location of the survey index file, which is read where up
+                           to date and rewritten if anything had to be rebuilt
+        :param max_workers: Maximum number of processes, by default the number of CPUs
+        :param block_size: Maximum number of pings per block when building indexes
+        :raises GsfException: Raised if anything went wrong
+        """
+        self._paths = [str(path) for path in paths]
+        self._block_size = block_size
+        self._file_indexes: Dict[str, FootprintIndex] = {}
+
+        entries = {} if index_path is None else _load_survey_index(index_path)
+        stale = [
+            path
+            for path in self._paths
+            if path not in entries or entries[path][:2] != _file_stamp(path)
+        ]
+        if stale:
+            with ProcessPoolExecutor(max_workers) as executor:
+                futures = {
+                    path: executor.submit(_survey_entry, path, block_size)
+                    for path in stale
+                }
+                entries.update(
+                    (path, future.result()) for path, future in futures.items()
+                )
+            if index_path is not None:
+                _save_survey_index(index_path, self._paths, entries)
+
+        self._bounds = _bounds_array(self._paths, entries)
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def file_index(self, path: Union[str, Path]) -> FootprintIndex:
+        """
+        :param path: Location of one of the GSF files of the survey
+        :return: FootprintIndex of the file, loaded from its sidecar on first request
+        :raises GsfException: Raised if anything went wrong
+        """
+        path = str(path)
+        if path not in self._file_indexes:
+            self._file_indexes[path] = load_footprint_index(path, self._block_size)
+        return self._file_indexes[path]
+
+    def query_bbox(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> List[Tuple[str, int]]:
+        """
+        Finds the pings whose footprints intersect an area.
+        :param min_latitude: Degrees, positive going north
+        :param min_longitude: Degrees, positive going east
+        :param max_latitude: Degrees, positive going north
+        :param max_longitude: Degrees, positive going east
+        :return: (path, record_number) of each ping found, in file then record order,
+                 where record_number is the ping's record number for indexed reads
+        :raises GsfException: Raised if anything went wrong
+        """
+        bbox = BoundingBox(min_latitude, min_longitude, max_latitude, max_longitude)
+        hits = []
+        for file_number in np.flatnonzero(_intersects(self._bounds, bbox)):
+            path = self._paths[file_number]
+            hits.extend(
+                (path, int(record_number))
+                for record_number in self.file_index(path).query_bbox(bbox)
+            )
+        return hits
+
+    def query_polygon(
+        self, polygon: Sequence[Tuple[float, float]]
+    ) -> List[Tuple[str, int]]:
+        """
+        Finds the pings with a beam, or whose position, lies within a polygon. The
+        pings whose footprints intersect the bounding box of the polygon are found as
+        query_bbox() does, then read to place each of their beams (see
+        beam_positions()) and test it against the polygon. Edges join vertices in a
+        straight line of latitude and longitude, and do not wrap at the antimeridian.
+        :param polygon: (latitude, longitude) vertices in degrees, of which there must
+                        be at least three
+        :return: (path, record_number) of each ping found, in file then record order,
+                 where record_number is the ping's record number for indexed reads
+        :raises ValueError: Raised if the polygon has fewer than three vertices
+        :raises GsfException: Raised if anything else went wrong
+        """
+        vertices = _polygon_vertices(polygon)
+        candidates: Dict[str, List[int]] = {}
+        for path, record_number in self.query_bbox(*_polygon_bbox(vertices)):
+            candidates.setdefault(path, []).append(record_number)
+
+        hits = []
+        for path, record_numbers in candidates.items():
+            with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+                for block in iter_ping_blocks(
+                    gsf_file, FOOTPRINT_BEAM_FIELDS, self._block_size, record_numbers
+                ):
+                    found = _pings_in_polygon(block, vertices)
+                    hits.extend(
+                        (path, int(record_number))
+                        for record_number in block.record_numbers[found]
+                    )
+        return hits
+
+    def read_bbox(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> Iterator[Tuple[str, int, c_gsfRecords]]:
+        """
+        Reads the pings found by query_bbox(), opening each file for direct access
+        once. The records yielded are only valid until the next is read, as libgsf
+        reuses their memory.
+        :param min_latitude: Degrees, positive going north
+        :param min_longitude: Degrees, positive going east
+        :param max_latitude: Degrees, positive going north
+        :param max_longitude: Degrees, positive going east
+        :return: Iterator of (path, record_number, records)
+        :raises GsfException: Raised if anything went wrong
+        """
+        hits: Dict[str, List[int]] = {}
+        for path, record_number in self.query_bbox(
+            min_latitude, min_longitude, max_latitude, max_longitude
+        ):
+            hits.setdefault(path, []).append(record_number)
+
+        for path, record_numbers in hits.items():
+            with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+                for record_number in record_numbers:
+                    _, records = gsf_file.read(
+                        RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING, record_number
+                    )
+                    yield path, record_number, records
+
+
+def _load_survey_index(path: Union[str, Path]) -> Dict[str, _SurveyEntry]:
+    if not Path(path).exists():
+        return {}
+    with np.load(path) as survey:
+        if int(survey["version"]) != _SIDECAR_VERSION:
+            return {}
+        return {
+            str(file_path): _SurveyEntry(
+                int(size),
+                int(mtime_ns),
+                None if np.isnan(bounds).any() else BoundingBox(*map(float, bounds)),
+            )
+            for file_path, size, mtime_ns, bounds in zip(
+                survey["paths"], survey["sizes"], survey["mtimes_ns"], survey["bounds"]
+            )
+        }
+
+
+def _save_survey_index(
+    path: Union[str, Path], paths: List[str], entries: Dict[str, _SurveyEntry]
+):
+    temp_path = Path(f"{path}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as survey:
+        np.savez(
+            survey,
+            version=_SIDECAR_VERSION,
+            paths=np.array(paths, dtype=str),
+            sizes=np.array([entries[path].size for path in paths], dtype=np.int64),
+            mtimes_ns=np.array(
+                [entries[path].mtime_ns for path in paths], dtype=np.int64
+            ),
+            bounds=_bounds_array(paths, entries),
+        )
+    os.replace(temp_path, path)
+
+
+def _bounds_array(paths: List[str], entries: Dict[str, _SurveyEntry]) -> np.ndarray:
+    """
+    Bounds of each file as rows of an array, NaN for files without pings
+    """
+    bounds = np.full((len(paths), 4), np.nan)
+    for row, path in zip(bounds, paths):
+        if entries[path].bounds is not None:
+            row[:] = entries[path].bounds
+    return bounds
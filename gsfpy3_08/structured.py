@@ -0,0 +1,116 @@
+"""NumPy structured dtypes equivalent to the fixed size record structures"""
+from ctypes import Array, Structure, Union, _Pointer, c_char, c_char_p, c_void_p, sizeof
+from functools import lru_cache
+from typing import Iterable, Type, TypeVar
+
+import numpy as np
+
+from gsfpy3_08 import gsfSBSensorSpecific
+from gsfpy3_08.gsfDataID import c_gsfDataID
+from gsfpy3_08.gsfMBOffsets import c_gsfMBOffsets
+from gsfpy3_08.gsfMBParams import c_gsfMBParams
+from gsfpy3_08.gsfScaleFactors import c_gsfScaleFactors
+from gsfpy3_08.gsfSensorSpecific import c_gsfSensorSpecific
+from gsfpy3_08.gsfSingleBeamPing import c_gsfSingleBeamPing
+from gsfpy3_08.gsfSwathBathySummary import c_gsfSwathBathySummary
+
+_Structure = TypeVar("_Structure", Structure, Union)
+
+
+@lru_cache(maxsize=None)
+def structured_dtype(ctype: type) -> np.dtype:
+    """
+    Builds the NumPy dtype with the same layout as a ctypes type, so that the memory
+    of a ctypes object may be viewed as a NumPy array without copying it. Fields of
+    structures and unions are held at their ctypes offsets, nested structures become
+    nested structured dtypes, character arrays become byte strings and other arrays
+    become subarrays.
+    :param ctype: Structure, union, array or simple ctypes type of a fixed size
+    :return: Structured dtype of the same size as the ctypes type
+    :raises TypeError: Raised if the type holds pointers or bit fields, whose memory
+                       is not held within the structure
+    """
+    if issubclass(ctype, (Structure, Union)):
+        names = []
+        formats = []
+        offsets = []
+        for name, field_type, *bits in ctype._fields_:
+            if bits:
+                raise TypeError(f"{ctype.__name__}.{name} is a bit field")
+            try:
+                formats.append(structured_dtype(field_type))
+            except TypeError as e:
+                raise TypeError(f"{ctype.__name__}.{name}: {e}") from e
+            names.append(name)
+            offsets.append(getattr(ctype, name).offset)
+        return np.dtype(
+            {
+                "names": names,
+                "formats": formats,
+                "offsets": offsets,
+                "itemsize": sizeof(ctype),
+            }
+        )
+    if issubclass(ctype, Array):
+        if ctype._type_ is c_char:
+            return np.dtype(f"S{ctype._length_}")
+        return np.dtype((structured_dtype(ctype._type_), (ctype._length_,)))
+    if issubclass(ctype, (_Pointer, c_char_p, c_void_p)):
+        raise TypeError(f"{ctype.__name__} is a pointer, which has no dtype equivalent")
+    return np.dtype(ctype)
+
+
+def as_structured(ctypes_object) -> np.ndarray:
+    """
+    Views the memory of a ctypes structure, union or array of either as a NumPy
+    structured array, without copying it. Writes to the array are writes to the
+    object, and the array must not outlive the object.
+    :param ctypes_object: Structure or union, which is viewed as an array of one
+                          element, or array of structures or unions
+    :return: Structured array
+    :raises TypeError: Raised if the type holds pointers or bit fields
+    """
+    ctype = type(ctypes_object)
+    if issubclass(ctype, Array):
+        ctype = ctype._type_
+    return np.frombuffer(ctypes_object, dtype=structured_dtype(ctype))
+
+
+def stack_structures(
+    structures: Iterable[_Structure], structure_type: Type[_Structure]
+) -> np.ndarray:
+    """
+    Copies many ctypes structures into one structured array, e.g. to hold a table of
+    records compactly rather than as a list of ctypes objects
+    :param structures: Structures to copy, each of type structure_type
+    :param structure_type: ctypes type of the structures
+    :return: Structured array of one element per structure
+    :raises TypeError: Raised if the type holds pointers or bit fields
+    """
+    dtype = structured_dtype(structure_type)
+    buffer = bytearray()
+    for structure in structures:
+        buffer += memoryview(structure).cast("B")
+    return np.frombuffer(buffer, dtype=dtype)
+
+
+def to_structure(element: np.void, structure_type: Type[_Structure]) -> _Structure:
+    """
+    :param element: Element of a structured array with the dtype of structure_type
+    :param structure_type: ctypes type of the structure
+    :return: Copy of the element as a ctypes structure, e.g. to write it to a file
+    :raises ValueError: Raised if the element has a different dtype
+    """
+    if element.dtype != structured_dtype(structure_type):
+        raise ValueError(f"Element is not a {structure_type.__name__}")
+    return structure_type.from_buffer_copy(element.tobytes())
+
+
+DATA_ID_DTYPE = structured_dtype(c_gsfDataID)
+SWATH_BATHY_SUMMARY_DTYPE = structured_dtype(c_gsfSwathBathySummary)
+SINGLE_BEAM_PING_DTYPE = structured_dtype(c_gsfSingleBeamPing)
+SCALE_FACTORS_DTYPE = structured_dtype(c_gsfScaleFactors)
+MB_OFFSETS_DTYPE = structured_dtype(c_gsfMBOffsets)
+MB_PARAMS_DTYPE = structured_dtype(c_gsfMBParams)
+SENSOR_SPECIFIC_DTYPE = structured_dtype(c_gsfSensorSpecific)
+SB_SENSOR_SPECIFIC_DTYPE = structured_dtype(gsfSBSensorSpecific.c_gsfSensorSpecific)
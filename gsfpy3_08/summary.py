@@ -0,0 +1,265 @@
+"""Vectorised building of swath bathymetry summary records"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from math import floor, inf, isinf
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+
+from gsfpy3_08 import GsfFile, _read_next, _write_record, open_gsf
+from gsfpy3_08.columnar import (
+    DEFAULT_BLOCK_SIZE,
+    PingBlock,
+    accepted_beams,
+    iter_ping_blocks,
+)
+from gsfpy3_08.enums import FileMode, PingFlag, ReadStatus, RecordType
+from gsfpy3_08.gsfDataID import c_gsfDataID
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.gsfSwathBathySummary import c_gsfSwathBathySummary
+from gsfpy3_08.timespec import c_timespec, timespec_to_seconds
+
+SUMMARY_BEAM_FIELDS = ("depth", "beam_flags")
+
+
+class SwathSummary(NamedTuple):
+    """
+    Extents of a set of swath bathymetry pings, as held by a summary record. Times
+    are in seconds since the beginning of the epoch. Summaries merge associatively,
+    so may be built up a block of pings at a time and from partial summaries built
+    in parallel. The empty summary, which covers no pings, has infinite extents.
+    """
+
+    start_time: float = inf
+    end_time: float = -inf
+    min_latitude: float = inf
+    min_longitude: float = inf
+    max_latitude: float = -inf
+    max_longitude: float = -inf
+    min_depth: float = inf
+    max_depth: float = -inf
+
+    @property
+    def is_empty(self) -> bool:
+        return isinf(self.start_time)
+
+    def merge(self, other: "SwathSummary") -> "SwathSummary":
+        """
+        :param other: Summary to merge with this one
+        :return: Summary covering the pings of both summaries
+        """
+        return SwathSummary(
+            start_time=min(self.start_time, other.start_time),
+            end_time=max(self.end_time, other.end_time),
+            min_latitude=min(self.min_latitude, other.min_latitude),
+            min_longitude=min(self.min_longitude, other.min_longitude),
+            max_latitude=max(self.max_latitude, other.max_latitude),
+            max_longitude=max(self.max_longitude, other.max_longitude),
+            min_depth=min(self.min_depth, other.min_depth),
+            max_depth=max(self.max_depth, other.max_depth),
+        )
+
+    @staticmethod
+    def from_ping_block(block: PingBlock) -> "SwathSummary":
+        """
+        Summarises the pings of a block. Pings flagged to be ignored are left out, as
+        are beams with a non-zero beam flag from the depth extents.
+        :param block: Pings read with at least the SUMMARY_BEAM_FIELDS beam arrays
+        :return: SwathSummary
+        """
+        pings = (block["ping_flags"] & PingFlag.GSF_IGNORE_PING) == 0
+        if not pings.any():
+            return SwathSummary()
+
+        depth = block["depth"][accepted_beams(block)]
+        ping_time = block.ping_time[pings]
+        latitude = block["latitude"][pings]
+        longitude = block["longitude"][pings]
+
+        return SwathSummary(
+            start_time=float(ping_time.min()),
+            end_time=float(ping_time.max()),
+            min_latitude=float(latitude.min()),
+            min_longitude=float(longitude.min()),
+            max_latitude=float(latitude.max()),
+            max_longitude=float(longitude.max()),
+            min_depth=float(depth.min()) if depth.size else inf,
+            max_depth=float(depth.max()) if depth.size else -inf,
+        )
+
+    @staticmethod
+    def from_summary(summary: c_gsfSwathBathySummary) -> "SwathSummary":
+        """
+        :param summary: c_gsfSwathBathySummary
+        :return: SwathSummary
+        """
+        return SwathSummary(
+            start_time=timespec_to_seconds(summary.start_time),
+            end_time=timespec_to_seconds(summary.end_time),
+            min_latitude=summary.min_latitude,
+            min_longitude=summary.min_longitude,
+            max_latitude=summary.max_latitude,
+            max_longitude=summary.max_longitude,
+            min_depth=summary.min_depth,
+            max_depth=summary.max_depth,
+        )
+
+    def to_summary(self, summary: c_gsfSwathBathySummary):
+        """
+        Copies this summary into a c_gsfSwathBathySummary. Depth extents that are
+        still infinite, as no valid beams were summarised, are written as zero.
+        :param summary: c_gsfSwathBathySummary to update
+        :raises ValueError: Raised if the summary is empty
+        """
+        if self.is_empty:
+            raise ValueError("Cannot write an empty summary")
+
+        summary.start_time = _seconds_to_timespec(self.start_time)
+        summary.end_time = _seconds_to_timespec(self.end_time)
+        summary.min_latitude = self.min_latitude
+        summary.min_longitude = self.min_longitude
+        summary.max_latitude = self.max_latitude
+        summary.max_longitude = self.max_longitude
+        summary.min_depth = 0.0 if isinf(self.min_depth) else self.min_depth
+        summary.max_depth = 0.0 if isinf(self.max_depth) else self.max_depth
+
+
+def _seconds_to_timespec(seconds: float) -> c_timespec:
+    tv_sec = floor(seconds)
+    return c_timespec(tv_sec=tv_sec, tv_nsec=round((seconds - tv_sec) * 1e9))
+
+
+def summarise(gsf_file: GsfFile, block_size: int = DEFAULT_BLOCK_SIZE) -> SwathSummary:
+    """
+    :param gsf_file: File to summarise
+    :param block_size: Maximum number of pings per block
+    :return: Summary of every ping in the file
+    :raises GsfException: Raised if anything went wrong
+    """
+    return reduce(
+        SwathSummary.merge,
+        (
+            SwathSummary.from_ping_block(block)
+            for block in iter_ping_blocks(gsf_file, SUMMARY_BEAM_FIELDS, block_size)
+        ),
+        SwathSummary(),
+    )
+
+
+def summarise_files(
+    paths: Iterable[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, SwathSummary]:
+    """
+    Summarises many files in a pool of processes, one file per task. The summaries
+    may be merged into one for the whole survey.
+    :param paths: Locations of the GSF files to summarise
+    :param max_workers: Maximum number of processes, by default the number of CPUs
+    :param block_size: Maximum number of pings per block
+    :return: Summary of each file, keyed by path
+    :raises GsfException: Raised if anything went wrong
+    """
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {
+            str(path): executor.submit(_summarise_path, path, block_size)
+            for path in paths
+        }
+        return {path: future.result() for path, future in futures.items()}
+
+
+def _summarise_path(path: Union[str, Path], block_size: int) -> SwathSummary:
+    with open_gsf(path) as gsf_file:
+        return summarise(gsf_file, block_size)
+
+
+def read_summary(gsf_file: GsfFile) -> Optional[SwathSummary]:
+    """
+    May only be used when the file is open for direct access (GSF_READONLY_INDEX or
+    GSF_UPDATE_INDEX).
+    :param gsf_file: File to read from
+    :return: Contents of the first summary record in the file, if it has one
+    :raises GsfException: Raised if anything went wrong
+    """
+    if gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY) == 0:
+        return None
+    _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY, 1)
+    return SwathSummary.from_summary(records.summary)
+
+
+def read_leading_summary(path: Union[str, Path]) -> Optional[SwathSummary]:
+    """
+    Reads the summary record that by convention follows the header. The file is read
+    sequentially, so no index is built, and reading stops at the first ping.
+    :param path: Location of the GSF file
+    :return: Contents of the summary record, if one precedes the first ping
+    :raises GsfException: Raised if anything went wrong
+    """
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    with open_gsf(path) as gsf_file:
+        while True:
+            result = gsf_file.try_read(data_id=data_id, records=records)
+            if result.status == ReadStatus.END_OF_FILE:
+                return None
+            if result.status == ReadStatus.ERROR:
+                raise result.exception()
+            if data_id.recordID == RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY:
+                return SwathSummary.from_summary(records.summary)
+            if data_id.recordID == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING:
+                return None
+
+
+def update_summary(
+    path: Union[str, Path],
+    summary: Optional[SwathSummary] = None,
+    target_path: Optional[Union[str, Path]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> SwathSummary:
+    """
+    Writes a summary record to a GSF file. Summary records have a fixed size, so an
+    existing record is overwritten in place. A file without one can only gain one in
+    a copy, written to the target path with the summary record ahead of every other
+    record, and any existing summary records, after the header.
+    :param path: Location of the GSF file
+    :param summary: Summary to write, by default built from the pings in the file
+    :param target_path: Location of the copy to create, if any
+    :param block_size: Maximum number of pings per block
+    :return: The summary written
+    :raises GsfException: Raised if anything went wrong
+    """
+    if summary is None:
+        with open_gsf(path) as gsf_file:
+            summary = summarise(gsf_file, block_size)
+
+    records = c_gsfRecords()
+    summary.to_summary(records.summary)
+
+    if target_path is not None:
+        _copy_with_summary(path, target_path, records)
+        return summary
+
+    with open_gsf(path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        if read_summary(gsf_file) is None:
+            raise ValueError(
+                "File has no summary record, which cannot be added in place"
+            )
+        gsf_file.write(records, RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY, 1)
+
+    return summary
+
+
+def _copy_with_summary(
+    source_path: Union[str, Path],
+    target_path: Union[str, Path],
+    summary_records: c_gsfRecords,
+):
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+
+    with open_gsf(source_path) as source_file, open_gsf(
+        target_path, FileMode.GSF_CREATE
+    ) as target_file:
+        target_file.write(summary_records, RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY)
+        while _read_next(source_file, RecordType.GSF_NEXT_RECORD, data_id, records):
+            if data_id.recordID != RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY:
+                _write_record(target_file, data_id, records)
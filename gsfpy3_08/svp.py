@@ -0,0 +1,264 @@
+"""Sound velocity profile catalogue"""
+from math import cos, radians
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _iter_records, open_gsf
+from gsfpy3_08.enums import FileMode, RecordType
+from gsfpy3_08.gsfSVP import c_gsfSVP
+from gsfpy3_08.timespec import timespec_to_seconds
+
+# Sound speed (meters/second) that nominal depths are calculated with, also used
+# to express sound speed uncertainties as fractions
+NOMINAL_SOUND_SPEED = 1500.0
+
+
+class SvpLayers(NamedTuple):
+    """
+    Constant-gradient layer table derived from a sound velocity profile. Layer i
+    spans depth[i] to depth[i + 1], within which the sound speed varies linearly
+    from sound_speed[i] to sound_speed[i + 1] at the rate given by gradient[i]. The
+    first boundary is always at the surface (depth 0).
+    """
+
+    # Layer boundary depths (meters), strictly increasing
+    depth: np.ndarray
+    # Sound speed at each layer boundary (meters/second)
+    sound_speed: np.ndarray
+    # Rate of change of sound speed with depth within each layer (1/second)
+    gradient: np.ndarray
+
+    @property
+    def number_layers(self) -> int:
+        return len(self.gradient)
+
+
+class SoundVelocityProfile(NamedTuple):
+    """
+    Immutable copy of the contents of a c_gsfSVP record. Times are expressed in
+    seconds since the beginning of the epoch.
+    """
+
+    observation_time: float
+    application_time: float
+    latitude: float
+    longitude: float
+    depth: np.ndarray
+    sound_speed: np.ndarray
+
+    @staticmethod
+    def from_svp(svp: c_gsfSVP) -> "SoundVelocityProfile":
+        """
+        Copies the profile out of the given record, so that the result remains valid
+        once libgsf reuses the record memory for a subsequent read.
+        :param svp: c_gsfSVP
+        :return: SoundVelocityProfile
+        """
+        shape = (svp.number_points,)
+        if svp.number_points > 0:
+            depth = np.ctypeslib.as_array(svp.depth, shape).copy()
+            sound_speed = np.ctypeslib.as_array(svp.sound_speed, shape).copy()
+        else:
+            depth = np.empty(0)
+            sound_speed = np.empty(0)
+
+        return SoundVelocityProfile(
+            observation_time=timespec_to_seconds(svp.observation_time),
+            application_time=timespec_to_seconds(svp.application_time),
+            latitude=svp.latitude,
+            longitude=svp.longitude,
+            depth=depth,
+            sound_speed=sound_speed,
+        )
+
+    def to_layers(self) -> SvpLayers:
+        """
+        Derives the constant-gradient layer table for this profile. Points are sorted
+        by depth, invalid and duplicate depths are dropped and, where the profile does
+        not start at the surface, the shallowest sound speed is extended up to it.
+        :return: SvpLayers
+        :raises ValueError: Raised if the profile holds no valid points
+        """
+        valid = (
+            np.isfinite(self.depth)
+            & np.isfinite(self.sound_speed)
+            & (self.depth >= 0)
+            & (self.sound_speed > 0)
+        )
+        depth = self.depth[valid]
+        sound_speed = self.sound_speed[valid]
+        if depth.size == 0:
+            raise ValueError("Sound velocity profile contains no valid points")
+
+        depth, first = np.unique(depth, return_index=True)
+        sound_speed = sound_speed[first]
+
+        if depth[0] > 0:
+            depth = np.concatenate(([0.0], depth))
+            sound_speed = np.concatenate((sound_speed[:1], sound_speed))
+
+        gradient = np.diff(sound_speed) / np.diff(depth)
+
+        return SvpLayers(depth=depth, sound_speed=sound_speed, gradient=gradient)
+
+
+class SvpCatalogue:
+    """
+    Time-ordered collection of the sound velocity profiles in a GSF file, supporting
+    O(log n) lookup of the profile in effect at a given time. Layer tables are
+    derived on first use and cached per profile.
+    """
+
+    def __init__(self, profiles: Iterable[SoundVelocityProfile]):
+        self._profiles: List[SoundVelocityProfile] = sorted(
+            profiles, key=lambda profile: profile.application_time
+        )
+        self._application_times = np.array(
+            [profile.application_time for profile in self._profiles], dtype=np.float64
+        )
+        self._layers: Dict[int, SvpLayers] = {}
+
+    @classmethod
+    def from_gsf_file(cls, gsf_file: GsfFile) -> "SvpCatalogue":
+        """
+        Reads every sound velocity profile record from the given file. Files open in
+        GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode are read by record number,
+        otherwise the file is rewound before and after reading.
+        :param gsf_file: File to read the profiles from
+        :return: SvpCatalogue
+        :raises GsfException: Raised if anything went wrong
+        """
+        profiles = [
+            SoundVelocityProfile.from_svp(records.svp)
+            for records in _iter_records(
+                gsf_file, RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE
+            )
+        ]
+
+        return cls(profiles)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __getitem__(self, index: int) -> SoundVelocityProfile:
+        return self._profiles[index]
+
+    def __iter__(self) -> Iterator[SoundVelocityProfile]:
+        return iter(self._profiles)
+
+    @property
+    def application_times(self) -> np.ndarray:
+        """
+        Application times of the profiles in the catalogue, in ascending order
+        """
+        return self._application_times
+
+    def indices_at(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Vectorised form of index_at().
+        :param times: Seconds since the beginning of the epoch
+        :return: Array of catalogue indices, one per time
+        :raises LookupError: Raised if the catalogue is empty
+        """
+        self._check_not_empty()
+        indices = np.searchsorted(self._application_times, times, side="right") - 1
+        return np.maximum(indices, 0)
+
+    def index_at(self, time: float) -> int:
+        """
+        The profile in effect at a given time is the most recently applied one. Times
+        before the first application time resolve to the earliest profile.
+        :param time: Seconds since the beginning of the epoch
+        :return: Index of the profile in effect at the given time
+        :raises LookupError: Raised if the catalogue is empty
+        """
+        return int(self.indices_at(time))
+
+    def profile_at(self, time: float) -> SoundVelocityProfile:
+        """
+        :param time: Seconds since the beginning of the epoch
+        :return: The profile in effect at the given time (see index_at())
+        :raises LookupError: Raised if the catalogue is empty
+        """
+        return self._profiles[self.index_at(time)]
+
+    def nearest_index(
+        self,
+        latitude: float,
+        longitude: float,
+        time: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ) -> int:
+        """
+        Finds the profile observed closest to a given position. When a time is given
+        only profiles applied at or before that time (and, if max_age is given, no
+        more than max_age seconds before it) are considered, falling back to
+        index_at() when no profile qualifies.
+        :param latitude: Degrees, positive going north
+        :param longitude: Degrees, positive going east
+        :param time: Seconds since the beginning of the epoch
+        :param max_age: Seconds
+        :return: Index of the nearest profile
+        :raises LookupError: Raised if the catalogue is empty
+        """
+        self._check_not_empty()
+
+        end = len(self._profiles)
+        start = 0
+        if time is not None:
+            end = int(np.searchsorted(self._application_times, time, side="right"))
+            if max_age is not None:
+                start = int(
+                    np.searchsorted(
+                        self._application_times, time - max_age, side="left"
+                    )
+                )
+            if start >= end:
+                return self.index_at(time)
+
+        candidates = self._profiles[start:end]
+        latitudes = np.array([profile.latitude for profile in candidates])
+        longitudes = np.array([profile.longitude for profile in candidates])
+
+        # Equirectangular approximation, which is sufficient for ranking distances
+        d_lon = (longitudes - longitude + 180.0) % 360.0 - 180.0
+        distances = np.hypot(latitudes - latitude, d_lon * cos(radians(latitude)))
+
+        return start + int(np.argmin(distances))
+
+    def layers(self, index: int) -> SvpLayers:
+        """
+        :param index: Catalogue index of the profile
+        :return: Layer table of the profile, derived on first request then cached
+        :raises ValueError: Raised if the profile holds no valid points
+        """
+        if index < 0:
+            index += len(self._profiles)
+        if index not in self._layers:
+            self._layers[index] = self._profiles[index].to_layers()
+        return self._layers[index]
+
+    def layers_at(self, time: float) -> SvpLayers:
+        """
+        :param time: Seconds since the beginning of the epoch
+        :return: Layer table of the profile in effect at the given time
+        :raises LookupError: Raised if the catalogue is empty
+        """
+        return self.layers(self.index_at(time))
+
+    def _check_not_empty(self):
+        if not self._profiles:
+            raise LookupError("Catalogue contains no sound velocity profiles")
+
+
+def load_svp_catalogue(path: Union[str, Path]) -> SvpCatalogue:
+    """
+    Factory function to create an SvpCatalogue from the profiles in a GSF file
+    :param path: Location of GSF file to read
+    :return: SvpCatalogue
+    :raises GsfException: Raised if anything went wrong
+    """
+    with open_gsf(path, FileMode.GSF_READONLY) as gsf_file:
+        return SvpCatalogue.from_gsf_file(gsf_file)
@@ -8,3 +8,11 @@ class c_timespec(Structure):
         ("tv_sec", c_int),
         ("tv_nsec", c_long),
     ]
+
+
+def timespec_to_seconds(ts: c_timespec) -> float:
+    """
+    :param ts: c_timespec
+    :return: Seconds since the beginning of the epoch, including the fractional part
+    """
+    return ts.tv_sec + ts.tv_nsec * 1e-9
@@ -0,0 +1,330 @@
+"""Total propagated uncertainty (TPU) of swath bathymetry soundings"""
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import byref, c_int
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from gsfpy3_08 import GsfFile, _call, _iter_records, open_gsf
+from gsfpy3_08.bindings import gsfFileSupportsRecalculateTPU
+from gsfpy3_08.columnar import (
+    BEAM_ARRAY_SUBRECORDS,
+    DEFAULT_BLOCK_SIZE,
+    PingBlock,
+    iter_ping_blocks,
+    update_beam_columns,
+)
+from gsfpy3_08.enums import RecordType
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.params import MBParams
+from gsfpy3_08.svp import NOMINAL_SOUND_SPEED
+
+# GSF records vertical_error and horizontal_error at the 95% confidence level
+CONFIDENCE_95 = 1.96
+
+# Sonar-reported uncertainty arrays, where supported by this version of GSF
+_SONAR_FIELDS = tuple(
+    field
+    for field in ("sonar_vert_uncert", "sonar_horz_uncert")
+    if field in BEAM_ARRAY_SUBRECORDS
+)
+TPU_BEAM_FIELDS = ("depth", "across_track", "along_track") + _SONAR_FIELDS
+
+
+class TpuModel(NamedTuple):
+    """
+    One standard deviation uncertainties of the survey system. Angles are in degrees,
+    distances in meters and sound speeds in meters/second.
+    """
+
+    position: float = 1.0
+    heading: float = 0.05
+    roll: float = 0.02
+    pitch: float = 0.02
+    heave: float = 0.05
+    # Heave uncertainty as a fraction of the heave, used where larger than heave
+    heave_fraction: float = 0.05
+    draft: float = 0.02
+    surface_sound_speed: float = 0.5
+    sound_speed: float = 1.0
+
+
+class Tpu(NamedTuple):
+    """
+    Uncertainties at the 95% confidence level (meters), in the layout of the
+    c_gsfSwathBathyPing beam arrays. Beams without a depth are NaN.
+    """
+
+    vertical_error: np.ndarray
+    horizontal_error: np.ndarray
+
+
+class InstallationOffsets(NamedTuple):
+    """
+    Sensor offsets from a processing parameters record, relative to the vessel
+    reference point with x positive forward, y positive to starboard and z positive
+    down (meters). Offsets are those already applied to the data where known,
+    otherwise those to be applied. Only the first transducer is considered.
+    """
+
+    # Seconds since the beginning of the epoch from which the offsets apply
+    time: float
+    draft: float
+    transducer: np.ndarray
+    antenna: np.ndarray
+    mru: np.ndarray
+
+    @staticmethod
+    def from_records(records: c_gsfRecords) -> "InstallationOffsets":
+        """
+        :param records: Records holding a processing parameters record
+        :return: InstallationOffsets
+        :raises GsfException: Raised if anything went wrong
+        """
+        return InstallationOffsets.from_mb_params(MBParams.from_records(records))
+
+    @staticmethod
+    def from_mb_params(params: MBParams) -> "InstallationOffsets":
+        """
+        :param params: Parsed processing parameters, e.g. GsfFile.mb_params
+        :return: InstallationOffsets
+        """
+        applied = params.applied.known()
+        to_apply = params.to_apply.known()
+
+        def offset(name: str) -> np.ndarray:
+            # Offsets applied to the data where recorded, otherwise those to apply
+            applied_offset = np.nan_to_num(applied[name])
+            return np.where(
+                applied_offset != 0, applied_offset, np.nan_to_num(to_apply[name])
+            )
+
+        def position(prefix: str) -> np.ndarray:
+            return np.stack([offset(f"{prefix}_{axis}_offset") for axis in "xyz"], -1)
+
+        return InstallationOffsets(
+            time=params.time,
+            draft=float(offset("draft")[0]),
+            transducer=position("transducer")[0],
+            antenna=position("antenna"),
+            mru=position("mru"),
+        )
+
+
+_NO_OFFSETS = InstallationOffsets(
+    time=0.0,
+    draft=0.0,
+    transducer=np.zeros(3),
+    antenna=np.zeros(3),
+    mru=np.zeros(3),
+)
+
+
+def read_installation_offsets(gsf_file: GsfFile) -> List[InstallationOffsets]:
+    """
+    :param gsf_file: File to read from, rewound before and after reading unless open
+                     in GSF_READONLY_INDEX or GSF_UPDATE_INDEX mode
+    :return: Offsets from every processing parameters record in the file, in time
+             order
+    :raises GsfException: Raised if anything went wrong
+    """
+    offsets = [
+        InstallationOffsets.from_records(records)
+        for records in _iter_records(
+            gsf_file, RecordType.GSF_RECORD_PROCESSING_PARAMETERS
+        )
+    ]
+    return sorted(offsets, key=lambda installation: installation.time)
+
+
+def compute_tpu(
+    block: PingBlock,
+    offsets: Iterable[InstallationOffsets] = (),
+    model: TpuModel = TpuModel(),
+) -> Tpu:
+    """
+    Estimates the vertical and horizontal uncertainty of every beam of a block of
+    pings. Each ping uses the offsets most recently in effect at its ping time (or the
+    earliest, for pings before them all). The model sums the variances of the
+    sonar-reported uncertainties, where present, with those due to the uncertainty
+    of position, heading, attitude, heave, draft and sound speed, including the
+    attitude-induced motion of the transducer about the motion sensor.
+    :param block: Pings read with at least the TPU_BEAM_FIELDS beam arrays
+    :param offsets: Installation offsets in time order, none by default
+    :param model: Uncertainties of the survey system
+    :return: Tpu arrays in the (ping, beam) layout of the block
+    """
+    offsets = list(offsets) or [_NO_OFFSETS]
+    times = np.array([installation.time for installation in offsets])
+    indices = np.maximum(np.searchsorted(times, block.ping_time, side="right") - 1, 0)
+
+    def per_ping(values: np.ndarray) -> np.ndarray:
+        return values[indices][:, np.newaxis]
+
+    draft = per_ping(np.array([installation.draft for installation in offsets]))
+    transducer = np.array([installation.transducer for installation in offsets])
+    mru_lever = transducer - np.array([installation.mru for installation in offsets])
+    antenna_lever = transducer - np.array(
+        [installation.antenna for installation in offsets]
+    )
+
+    across_track = block["across_track"]
+    along_track = np.nan_to_num(block["along_track"])
+    water_depth = np.maximum(block["depth"] - draft, 0.0)
+    tan_angle = np.divide(
+        np.abs(across_track),
+        water_depth,
+        out=np.zeros_like(water_depth),
+        where=water_depth > 0,
+    )
+
+    roll = np.radians(block["roll"])[:, np.newaxis]
+    pitch = np.radians(block["pitch"])[:, np.newaxis]
+    roll_sd = np.radians(model.roll)
+    pitch_sd = np.radians(model.pitch)
+    heading_sd = np.radians(model.heading)
+    heave_sd = np.maximum(model.heave, model.heave_fraction * np.abs(block["heave"]))
+    surface_sound_speed_sd = model.surface_sound_speed / NOMINAL_SOUND_SPEED
+    sound_speed_sd = model.sound_speed / NOMINAL_SOUND_SPEED
+
+    vertical_variance = (
+        _sonar_variance(block, "sonar_vert_uncert")
+        + model.draft ** 2
+        + heave_sd[:, np.newaxis] ** 2
+        + (across_track * roll_sd) ** 2
+        + (along_track * pitch_sd) ** 2
+        + (per_ping(mru_lever[:, 1]) * np.cos(roll) * roll_sd) ** 2
+        + (per_ping(mru_lever[:, 0]) * np.cos(pitch) * pitch_sd) ** 2
+        + (water_depth * sound_speed_sd) ** 2
+        + (across_track * tan_angle * surface_sound_speed_sd) ** 2
+    )
+
+    radius = np.hypot(
+        across_track + per_ping(antenna_lever[:, 1]),
+        along_track + per_ping(antenna_lever[:, 0]),
+    )
+    horizontal_variance = (
+        _sonar_variance(block, "sonar_horz_uncert")
+        + model.position ** 2
+        + (water_depth * roll_sd) ** 2
+        + (water_depth * pitch_sd) ** 2
+        + (radius * heading_sd) ** 2
+        + (across_track * sound_speed_sd) ** 2
+        + (across_track * surface_sound_speed_sd) ** 2
+    )
+
+    return Tpu(
+        vertical_error=CONFIDENCE_95 * np.sqrt(vertical_variance),
+        horizontal_error=CONFIDENCE_95 * np.sqrt(horizontal_variance),
+    )
+
+
+def _sonar_variance(block: PingBlock, field: str) -> Union[float, np.ndarray]:
+    if field not in block:
+        return 0.0
+    return np.nan_to_num(block[field]) ** 2
+
+
+def supports_recalculate_tpu(gsf_file: GsfFile) -> bool:
+    """
+    :param gsf_file: File to check
+    :return: True if libgsf reports that the file holds sufficient information for
+             the uncertainty of its soundings to be recalculated
+    :raises GsfException: Raised if anything went wrong
+    """
+    status = c_int(0)
+    _call(gsfFileSupportsRecalculateTPU, gsf_file.handle, byref(status))
+    return bool(status.value)
+
+
+def iter_tpu(
+    gsf_file: GsfFile,
+    model: TpuModel = TpuModel(),
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[Tuple[PingBlock, Tpu]]:
+    """
+    Computes the uncertainty of every ping in the file, a block of pings at a time,
+    using the installation offsets recorded in the file.
+    :param gsf_file: File to read from
+    :param model: Uncertainties of the survey system
+    :param block_size: Maximum number of pings per block
+    :return: Iterator of blocks of pings, with their Tpu arrays
+    :raises GsfException: Raised if anything went wrong
+    """
+    offsets = read_installation_offsets(gsf_file)
+    for block in iter_ping_blocks(gsf_file, TPU_BEAM_FIELDS, block_size):
+        yield block, compute_tpu(block, offsets, model)
+
+
+def update_tpu(
+    path: Union[str, Path],
+    model: TpuModel = TpuModel(),
+    target_path: Optional[Union[str, Path]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Fills the vertical_error and horizontal_error arrays of every ping in a GSF file.
+    The file is updated in place unless a target path is given, in which case an
+    updated copy is written there instead. In place updates require every ping to
+    hold both arrays already, as records cannot grow when updated in place.
+    :param path: Location of the GSF file to update
+    :param model: Uncertainties of the survey system
+    :param target_path: Location of the updated copy to create, if any
+    :param block_size: Maximum number of pings per block
+    :return: Number of pings updated
+    :raises GsfException: Raised if anything went wrong
+    """
+    with open_gsf(path) as gsf_file:
+        offsets = read_installation_offsets(gsf_file)
+
+    def compute(block: PingBlock) -> Dict[str, np.ndarray]:
+        return compute_tpu(block, offsets, model)._asdict()
+
+    return update_beam_columns(path, compute, TPU_BEAM_FIELDS, target_path, block_size)
+
+
+def update_tpu_files(
+    paths: Iterable[Union[str, Path]],
+    model: TpuModel = TpuModel(),
+    target_dir: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Dict[str, Optional[int]]:
+    """
+    Runs update_tpu() over many files in a pool of processes, one file per task.
+    Files for which libgsf does not report TPU recalculation support are skipped.
+    :param paths: Locations of the GSF files to update
+    :param model: Uncertainties of the survey system
+    :param target_dir: Directory to write updated copies to, under the same file
+                       names, rather than updating the files in place
+    :param max_workers: Maximum number of processes, by default the number of CPUs
+    :param block_size: Maximum number of pings per block
+    :return: Number of pings updated in each file, keyed by path, or None for files
+             that were skipped
+    :raises GsfException: Raised if anything went wrong
+    """
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {
+            str(path): executor.submit(
+                _update_tpu_if_supported,
+                path,
+                model,
+                None if target_dir is None else Path(target_dir) / Path(path).name,
+                block_size,
+            )
+            for path in paths
+        }
+        return {path: future.result() for path, future in futures.items()}
+
+
+def _update_tpu_if_supported(
+    path: Union[str, Path],
+    model: TpuModel,
+    target_path: Optional[Path],
+    block_size: int,
+) -> Optional[int]:
+    with open_gsf(path) as gsf_file:
+        if not supports_recalculate_tpu(gsf_file):
+            return None
+    return update_tpu(path, model, target_path, block_size)
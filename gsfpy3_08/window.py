@@ -0,0 +1,112 @@
+"""Extraction of swath bathymetry pings within a time window across many files"""
+from ctypes import byref, c_int64, c_long
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from gsfpy3_08 import GsfFile, _call, open_gsf
+from gsfpy3_08.bindings import gsfIndexTime
+from gsfpy3_08.columnar import (
+    DEFAULT_BLOCK_SIZE,
+    PingBlock,
+    count_pings,
+    iter_ping_blocks,
+)
+from gsfpy3_08.enums import FileMode, RecordType
+from gsfpy3_08.summary import read_leading_summary
+
+
+class WindowBlock(NamedTuple):
+    """Block of pings within a time window, with the file they were read from"""
+
+    path: Path
+    block: PingBlock
+
+
+def index_time(gsf_file: GsfFile, record_number: int) -> float:
+    """
+    Looks up the time of a ping in the file's index, without reading the ping. May
+    only be used when the file is open for direct access (GSF_READONLY_INDEX or
+    GSF_UPDATE_INDEX).
+    :param gsf_file: File to look up the ping in
+    :param record_number: Record number of the ping, from 1
+    :return: Seconds since the beginning of the epoch
+    :raises GsfException: Raised if anything went wrong
+    """
+    seconds = c_int64()
+    nanoseconds = c_long()
+    _call(
+        gsfIndexTime,
+        gsf_file.handle,
+        RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING,
+        record_number,
+        byref(seconds),
+        byref(nanoseconds),
+    )
+    return seconds.value + nanoseconds.value * 1e-9
+
+
+def bisect_time(gsf_file: GsfFile, time: float) -> int:
+    """
+    Binary searches the index times of the pings of a file, which are assumed to be
+    in time order. May only be used when the file is open for direct access.
+    :param gsf_file: File to search
+    :param time: Seconds since the beginning of the epoch
+    :return: Record number of the first ping at or after the time, or one more than
+             the number of pings if there is none
+    :raises GsfException: Raised if anything went wrong
+    """
+    low = 1
+    high = count_pings(gsf_file) + 1
+    while low < high:
+        middle = (low + high) // 2
+        if index_time(gsf_file, middle) < time:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def extract_time_window(
+    paths: Iterable[Union[str, Path]],
+    start_time: float,
+    end_time: float,
+    beam_fields: Optional[Iterable[str]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_summaries: bool = True,
+) -> Iterator[WindowBlock]:
+    """
+    Reads the pings of many files that lie within a time window. Files whose summary
+    records show they end before or start after the window are skipped without
+    building their index (see summary.read_leading_summary()). In the other files
+    the first and last pings within the window are found by binary search of the
+    index times (see bisect_time()), so only the pings within the window are read.
+    libgsf caches the index of each file alongside it, so it is only built on the
+    first visit.
+    :param paths: Locations of the GSF files, each with its pings in time order
+    :param start_time: Seconds since the beginning of the epoch, inclusive
+    :param end_time: Seconds since the beginning of the epoch, exclusive
+    :param beam_fields: Names of the beam arrays to read (see
+                        columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+    :param block_size: Maximum number of pings per block
+    :param use_summaries: Whether to skip files by their summary records. Pings are
+                          missed where these are out of date, in which case they may
+                          be rebuilt with summary.update_summary() or ignored.
+    :return: Iterator of WindowBlock objects, in the order of the files
+    :raises GsfException: Raised if anything went wrong
+    """
+    for path in paths:
+        if use_summaries:
+            summary = read_leading_summary(path)
+            if summary is not None and (
+                summary.end_time < start_time or summary.start_time >= end_time
+            ):
+                continue
+
+        with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+            record_numbers = range(
+                bisect_time(gsf_file, start_time), bisect_time(gsf_file, end_time)
+            )
+            for block in iter_ping_blocks(
+                gsf_file, beam_fields, block_size, record_numbers
+            ):
+                yield WindowBlock(Path(path), block)
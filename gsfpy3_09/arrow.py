@@ -0,0 +1,202 @@
+"""
+Export of swath bathymetry pings to Apache Arrow record batches and Parquet files.
+Requires pyarrow, which is not a dependency of gsfpy and must be installed
+separately; without it this module may still be imported, but its functions raise
+ImportError.
+"""
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from gsfpy3_09 import GsfFile, open_gsf
+from gsfpy3_09.columnar import (
+    _BEAM_DTYPES,
+    _PING_DTYPES,
+    BEAM_ARRAY_SUBRECORDS,
+    PING_FIELDS,
+    PingBlock,
+    iter_ping_blocks,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# Ping times are held as floating point seconds, which resolve the present day to
+# well under a microsecond, so finer timestamps would only hold rounding error
+_TIME_UNIT = "us"
+_TIME_SCALE = 1e6
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for Arrow and Parquet export, install it with "
+            "'pip install pyarrow'"
+        )
+
+
+def ping_schema(
+    beam_fields: Optional[Iterable[str]] = None,
+    fixed_size_beams: Optional[int] = None,
+) -> "pa.Schema":
+    """
+    :param beam_fields: Names of the beam arrays to include (see
+                        columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+    :param fixed_size_beams: Number of beams of the fixed size lists holding beam
+                             arrays, by default beam arrays are variable size lists
+    :return: Schema of the record batches made by ping_block_to_record_batch()
+    :raises ImportError: Raised if pyarrow is not installed
+    """
+    _require_pyarrow()
+    beam_fields = list(BEAM_ARRAY_SUBRECORDS if beam_fields is None else beam_fields)
+
+    fields = [
+        pa.field("record_number", pa.int64()),
+        pa.field("ping_time", pa.timestamp(_TIME_UNIT, tz="UTC")),
+    ]
+    fields.extend(
+        pa.field(name, pa.from_numpy_dtype(_PING_DTYPES[name])) for name in PING_FIELDS
+    )
+    for name in beam_fields:
+        value_type = pa.from_numpy_dtype(_BEAM_DTYPES[name])
+        fields.append(
+            pa.field(
+                name,
+                pa.list_(value_type)
+                if fixed_size_beams is None
+                else pa.list_(value_type, fixed_size_beams),
+            )
+        )
+    return pa.schema(fields)
+
+
+def ping_block_to_record_batch(
+    block: PingBlock, fixed_size_beams: Optional[int] = None
+) -> "pa.RecordBatch":
+    """
+    Converts a block of pings to an Arrow record batch of one row per ping. Ping
+    times become UTC timestamps and beam arrays become lists, holding only the beams
+    of each ping or, with fixed_size_beams, padded as in the block.
+    :param block: Pings to convert
+    :param fixed_size_beams: Number of beams of the fixed size lists holding beam
+                             arrays, by default beam arrays are variable size lists
+    :return: RecordBatch with the schema given by ping_schema()
+    :raises ValueError: Raised if a ping has more beams than fixed_size_beams
+    :raises ImportError: Raised if pyarrow is not installed
+    """
+    _require_pyarrow()
+    beam_fields = [field for field in block.fields if field in BEAM_ARRAY_SUBRECORDS]
+    schema = ping_schema(beam_fields, fixed_size_beams)
+
+    arrays = [
+        pa.array(block.record_numbers, pa.int64()),
+        pa.array(
+            np.round(block.ping_time * _TIME_SCALE).astype(np.int64),
+            schema.field("ping_time").type,
+        ),
+    ]
+    arrays.extend(pa.array(block[name]) for name in PING_FIELDS)
+
+    if fixed_size_beams is None:
+        mask = block.beam_mask
+        offsets = np.concatenate(([0], np.cumsum(mask.sum(axis=1)))).astype(np.int32)
+        arrays.extend(
+            pa.ListArray.from_arrays(pa.array(offsets), pa.array(block[name][mask]))
+            for name in beam_fields
+        )
+    else:
+        if block.number_pings and block.number_beams.max() > fixed_size_beams:
+            raise ValueError(
+                f"Pings have up to {block.number_beams.max()} beams, more than "
+                f"{fixed_size_beams}"
+            )
+        for name in beam_fields:
+            column = block[name]
+            padded = np.full(
+                (block.number_pings, fixed_size_beams),
+                np.nan if column.dtype.kind == "f" else 0,
+                dtype=column.dtype,
+            )
+            padded[:, : column.shape[1]] = column
+            arrays.append(
+                pa.FixedSizeListArray.from_arrays(
+                    pa.array(padded.ravel()), fixed_size_beams
+                )
+            )
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_record_batches(
+    gsf_file: GsfFile,
+    beam_fields: Optional[Iterable[str]] = None,
+    block_size: int = DEFAULT_ROW_GROUP_SIZE,
+    fixed_size_beams: Optional[int] = None,
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Reads every swath bathymetry ping in the file as Arrow record batches (see
+    ping_block_to_record_batch())
+    :param gsf_file: File to read from
+    :param beam_fields: Names of the beam arrays to read (see
+                        columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+    :param block_size: Maximum number of pings per batch
+    :param fixed_size_beams: Number of beams of the fixed size lists holding beam
+                             arrays, by default beam arrays are variable size lists
+    :return: Iterator of RecordBatch objects
+    :raises ImportError: Raised if pyarrow is not installed
+    :raises GsfException: Raised if anything went wrong
+    """
+    _require_pyarrow()
+    for block in iter_ping_blocks(gsf_file, beam_fields, block_size):
+        yield ping_block_to_record_batch(block, fixed_size_beams)
+
+
+def write_parquet(
+    path: Union[str, Path],
+    target_path: Union[str, Path],
+    beam_fields: Optional[Iterable[str]] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    fixed_size_beams: Optional[int] = None,
+    compression: str = "snappy",
+) -> int:
+    """
+    Writes the swath bathymetry pings of a GSF file to a Parquet file of one row per
+    ping, a row group at a time, so that only one row group of pings is held in
+    memory at once.
+    :param path: Location of the GSF file
+    :param target_path: Location of the Parquet file to create
+    :param beam_fields: Names of the beam arrays to write (see
+                        columnar.BEAM_ARRAY_SUBRECORDS), all of them by default
+    :param row_group_size: Number of pings per row group
+    :param fixed_size_beams: Number of beams of the fixed size lists holding beam
+                             arrays, by default beam arrays are variable size lists
+    :param compression: Parquet compression codec
+    :return: Number of pings written
+    :raises ImportError: Raised if pyarrow is not installed
+    :raises GsfException: Raised if anything went wrong
+    """
+    _require_pyarrow()
+    beam_fields = list(BEAM_ARRAY_SUBRECORDS if beam_fields is None else beam_fields)
+    schema = ping_schema(beam_fields, fixed_size_beams)
+
+    number_pings = 0
+    writer = pq.ParquetWriter(str(target_path), schema, compression=compression)
+    try:
+        with open_gsf(path) as gsf_file:
+            for batch in iter_record_batches(
+                gsf_file, beam_fields, row_group_size, fixed_size_beams
+            ):
+                writer.write_table(
+                    pa.Table.from_batches([batch]), row_group_size=row_group_size
+                )
+                number_pings += batch.num_rows
+    finally:
+        writer.close()
+    return number_pings
@@ -5,6 +5,8 @@ from ctypes import (
     c_char_p,
     c_double,
     c_int,
+    c_int64,
+    c_long,
     c_longlong,
     c_ubyte,
     c_ushort,
@@ -12,185 +14,235 @@ from ctypes import (
     sizeof,
     string_at,
 )
-from os import environ
-from pathlib import Path
+from os import environ, path
+from threading import Lock
 
 from .enums import FileMode, RecordType, SeekOption
-from .GSF_POSITION import c_GSF_POSITION
-from .GSF_POSITION_OFFSETS import c_GSF_POSITION_OFFSETS
-from .gsfDataID import c_gsfDataID
-from .gsfMBParams import c_gsfMBParams
-from .gsfRecords import c_gsfRecords
-from .gsfScaleFactors import c_gsfScaleFactors
-from .gsfSwathBathyPing import c_gsfSwathBathyPing
-
-_libgsf_abs_path = str(Path(__file__).parent / "libgsf" / "libgsf03-09.so")
-
-# Check if the libgsf shared object library location is specified in the environment.
-# If so, use the specified library in preference to the bundled version. Handle the
-# case where the library cannot be found.
-if "GSFPY3_09_LIBGSF_PATH" in environ:
-    _libgsf_abs_path = environ["GSFPY3_09_LIBGSF_PATH"]
-
-try:
-    _libgsf = CDLL(_libgsf_abs_path)
-except OSError as osex:
-    raise Exception(
-        f"Cannot load shared library from {_libgsf_abs_path}. Set the "
-        f"$GSFPY3_09_LIBGSF_PATH environment variable to the correct path, "
-        f"or remove it from the environment to use the default version."
-    ) from osex
-
-_libgsf.gsfClose.argtypes = [c_int]
-_libgsf.gsfClose.restype = c_int
-
-_libgsf.gsfIntError.argtypes = []
-_libgsf.gsfIntError.restype = c_int
-
-_libgsf.gsfOpen.argtypes = [c_char_p, c_int, (POINTER(c_int))]
-_libgsf.gsfOpen.restype = c_int
-
-_libgsf.gsfOpenBuffered.argtypes = [c_char_p, c_int, (POINTER(c_int)), c_int]
-_libgsf.gsfOpenBuffered.restype = c_int
-
-_libgsf.gsfRead.argtypes = [
-    c_int,
-    c_int,
-    POINTER(c_gsfDataID),
-    POINTER(c_gsfRecords),
-    POINTER(c_ubyte),
-    c_int,
-]
-_libgsf.gsfRead.restype = c_int
-
-_libgsf.gsfSeek.argtypes = [c_int, c_int]
-_libgsf.gsfSeek.restype = c_int
-
-_libgsf.gsfStringError.argtypes = []
-_libgsf.gsfStringError.restype = c_char_p
-
-_libgsf.gsfWrite.argtypes = [c_int, POINTER(c_gsfDataID), POINTER(c_gsfRecords)]
-_libgsf.gsfWrite.restype = c_int
-
-_libgsf.gsfGetNumberRecords.argtypes = [c_int, c_int]
-_libgsf.gsfGetNumberRecords.restype = c_int
-
-_libgsf.gsfGetSwathBathyBeamWidths.argtypes = [
-    POINTER(c_gsfRecords),
-    POINTER(c_double),
-    POINTER(c_double),
-]
-_libgsf.gsfGetSwathBathyBeamWidths.restype = c_int
-
-_libgsf.gsfGetSwathBathyArrayMinMax.argtypes = [
-    POINTER(c_gsfSwathBathyPing),
-    c_int,
-    POINTER(c_double),
-    POINTER(c_double),
-]
-_libgsf.gsfGetSwathBathyArrayMinMax.restype = c_int
-
-_libgsf.gsfIsStarboardPing.argtypes = [POINTER(c_gsfRecords)]
-_libgsf.gsfIsStarboardPing.restype = c_int
-
-_libgsf.gsfGetSonarTextName.argtypes = [POINTER(c_gsfSwathBathyPing)]
-_libgsf.gsfGetSonarTextName.restype = c_char_p
 
-_libgsf.gsfFileSupportsRecalculateXYZ.argtypes = [c_int, POINTER(c_int)]
-_libgsf.gsfFileSupportsRecalculateXYZ.restype = c_int
 
-_libgsf.gsfFileSupportsRecalculateTPU.argtypes = [c_int, POINTER(c_int)]
-_libgsf.gsfFileSupportsRecalculateTPU.restype = c_int
-
-_libgsf.gsfFileSupportsRecalculateNominalDepth.argtypes = [c_int, POINTER(c_int)]
-_libgsf.gsfFileSupportsRecalculateNominalDepth.restype = c_int
-
-_libgsf.gsfFileContainsMBAmplitude.argtypes = [c_int, POINTER(c_int)]
-_libgsf.gsfFileContainsMBAmplitude.restype = c_int
+class _LibGsf:
+    """
+    Stands in for the libgsf shared library until it is first called. libgsf and the
+    record structures its functions are declared with are only loaded then, so that
+    importing gsfpy3_09 costs little for callers that never call libgsf.
+    """
 
-_libgsf.gsfFileContainsMBImagery.argtypes = [c_int, POINTER(c_int)]
-_libgsf.gsfFileContainsMBImagery.restype = c_int
+    def __getattr__(self, name: str):
+        return getattr(_load_libgsf(), name)
 
-_libgsf.gsfIsNewSurveyLine.argtypes = [
-    c_int,
-    POINTER(c_gsfRecords),
-    c_double,
-    POINTER(c_double),
-]
-_libgsf.gsfIsNewSurveyLine.restype = c_int
 
-_libgsf.gsfInitializeMBParams.argtypes = [POINTER(c_gsfMBParams)]
-_libgsf.gsfInitializeMBParams.restype = None
+_libgsf = _LibGsf()
+_LOAD_LOCK = Lock()
 
-_libgsf.gsfPutMBParams.argtypes = [
-    POINTER(c_gsfMBParams),
-    POINTER(c_gsfRecords),
-    c_int,
-    c_int,
-]
-_libgsf.gsfPutMBParams.restype = c_int
-
-_libgsf.gsfGetMBParams.argtypes = [
-    POINTER(c_gsfRecords),
-    POINTER(c_gsfMBParams),
-    POINTER(c_int),
-]
-_libgsf.gsfGetMBParams.restype = c_int
-
-_libgsf.gsfStat.argtypes = [
-    POINTER(c_char),
-    POINTER(c_longlong),
-]
-_libgsf.gsfStat.restype = c_int
-
-_libgsf.gsfGetPositionDestination.argtypes = [
-    c_GSF_POSITION,
-    c_GSF_POSITION_OFFSETS,
-    c_double,
-    c_double,
-]
-_libgsf.gsfGetPositionDestination.restype = POINTER(c_GSF_POSITION)
 
-_libgsf.gsfGetPositionOffsets.argtypes = [
-    c_GSF_POSITION,
-    c_GSF_POSITION,
-    c_double,
-    c_double,
-]
-_libgsf.gsfGetPositionOffsets.restype = POINTER(c_GSF_POSITION_OFFSETS)
+def _load_libgsf() -> CDLL:
+    """
+    Loads libgsf, if not already loaded, replacing the stand in for it
+    :return: libgsf
+    :raises Exception: Raised if libgsf cannot be loaded
+    """
+    global _libgsf
+    with _LOAD_LOCK:
+        if isinstance(_libgsf, _LibGsf):
+            _libgsf = _declare_functions(_open_libgsf())
+    return _libgsf
 
-_libgsf.gsfLoadScaleFactor.argtypes = [
-    POINTER(c_gsfScaleFactors),
-    c_int,
-    c_char,
-    c_double,
-    c_int,
-]
-_libgsf.gsfLoadScaleFactor.restype = c_int
 
-_libgsf.gsfGetScaleFactor.argtypes = [
-    c_int,
-    c_int,
-    POINTER(c_ubyte),
-    POINTER(c_double),
-    POINTER(c_double),
-]
-_libgsf.gsfGetScaleFactor.restype = c_int
+def _open_libgsf() -> CDLL:
+    libgsf_abs_path = path.join(path.dirname(__file__), "libgsf", "libgsf03-09.so")
 
-_libgsf.gsfSetDefaultScaleFactor.argtypes = [POINTER(c_gsfSwathBathyPing)]
-_libgsf.gsfSetDefaultScaleFactor.restype = c_int
+    # Check if the libgsf shared object library location is specified in the
+    # environment. If so, use the specified library in preference to the bundled
+    # version. Handle the case where the library cannot be found.
+    if "GSFPY3_09_LIBGSF_PATH" in environ:
+        libgsf_abs_path = environ["GSFPY3_09_LIBGSF_PATH"]
 
-_libgsf.gsfLoadDepthScaleFactorAutoOffset.argtypes = [
-    POINTER(c_gsfSwathBathyPing),
-    c_int,
-    c_int,
-    c_double,
-    c_double,
-    POINTER(c_double),
-    POINTER(c_ubyte),
-    c_double,
-]
-_libgsf.gsfLoadDepthScaleFactorAutoOffset.restype = c_int
+    try:
+        return CDLL(libgsf_abs_path)
+    except OSError as osex:
+        raise Exception(
+            f"Cannot load shared library from {libgsf_abs_path}. Set the "
+            f"$GSFPY3_09_LIBGSF_PATH environment variable to the correct path, "
+            f"or remove it from the environment to use the default version."
+        ) from osex
+
+
+def _declare_functions(libgsf: CDLL) -> CDLL:
+    from .GSF_POSITION import c_GSF_POSITION
+    from .GSF_POSITION_OFFSETS import c_GSF_POSITION_OFFSETS
+    from .gsfDataID import c_gsfDataID
+    from .gsfMBParams import c_gsfMBParams
+    from .gsfRecords import c_gsfRecords
+    from .gsfScaleFactors import c_gsfScaleFactors
+    from .gsfSwathBathyPing import c_gsfSwathBathyPing
+
+    libgsf.gsfClose.argtypes = [c_int]
+    libgsf.gsfClose.restype = c_int
+
+    libgsf.gsfIntError.argtypes = []
+    libgsf.gsfIntError.restype = c_int
+
+    libgsf.gsfOpen.argtypes = [c_char_p, c_int, (POINTER(c_int))]
+    libgsf.gsfOpen.restype = c_int
+
+    libgsf.gsfOpenBuffered.argtypes = [c_char_p, c_int, (POINTER(c_int)), c_int]
+    libgsf.gsfOpenBuffered.restype = c_int
+
+    libgsf.gsfRead.argtypes = [
+        c_int,
+        c_int,
+        POINTER(c_gsfDataID),
+        POINTER(c_gsfRecords),
+        POINTER(c_ubyte),
+        c_int,
+    ]
+    libgsf.gsfRead.restype = c_int
+
+    libgsf.gsfSeek.argtypes = [c_int, c_int]
+    libgsf.gsfSeek.restype = c_int
+
+    libgsf.gsfStringError.argtypes = []
+    libgsf.gsfStringError.restype = c_char_p
+
+    libgsf.gsfWrite.argtypes = [c_int, POINTER(c_gsfDataID), POINTER(c_gsfRecords)]
+    libgsf.gsfWrite.restype = c_int
+
+    libgsf.gsfGetNumberRecords.argtypes = [c_int, c_int]
+    libgsf.gsfGetNumberRecords.restype = c_int
+
+    libgsf.gsfIndexTime.argtypes = [
+        c_int,
+        c_int,
+        c_int,
+        POINTER(c_int64),
+        POINTER(c_long),
+    ]
+    libgsf.gsfIndexTime.restype = c_int
+
+    libgsf.gsfGetSwathBathyBeamWidths.argtypes = [
+        POINTER(c_gsfRecords),
+        POINTER(c_double),
+        POINTER(c_double),
+    ]
+    libgsf.gsfGetSwathBathyBeamWidths.restype = c_int
+
+    libgsf.gsfGetSwathBathyArrayMinMax.argtypes = [
+        POINTER(c_gsfSwathBathyPing),
+        c_int,
+        POINTER(c_double),
+        POINTER(c_double),
+    ]
+    libgsf.gsfGetSwathBathyArrayMinMax.restype = c_int
+
+    libgsf.gsfIsStarboardPing.argtypes = [POINTER(c_gsfRecords)]
+    libgsf.gsfIsStarboardPing.restype = c_int
+
+    libgsf.gsfGetSonarTextName.argtypes = [POINTER(c_gsfSwathBathyPing)]
+    libgsf.gsfGetSonarTextName.restype = c_char_p
+
+    libgsf.gsfFileSupportsRecalculateXYZ.argtypes = [c_int, POINTER(c_int)]
+    libgsf.gsfFileSupportsRecalculateXYZ.restype = c_int
+
+    libgsf.gsfFileSupportsRecalculateTPU.argtypes = [c_int, POINTER(c_int)]
+    libgsf.gsfFileSupportsRecalculateTPU.restype = c_int
+
+    libgsf.gsfFileSupportsRecalculateNominalDepth.argtypes = [c_int, POINTER(c_int)]
+    libgsf.gsfFileSupportsRecalculateNominalDepth.restype = c_int
+
+    libgsf.gsfFileContainsMBAmplitude.argtypes = [c_int, POINTER(c_int)]
+    libgsf.gsfFileContainsMBAmplitude.restype = c_int
+
+    libgsf.gsfFileContainsMBImagery.argtypes = [c_int, POINTER(c_int)]
+    libgsf.gsfFileContainsMBImagery.restype = c_int
+
+    libgsf.gsfIsNewSurveyLine.argtypes = [
+        c_int,
+        POINTER(c_gsfRecords),
+        c_double,
+        POINTER(c_double),
+    ]
+    libgsf.gsfIsNewSurveyLine.restype = c_int
+
+    libgsf.gsfInitializeMBParams.argtypes = [POINTER(c_gsfMBParams)]
+    libgsf.gsfInitializeMBParams.restype = None
+
+    libgsf.gsfPutMBParams.argtypes = [
+        POINTER(c_gsfMBParams),
+        POINTER(c_gsfRecords),
+        c_int,
+        c_int,
+    ]
+    libgsf.gsfPutMBParams.restype = c_int
+
+    libgsf.gsfGetMBParams.argtypes = [
+        POINTER(c_gsfRecords),
+        POINTER(c_gsfMBParams),
+        POINTER(c_int),
+    ]
+    libgsf.gsfGetMBParams.restype = c_int
+
+    libgsf.gsfStat.argtypes = [
+        POINTER(c_char),
+        POINTER(c_longlong),
+    ]
+    libgsf.gsfStat.restype = c_int
+
+    libgsf.gsfGetPositionDestination.argtypes = [
+        c_GSF_POSITION,
+        c_GSF_POSITION_OFFSETS,
+        c_double,
+        c_double,
+    ]
+    libgsf.gsfGetPositionDestination.restype = POINTER(c_GSF_POSITION)
+
+    libgsf.gsfGetPositionOffsets.argtypes = [
+        c_GSF_POSITION,
+        c_GSF_POSITION,
+        c_double,
+        c_double,
+    ]
+    libgsf.gsfGetPositionOffsets.restype = POINTER(c_GSF_POSITION_OFFSETS)
+
+    libgsf.gsfLoadScaleFactor.argtypes = [
+        POINTER(c_gsfScaleFactors),
+        c_int,
+        c_char,
+        c_double,
+        c_int,
+    ]
+    libgsf.gsfLoadScaleFactor.restype = c_int
+
+    libgsf.gsfGetScaleFactor.argtypes = [
+        c_int,
+        c_int,
+        POINTER(c_ubyte),
+        POINTER(c_double),
+        POINTER(c_double),
+    ]
+    libgsf.gsfGetScaleFactor.restype = c_int
+
+    libgsf.gsfSetDefaultScaleFactor.argtypes = [POINTER(c_gsfSwathBathyPing)]
+    libgsf.gsfSetDefaultScaleFactor.restype = c_int
+
+    libgsf.gsfLoadDepthScaleFactorAutoOffset.argtypes = [
+        POINTER(c_gsfSwathBathyPing),
+        c_int,
+        c_int,
+        c_double,
+        c_double,
+        POINTER(c_double),
+        POINTER(c_ubyte),
+        c_double,
+    ]
+    libgsf.gsfLoadDepthScaleFactorAutoOffset.restype = c_int
+
+    libgsf.gsfCopyRecords.argtypes = [POINTER(c_gsfRecords), POINTER(c_gsfRecords)]
+    libgsf.gsfCopyRecords.restype = c_int
+
+    libgsf.gsfFree.argtypes = [POINTER(c_gsfRecords)]
+    libgsf.gsfFree.restype = None
+
+    return libgsf
 
 
 def gsfOpen(filename: bytes, mode: FileMode, p_handle) -> int:
@@ -298,7 +350,7 @@ def gsfIndexTime(
     :param handle: c_int
     :param record_type: gsfpy3_09.enums.RecordType
     :param record_number: c_int
-    :param p_sec: POINTER(c_int)
+    :param p_sec: POINTER(c_int64), as time_t is 64 bits wide
     :param p_nsec: POINTER(c_long)
     :return: The record number if successful, otherwise -1. Note that contents of
              the POINTER parameters p_sec and p_nsec will be updated upon
@@ -477,6 +529,28 @@ def gsfCopyRecords(p_target, p_source):
     return ret_val
 
 
+def _gsfCopyRecordsAllocating(p_target, p_source) -> int:
+    """
+    Calls gsfCopyRecords() in libgsf, which, unlike gsfCopyRecords() above, copies
+    the arrays the source points to into arrays libgsf allocates for the target. The
+    target must not point to any arrays beforehand, and the arrays it is given must
+    be released with gsfFree().
+    :param p_target: POINTER(gsfpy3_09.gsfRecords.c_gsfRecords)
+    :param p_source: POINTER(gsfpy3_09.gsfRecords.c_gsfRecords)
+    :return: 0 if successful, otherwise -1
+    """
+    return _libgsf.gsfCopyRecords(p_target, p_source)
+
+
+def gsfFree(p_rec) -> None:
+    """
+    :param p_rec: POINTER(gsfpy3_09.gsfRecords.c_gsfRecords)
+    :return: None. Note that, upon return, the arrays libgsf allocated for the given
+             gsfRecords structure are released.
+    """
+    _libgsf.gsfFree(p_rec)
+
+
 def gsfPutMBParams(p_mbparams, p_rec, handle: c_int, numArrays: c_int) -> int:
     """
     :param p_mbparams: POINTER(gsfpy3_09.gsfMBParams.c_gsfMBParams)
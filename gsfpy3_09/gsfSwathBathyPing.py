@@ -7,10 +7,10 @@ class c_gsfSwathBathyPing(Structure):
     _fields_ = [
         # Seconds and nanoseconds.
         ("ping_time", timespec.c_timespec),
-        # Degrees, positive going east.
-        ("longitude", c_double),
         # Degrees, positive going north.
         ("latitude", c_double),
+        # Degrees, positive going east.
+        ("longitude", c_double),
         # Height above ellipsoid, positive value defines a point above ellipsoid.
         ("height", c_double),
         # Distance from ellipsoid to vertical datum, positive value indicates datum
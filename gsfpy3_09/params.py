@@ -0,0 +1,245 @@
+"""Parsed, immutable multibeam processing parameters"""
+import sys
+from ctypes import byref, c_int
+from typing import List, Union
+
+import numpy as np
+
+from gsfpy3_09 import _call
+from gsfpy3_09.bindings import gsfGetMBParams
+from gsfpy3_09.gsfMBParams import c_gsfMBParams
+from gsfpy3_09.gsfRecords import c_gsfRecords
+from gsfpy3_09.structured import MB_OFFSETS_DTYPE, MB_PARAMS_DTYPE, as_structured
+from gsfpy3_09.timespec import timespec_to_seconds
+
+# Value of parameters recorded as unknown, GSF_UNKNOWN_PARAM_VALUE, which is DBL_MIN
+UNKNOWN_PARAM_VALUE = sys.float_info.min
+
+_AXES = ("x", "y", "z")
+_ATTITUDE = ("pitch", "roll", "heading")
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array = np.array(array)
+    array.flags.writeable = False
+    return array
+
+
+class MBOffsets:
+    """
+    Read-only c_gsfMBOffsets, with each offset held as a NumPy array (or float) so
+    lever arm corrections may be applied to many soundings at once. Offsets per
+    transducer hold one element per transducer, up to two. Distances are in meters,
+    angles in degrees and latencies in seconds.
+    """
+
+    __slots__ = ("_offsets",)
+
+    def __init__(self, offsets: np.ndarray):
+        """
+        :param offsets: Element of MB_OFFSETS_DTYPE, which is copied
+        """
+        self._offsets = _read_only(np.asarray(offsets, dtype=MB_OFFSETS_DTYPE))
+
+    @property
+    def fields(self) -> List[str]:
+        return list(MB_OFFSETS_DTYPE.names)
+
+    def __getitem__(self, field: str) -> Union[float, np.ndarray]:
+        """
+        :param field: Name of a field of c_gsfMBOffsets
+        :return: Read-only array of one element per transducer for offsets per
+                 transducer, otherwise float
+        """
+        value = self._offsets[field]
+        return value if value.ndim else float(value)
+
+    def _vectors(self, prefix: str, suffix: str = "_offset") -> np.ndarray:
+        return _read_only(
+            np.stack([self._offsets[f"{prefix}_{axis}{suffix}"] for axis in _AXES], -1)
+        )
+
+    @property
+    def transducer(self) -> np.ndarray:
+        """(transducer, xyz) offsets of the (transmit) transducers"""
+        return self._vectors("transducer")
+
+    @property
+    def transducer_attitude(self) -> np.ndarray:
+        """(transducer, pitch/roll/heading) offsets of the (transmit) transducers"""
+        return _read_only(
+            np.stack(
+                [self._offsets[f"transducer_{angle}_offset"] for angle in _ATTITUDE],
+                -1,
+            )
+        )
+
+    @property
+    def rx_transducer(self) -> np.ndarray:
+        """(transducer, xyz) offsets of the receive transducers"""
+        return self._vectors("rx_transducer")
+
+    @property
+    def position(self) -> np.ndarray:
+        """xyz offset of the position reference point"""
+        return self._vectors("position")
+
+    @property
+    def antenna(self) -> np.ndarray:
+        """xyz offset of the positioning antenna"""
+        return self._vectors("antenna")
+
+    @property
+    def mru(self) -> np.ndarray:
+        """xyz offset of the motion reference unit"""
+        return self._vectors("mru")
+
+    @property
+    def center_of_rotation(self) -> np.ndarray:
+        """xyz offset of the center of rotation"""
+        return self._vectors("center_of_rotation")
+
+    @property
+    def depth_sensor(self) -> np.ndarray:
+        """xyz offset of the depth sensor"""
+        return self._vectors("depth_sensor")
+
+    def known(self) -> "MBOffsets":
+        """
+        :return: Copy of these offsets with those recorded as unknown set to NaN
+        """
+        offsets = self._offsets.copy()
+        for name in MB_OFFSETS_DTYPE.names:
+            offsets[name] = np.where(
+                offsets[name] == UNKNOWN_PARAM_VALUE, np.nan, offsets[name]
+            )
+        return MBOffsets(offsets)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MBOffsets):
+            return NotImplemented
+        return self._offsets.tobytes() == other._offsets.tobytes()
+
+    def __hash__(self) -> int:
+        return hash(self._offsets.tobytes())
+
+
+class MBParams:
+    """
+    Processing parameters parsed from a processing parameters record, as by
+    gsfGetMBParams, held read-only. MBParams are hashable and compare equal when
+    parsed from the same parameters, so they may key caches of values derived from
+    them. GsfFile.mb_params holds those of the processing parameters record most
+    recently read from a file.
+    """
+
+    __slots__ = ("_time", "_number_arrays", "_params", "_to_apply", "_applied")
+
+    def __init__(
+        self, params: c_gsfMBParams, time: float = 0.0, number_arrays: int = 0
+    ):
+        """
+        :param params: Processing parameters, which are copied
+        :param time: Seconds since the beginning of the epoch from which the
+                     parameters apply
+        :param number_arrays: Number of transducers the parameters describe
+        """
+        self._time = time
+        self._number_arrays = number_arrays
+        self._params = _read_only(as_structured(params).reshape(()))
+        self._to_apply = MBOffsets(self._params["to_apply"])
+        self._applied = MBOffsets(self._params["applied"])
+
+    @staticmethod
+    def from_records(records: c_gsfRecords) -> "MBParams":
+        """
+        :param records: Records holding a processing parameters record
+        :return: MBParams
+        :raises GsfException: Raised if anything went wrong
+        """
+        params = c_gsfMBParams()
+        number_arrays = c_int(0)
+        _call(gsfGetMBParams, byref(records), byref(params), byref(number_arrays))
+        return MBParams(
+            params,
+            timespec_to_seconds(records.process_parameters.param_time),
+            number_arrays.value,
+        )
+
+    @property
+    def time(self) -> float:
+        """
+        Seconds since the beginning of the epoch from which the parameters apply
+        """
+        return self._time
+
+    @property
+    def number_arrays(self) -> int:
+        return self._number_arrays
+
+    @property
+    def start_of_epoch(self) -> str:
+        return self._params["start_of_epoch"].item().decode(errors="replace")
+
+    @property
+    def to_apply(self) -> MBOffsets:
+        """
+        Offsets yet to be applied to the data
+        """
+        return self._to_apply
+
+    @property
+    def applied(self) -> MBOffsets:
+        """
+        Offsets already applied to the data
+        """
+        return self._applied
+
+    @property
+    def fields(self) -> List[str]:
+        return list(MB_PARAMS_DTYPE.names)
+
+    def __getitem__(self, field: str) -> Union[int, str, MBOffsets]:
+        """
+        :param field: Name of a field of c_gsfMBParams, e.g. roll_compensated
+        :return: Value of the field
+        """
+        if field == "start_of_epoch":
+            return self.start_of_epoch
+        if field in ("to_apply", "applied"):
+            return getattr(self, field)
+        return int(self._params[field])
+
+    def offsets(self) -> MBOffsets:
+        """
+        :return: Offsets already applied to the data where known, otherwise those to
+                 be applied, and NaN where neither is known
+        """
+        applied = self._applied.known()._offsets
+        to_apply = self._to_apply.known()._offsets
+        offsets = applied.copy()
+        for name in MB_OFFSETS_DTYPE.names:
+            offsets[name] = np.where(
+                np.isnan(applied[name]), to_apply[name], applied[name]
+            )
+        return MBOffsets(offsets)
+
+    def to_c(self) -> c_gsfMBParams:
+        """
+        :return: Copy of the parameters as c_gsfMBParams, e.g. for gsfPutMBParams
+        """
+        return c_gsfMBParams.from_buffer_copy(self._params.tobytes())
+
+    def _key(self):
+        return self._time, self._number_arrays, self._params.tobytes()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MBParams):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"MBParams(time={self._time!r}, number_arrays={self._number_arrays!r})"
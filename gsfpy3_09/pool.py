@@ -0,0 +1,288 @@
+"""Bounded pool of open GSF files for random access across many files"""
+import weakref
+from collections import OrderedDict
+from ctypes import byref, memmove, pointer, sizeof
+from pathlib import Path
+from threading import RLock
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from gsfpy3_09 import (
+    GsfException,
+    GsfFile,
+    GsfTooManyOpenFiles,
+    _call,
+    _read_into,
+    open_gsf,
+)
+from gsfpy3_09.bindings import _gsfCopyRecordsAllocating, gsfFree
+from gsfpy3_09.constants import GSF_MAX_OPEN_FILES
+from gsfpy3_09.enums import FileMode, RecordType, SeekOption
+from gsfpy3_09.gsfDataID import c_gsfDataID
+from gsfpy3_09.gsfRecords import c_gsfRecords
+
+
+class PoolStats(NamedTuple):
+    """Counts of the requests made of a GsfFilePool"""
+
+    # Requests served by a file that was already open
+    hits: int = 0
+    # Requests that had to open a file, either for the first time or again
+    misses: int = 0
+    # Files opened again after being evicted
+    reopens: int = 0
+    # Files closed to make room for others
+    evictions: int = 0
+
+
+class _Position(NamedTuple):
+    """
+    Position in a file, as the reads and seeks made since the file was opened,
+    rewound, sought to its end or last read by record number. Runs of reads of the
+    same record type, which are how files are usually read, are held as one step.
+    """
+
+    # None for the beginning of the file, _END for its end, otherwise the record type
+    # and record number of the last record read by number
+    anchor: Union[None, str, Tuple[RecordType, int]] = None
+    # Record type read (GSF_NEXT_RECORD for any) or _PREVIOUS for a step back to the
+    # previous record, with the number of times it was done
+    steps: Tuple[Tuple[Union[RecordType, str], int], ...] = ()
+
+    def then(self, step: Union[RecordType, str]) -> "_Position":
+        if self.steps and self.steps[-1][0] == step:
+            return self._replace(
+                steps=self.steps[:-1] + ((step, self.steps[-1][1] + 1),)
+            )
+        return self._replace(steps=self.steps + ((step, 1),))
+
+
+_END = "end"
+_PREVIOUS = "previous"
+
+
+class _PooledFile(NamedTuple):
+    gsf_file: GsfFile
+    position: _Position
+
+
+def _copy_records(records: c_gsfRecords) -> c_gsfRecords:
+    """
+    Copies records, with the arrays they point to, into arrays allocated by libgsf,
+    which are released once the copy is garbage collected
+    """
+    copy = c_gsfRecords()
+    _call(_gsfCopyRecordsAllocating, pointer(copy), pointer(records))
+    # The arrays are released through a shallow copy of the copy, which the
+    # finaliser may hold without keeping the copy alive
+    allocation = c_gsfRecords()
+    memmove(byref(allocation), byref(copy), sizeof(c_gsfRecords))
+    weakref.finalize(copy, gsfFree, pointer(allocation))
+    return copy
+
+
+class GsfFilePool:
+    """
+    Keeps up to a given number of GSF files open, opening files as they are first
+    used and closing the least recently used file to make room for another. Each
+    file's position is remembered, so an evicted file is reopened and sought back to
+    where it was transparently. Files read by record number, in GSF_READONLY_INDEX
+    mode, are sought back by reading a single record, whereas files read
+    sequentially, in GSF_READONLY mode, are sought back by reading every record
+    since the beginning of the file again.
+    """
+
+    def __init__(
+        self,
+        max_open_files: int = GSF_MAX_OPEN_FILES,
+        mode: FileMode = FileMode.GSF_READONLY_INDEX,
+        buffer_size: Optional[int] = None,
+    ):
+        """
+        :param max_open_files: Maximum number of files to keep open, which libgsf
+                               limits to GSF_MAX_OPEN_FILES across all open files
+        :param mode: Mode to open the files in, which must not allow writing
+        :param buffer_size: Size of the buffer to read each file through, if any
+        :raises ValueError: Raised if max_open_files is not positive or the mode
+                            allows writing
+        """
+        if max_open_files < 1:
+            raise ValueError("Pool must allow at least one open file")
+        if mode not in (FileMode.GSF_READONLY, FileMode.GSF_READONLY_INDEX):
+            raise ValueError("Pooled files may only be opened for reading")
+
+        self._max_open_files = max_open_files
+        self._mode = mode
+        self._buffer_size = buffer_size
+        self._files: "OrderedDict[Path, _PooledFile]" = OrderedDict()
+        # Positions of evicted files, to seek back to when they are reopened
+        self._positions: Dict[Path, _Position] = {}
+        self._stats = PoolStats()
+        self._lock = RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def stats(self) -> PoolStats:
+        return self._stats
+
+    @property
+    def open_paths(self) -> Tuple[Path, ...]:
+        """
+        Paths of the open files, from least to most recently used
+        """
+        with self._lock:
+            return tuple(self._files)
+
+    def read(
+        self,
+        path: Union[str, Path],
+        desired_record: RecordType = RecordType.GSF_NEXT_RECORD,
+        record_number: int = 0,
+    ) -> Tuple[c_gsfDataID, c_gsfRecords]:
+        """
+        Reads a record from a file, as GsfFile.read(). Unlike the records GsfFile
+        reads, whose arrays libgsf reuses for the next read of the file and releases
+        when the file is closed, the records are a copy owned by the caller, as the
+        pool may close the file at any time.
+        :param path: Location of the GSF file
+        :param desired_record: Record type to read
+        :param record_number: nth occurrence of the record to read, starting from 1,
+                              or 0 to read the next record
+        :return: Tuple of c_gsfDataID and c_gsfRecords
+        :raises GsfException: Raised if anything went wrong
+        """
+        with self._lock:
+            path, pooled = self._acquire(path)
+            data_id, records = pooled.gsf_file.read(desired_record, record_number)
+            records = _copy_records(records)
+            if record_number:
+                position = _Position((desired_record, record_number))
+            else:
+                position = pooled.position.then(desired_record)
+            self._files[path] = pooled._replace(position=position)
+            return data_id, records
+
+    def seek(self, path: Union[str, Path], option: SeekOption):
+        """
+        :param path: Location of the GSF file
+        :param option: Where to seek to
+        :raises GsfException: Raised if anything went wrong
+        """
+        with self._lock:
+            path, pooled = self._acquire(path)
+            pooled.gsf_file.seek(option)
+            if option == SeekOption.GSF_REWIND:
+                position = _Position()
+            elif option == SeekOption.GSF_END_OF_FILE:
+                position = _Position(_END)
+            else:
+                position = pooled.position.then(_PREVIOUS)
+            self._files[path] = pooled._replace(position=position)
+
+    def get_number_records(
+        self, path: Union[str, Path], desired_record: RecordType
+    ) -> int:
+        """
+        May only be used when the pool opens files for direct access
+        (GSF_READONLY_INDEX)
+        :param path: Location of the GSF file
+        :param desired_record: Specifies the type of record to count
+        :return: Number of records of type desired_record
+        :raises GsfException: Raised if anything went wrong
+        """
+        with self._lock:
+            _, pooled = self._acquire(path)
+            return pooled.gsf_file.get_number_records(desired_record)
+
+    def evict(self, path: Union[str, Path]):
+        """
+        Closes a file, if open, remembering its position
+        :param path: Location of the GSF file
+        :raises GsfException: Raised if anything went wrong
+        """
+        with self._lock:
+            path = Path(path).resolve()
+            if path in self._files:
+                self._close(path)
+
+    def close(self):
+        """
+        Closes every open file and forgets the positions of all files
+        :raises GsfException: Raised if anything went wrong
+        """
+        with self._lock:
+            while self._files:
+                _, pooled = self._files.popitem(last=False)
+                pooled.gsf_file.close()
+            self._positions.clear()
+
+    def _acquire(self, path: Union[str, Path]) -> Tuple[Path, _PooledFile]:
+        path = Path(path).resolve()
+        pooled = self._files.get(path)
+        if pooled is not None:
+            self._files.move_to_end(path)
+            self._stats = self._stats._replace(hits=self._stats.hits + 1)
+            return path, pooled
+
+        while len(self._files) >= self._max_open_files:
+            self._evict_least_recently_used()
+        gsf_file = self._open(path)
+        reopened = path in self._positions
+        position = self._positions.pop(path, _Position())
+        try:
+            _seek_position(gsf_file, position)
+        except GsfException:
+            gsf_file.close()
+            raise
+
+        pooled = self._files[path] = _PooledFile(gsf_file, position)
+        self._stats = self._stats._replace(
+            misses=self._stats.misses + 1, reopens=self._stats.reopens + reopened
+        )
+        return path, pooled
+
+    def _open(self, path: Path) -> GsfFile:
+        # Files opened outside the pool count against libgsf's limit too, so on
+        # reaching it the pool gives up its own files until there is room
+        while True:
+            try:
+                return open_gsf(path, self._mode, self._buffer_size)
+            except GsfTooManyOpenFiles:
+                if not self._files:
+                    raise
+                self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self):
+        self._close(next(iter(self._files)))
+        self._stats = self._stats._replace(evictions=self._stats.evictions + 1)
+
+    def _close(self, path: Path):
+        pooled = self._files.pop(path)
+        self._positions[path] = pooled.position
+        pooled.gsf_file.close()
+
+
+def _seek_position(gsf_file: GsfFile, position: _Position):
+    """
+    Seeks a newly opened file to a position, by repeating the reads and seeks that
+    led to it
+    """
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    with gsf_file.lock:
+        if position.anchor == _END:
+            gsf_file.seek(SeekOption.GSF_END_OF_FILE)
+        elif position.anchor is not None:
+            desired_record, record_number = position.anchor
+            _read_into(gsf_file, desired_record, data_id, records, record_number)
+
+        for step, count in position.steps:
+            for _ in range(count):
+                if step == _PREVIOUS:
+                    gsf_file.seek(SeekOption.GSF_PREVIOUS_RECORD)
+                else:
+                    _read_into(gsf_file, step, data_id, records)
@@ -0,0 +1,444 @@
+"""Sensor specific subrecords of swath bathymetry pings"""
+from ctypes import Array, Structure, addressof, c_char, string_at
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import numpy as np
+
+from gsfpy3_09 import GsfFile
+from gsfpy3_09.columnar import _read_pings
+from gsfpy3_09.enums import SensorSpecificSubRecord
+from gsfpy3_09.gsfDataID import c_gsfDataID
+from gsfpy3_09.gsfRecords import c_gsfRecords
+from gsfpy3_09.gsfSensorSpecific import c_gsfSensorSpecific
+from gsfpy3_09.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_09.structured import as_structured, structured_dtype
+from gsfpy3_09.timespec import c_timespec, timespec_to_seconds
+
+_SENSOR = SensorSpecificSubRecord
+
+# Member of c_gsfSensorSpecific that holds the sensor specific subrecord of each sensor
+SENSOR_SPECIFIC_MEMBERS: Dict[SensorSpecificSubRecord, str] = {
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEABEAM_SPECIFIC: "gsfSeaBeamSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM12_SPECIFIC: "gsfEM12Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM100_SPECIFIC: "gsfEM100Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM950_SPECIFIC: "gsfEM950Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM121A_SPECIFIC: "gsfEM121ASpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM121_SPECIFIC: "gsfEM121Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SASS_SPECIFIC: "gsfSASSSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEAMAP_SPECIFIC: "gsfSeamapSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEABAT_SPECIFIC: "gsfSeaBatSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM1000_SPECIFIC: "gsfEM1000Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_TYPEIII_SEABEAM_SPECIFIC: (
+        "gsfTypeIIISeaBeamSpecific"
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SB_AMP_SPECIFIC: "gsfSBAmpSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEABAT_II_SPECIFIC: "gsfSeaBatIISpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEABAT_8101_SPECIFIC: "gsfSeaBat8101Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_SEABEAM_2112_SPECIFIC: "gsfSeaBeam2112Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_ELAC_MKII_SPECIFIC: "gsfElacMkIISpecific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_CMP_SASS_SPECIFIC: "gsfCmpSassSpecific",
+    **dict.fromkeys(
+        (
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3000_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM1002_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM300_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM120_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3002_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3000D_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3002D_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM121A_SIS_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM2000_SPECIFIC,
+        ),
+        "gsfEM3Specific",
+    ),
+    **dict.fromkeys(
+        (
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM300_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM1002_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM2000_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3000_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM120_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3002_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3000D_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM3002D_RAW_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM121A_SIS_RAW_SPECIFIC,
+        ),
+        "gsfEM3RawSpecific",
+    ),
+    **dict.fromkeys(
+        (
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8101_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8111_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8124_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8125_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8150_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_8160_SPECIFIC,
+        ),
+        "gsfReson8100Specific",
+    ),
+    **dict.fromkeys(
+        (
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM710_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM302_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM122_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_EM2040_SPECIFIC,
+        ),
+        "gsfEM4Specific",
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_GEOSWATH_PLUS_SPECIFIC: (
+        "gsfGeoSwathPlusSpecific"
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_KLEIN_5410_BSS_SPECIFIC: (
+        "gsfKlein5410BssSpecific"
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_7125_SPECIFIC: "gsfReson7100Specific",
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_DELTA_T_SPECIFIC: "gsfDeltaTSpecific",
+    **dict.fromkeys(
+        (
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2022_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2024_SPECIFIC,
+            _SENSOR.GSF_SWATH_BATHY_SUBRECORD_R2SONIC_2020_SPECIFIC,
+        ),
+        "gsfR2SonicSpecific",
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_RESON_TSERIES_SPECIFIC: (
+        "gsfResonTSeriesSpecific"
+    ),
+    _SENSOR.GSF_SWATH_BATHY_SUBRECORD_KMALL_SPECIFIC: "gsfKMallSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_ECHOTRAC_SPECIFIC: "gsfSBEchotracSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_BATHY2000_SPECIFIC: "gsfSBBathy2000Specific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_MGD77_SPECIFIC: "gsfSBMGD77Specific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_BDB_SPECIFIC: "gsfSBBDBSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_NOSHDB_SPECIFIC: "gsfSBNOSHDBSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_PDD_SPECIFIC: "gsfSBPDDSpecific",
+    _SENSOR.GSF_SWATH_BATHY_SB_SUBRECORD_NAVISOUND_SPECIFIC: "gsfSBNavisoundSpecific",
+}
+
+# Arrays of sensor specific structures, by structure and field, that are only filled
+# up to the count held in another field of the structure
+_ARRAY_COUNTS: Dict[Tuple[str, str], str] = {
+    ("c_gsfEM3RawSpecific", "sector"): "transmit_sectors",
+    ("c_gsfEM4Specific", "sector"): "transmit_sectors",
+    ("c_gsfKMALLSpecific", "sector"): "numTxSectors",
+    ("c_gsfKMALLSpecific", "extraDetClassInfo"): "numExtraDetectionClasses",
+}
+
+# Fields holding unused space, which are not decoded
+_SPARE_PREFIX = "spare"
+
+# Kinds of NumPy dtype of the fields that may be read as columns, besides times
+_COLUMN_KINDS = "biuf"
+
+
+class SensorColumns(NamedTuple):
+    """
+    Sensor specific fields of the swath bathymetry pings of a file, one array per
+    field holding a value per ping. Pings whose sensor specific subrecord lacks a
+    field hold NaN in floating point fields and zero in integer fields, so a field
+    should be read alongside sensor_id where files mix sensors.
+    """
+
+    # Record number of each ping, counting from 1
+    record_numbers: np.ndarray
+    # Time of each ping in seconds since the beginning of the epoch
+    ping_time: np.ndarray
+    # Sensor id of each ping, see SensorSpecificSubRecord
+    sensor_id: np.ndarray
+    # Values of each field by name
+    columns: Dict[str, np.ndarray]
+
+
+def sensor_specific_member(sensor_id: int) -> Optional[str]:
+    """
+    :param sensor_id: Identifier of the sensor specific subrecord of a ping, as held in
+                      c_gsfSwathBathyPing.sensor_id
+    :return: Name of the member of c_gsfSensorSpecific that holds the subrecord, or
+             None if the sensor is unknown or has no subrecord
+    """
+    return SENSOR_SPECIFIC_MEMBERS.get(sensor_id)
+
+
+def sensor_specific(mb_ping: c_gsfSwathBathyPing) -> Optional[Structure]:
+    """
+    Looks up the member of a ping's sensor_data union that applies to its sensor. The
+    member is a view of the ping rather than a copy, so only the fields read from it
+    are decoded, and it changes as the ping is read over.
+    :param mb_ping: Swath bathymetry ping
+    :return: Sensor specific subrecord, or None if the sensor is unknown
+    """
+    member = sensor_specific_member(mb_ping.sensor_id)
+    if member is None:
+        return None
+    return getattr(mb_ping.sensor_data, member)
+
+
+def decode_sensor_specific(mb_ping: c_gsfSwathBathyPing) -> Optional[Dict[str, Any]]:
+    """
+    Decodes the member of a ping's sensor_data union that applies to its sensor, and
+    only that member, into Python values that outlive the ping. Numbers are decoded to
+    int or float, character arrays to str, times to seconds since the beginning of the
+    epoch and nested structures to dicts. Arrays of structures, e.g. transmit sectors,
+    are decoded to NumPy structured arrays holding only their filled elements, and
+    other arrays to NumPy arrays. Spare fields are left out.
+    :param mb_ping: Swath bathymetry ping
+    :return: Fields of the sensor specific subrecord by name, or None if the sensor is
+             unknown
+    """
+    subrecord = sensor_specific(mb_ping)
+    if subrecord is None:
+        return None
+    return _decoder(type(subrecord))(subrecord)
+
+
+def read_sensor_columns(
+    gsf_file: GsfFile,
+    fields: Iterable[str],
+    record_numbers: Optional[Iterable[int]] = None,
+) -> SensorColumns:
+    """
+    Reads sensor specific fields of every swath bathymetry ping in the file, from the
+    beginning, in one pass through a single record buffer. Each ping's sensor_id
+    selects the member of its sensor_data union that the fields are read from, and
+    only the bytes spanning the fields are copied out of the buffer per ping; they
+    are converted to arrays once all pings have been read. Fields with the same name
+    but different types in the subrecords of different sensors, e.g. power and gain,
+    are held in a type that can represent each of them. Times are held as seconds
+    since the beginning of the epoch. The file is read as by
+    columnar.iter_ping_blocks().
+    :param gsf_file: File to read from
+    :param fields: Names of numeric or time fields of the sensor specific subrecords,
+                   e.g. power and gain of Reson pings
+    :param record_numbers: Record numbers of the pings to read, in order, by default
+                           all of them. May only be given when the file is open for
+                           direct access.
+    :return: SensorColumns
+    :raises ValueError: Raised if a field is not a numeric or time field of any
+                        sensor specific subrecord
+    :raises GsfException: Raised if anything went wrong
+    """
+    fields = tuple(fields)
+    dtypes = _column_dtypes(fields)
+
+    data_id = c_gsfDataID()
+    records = c_gsfRecords()
+    address = addressof(records.mb_ping.sensor_data)
+    mb_ping = records.mb_ping
+
+    read_record_numbers: List[int] = []
+    ping_times: List[float] = []
+    sensor_ids: List[int] = []
+    # Per sensor, the positions of its pings and the bytes copied from each
+    copied: Dict[int, Tuple[List[int], List[bytes]]] = {}
+    for record_number in _read_pings(gsf_file, data_id, records, record_numbers):
+        sensor_id = mb_ping.sensor_id
+        plan = _column_plan(sensor_id, fields)
+        if plan is not None:
+            positions, chunks = copied.setdefault(sensor_id, ([], []))
+            positions.append(len(sensor_ids))
+            chunks.append(string_at(address + plan.start, plan.dtype.itemsize))
+        read_record_numbers.append(record_number)
+        ping_times.append(timespec_to_seconds(mb_ping.ping_time))
+        sensor_ids.append(sensor_id)
+
+    columns = {
+        name: np.full(len(sensor_ids), np.nan if dtype.kind == "f" else 0, dtype=dtype)
+        for name, dtype in dtypes.items()
+    }
+    for sensor_id, (positions, chunks) in copied.items():
+        plan = _column_plan(sensor_id, fields)
+        values = np.frombuffer(b"".join(chunks), dtype=plan.dtype)
+        for name in plan.dtype.names:
+            if name in plan.times:
+                columns[name][positions] = (
+                    values[name]["tv_sec"] + values[name]["tv_nsec"] * 1e-9
+                )
+            else:
+                columns[name][positions] = values[name]
+
+    return SensorColumns(
+        np.array(read_record_numbers, dtype=np.int64),
+        np.array(ping_times, dtype=np.float64),
+        np.array(sensor_ids, dtype=np.int32),
+        columns,
+    )
+
+
+class _ColumnPlan(NamedTuple):
+    # Offset within the sensor_data union of the bytes spanning the fields
+    start: int
+    # Fields of the subrecord at their offsets from start
+    dtype: np.dtype
+    # Names of the fields that are times
+    times: Tuple[str, ...]
+
+
+def _subrecord_fields(structure_type: Type[Structure]) -> Dict[str, type]:
+    return {
+        name: field_type
+        for name, field_type in structure_type._fields_
+        if field_type is c_timespec
+        or (
+            not issubclass(field_type, (Structure, Array))
+            and np.dtype(field_type).kind in _COLUMN_KINDS
+        )
+    }
+
+
+def _member_type(member: str) -> Type[Structure]:
+    return dict(c_gsfSensorSpecific._fields_)[member]
+
+
+@lru_cache(maxsize=None)
+def _column_plan(sensor_id: int, fields: Tuple[str, ...]) -> Optional[_ColumnPlan]:
+    """
+    Lays out the fields of a sensor's subrecord, relative to the sensor_data union
+    """
+    member = sensor_specific_member(sensor_id)
+    if member is None:
+        return None
+    structure_type = _member_type(member)
+    available = _subrecord_fields(structure_type)
+    present = [name for name in fields if name in available]
+    if not present:
+        return None
+
+    # Members of the union all begin at its start
+    offsets = {name: getattr(structure_type, name).offset for name in present}
+    start = min(offsets.values())
+    end = max(offsets[name] + getattr(structure_type, name).size for name in present)
+    dtype = np.dtype(
+        {
+            "names": present,
+            "formats": [structured_dtype(available[name]) for name in present],
+            "offsets": [offsets[name] - start for name in present],
+            "itemsize": end - start,
+        }
+    )
+    times = tuple(name for name in present if available[name] is c_timespec)
+    return _ColumnPlan(start, dtype, times)
+
+
+def _column_dtypes(fields: Tuple[str, ...]) -> Dict[str, np.dtype]:
+    """
+    :return: Type of the column of each field, which can represent the field in the
+             subrecord of any sensor
+    :raises ValueError: Raised if a field is not a numeric or time field of any
+                        sensor specific subrecord
+    """
+    found: Dict[str, List[np.dtype]] = {name: [] for name in fields}
+    for member in set(SENSOR_SPECIFIC_MEMBERS.values()):
+        available = _subrecord_fields(_member_type(member))
+        for name in fields:
+            if name in available:
+                field_type = available[name]
+                found[name].append(
+                    np.dtype(np.float64)
+                    if field_type is c_timespec
+                    else np.dtype(field_type)
+                )
+
+    unknown = [name for name, dtypes in found.items() if not dtypes]
+    if unknown:
+        raise ValueError(f"Unknown sensor specific fields: {sorted(unknown)}")
+    return {name: np.result_type(*dtypes) for name, dtypes in found.items()}
+
+
+_Decoder = Callable[[Any], Any]
+
+
+@lru_cache(maxsize=None)
+def _decoder(structure_type: Type[Structure]) -> Callable[[Structure], Dict[str, Any]]:
+    """
+    Builds the decoder of a structure once, so that decoding many pings of a sensor
+    does not inspect its fields each time
+    """
+    field_decoders: List[Tuple[str, _Decoder]] = []
+    for name, field_type in structure_type._fields_:
+        if name.startswith(_SPARE_PREFIX):
+            continue
+        field_decoders.append((name, _field_decoder(field_type)))
+    counted_arrays = [
+        (name, count_field)
+        for (structure_name, name), count_field in _ARRAY_COUNTS.items()
+        if structure_name == structure_type.__name__
+    ]
+
+    def decode(structure: Structure) -> Dict[str, Any]:
+        values = {}
+        for name, decode_field in field_decoders:
+            values[name] = decode_field(getattr(structure, name))
+        # Filled lengths are applied once every field is decoded, as counts may follow
+        # the arrays they count
+        for name, count_field in counted_arrays:
+            values[name] = values[name][: max(values[count_field], 0)]
+        return values
+
+    return decode
+
+
+def _field_decoder(field_type: type) -> _Decoder:
+    if field_type is c_timespec:
+        return timespec_to_seconds
+    if issubclass(field_type, Structure):
+        return _decoder(field_type)
+    if issubclass(field_type, Array):
+        if field_type._type_ is c_char:
+            # ctypes already reads character arrays as bytes, up to the first NUL
+            return _decode_text
+        if issubclass(field_type._type_, Structure):
+            return _structure_array_decoder(field_type._type_)
+        return _decode_array
+    return _identity
+
+
+def _structure_array_decoder(element_type: Type[Structure]) -> _Decoder:
+    """
+    Builds the decoder of arrays of a structure into NumPy structured arrays, with
+    spare fields left out and times as seconds since the beginning of the epoch
+    """
+    dtype = structured_dtype(element_type)
+    times = [
+        name for name, field_type in element_type._fields_ if field_type is c_timespec
+    ]
+    decoded_dtype = np.dtype(
+        [
+            (name, np.float64 if name in times else dtype.fields[name][0])
+            for name in dtype.names
+            if not name.startswith(_SPARE_PREFIX)
+        ]
+    )
+
+    def decode(value: Array) -> np.ndarray:
+        array = as_structured(value)
+        decoded = np.empty(array.shape, dtype=decoded_dtype)
+        for name in decoded_dtype.names:
+            if name in times:
+                decoded[name] = array[name]["tv_sec"] + array[name]["tv_nsec"] * 1e-9
+            else:
+                decoded[name] = array[name]
+        return decoded
+
+    return decode
+
+
+def _decode_text(value: bytes) -> str:
+    return value.decode("ascii", errors="replace")
+
+
+def _decode_array(value: Array) -> np.ndarray:
+    return np.ctypeslib.as_array(value).copy()
+
+
+def _identity(value: Any) -> Any:
+    return value
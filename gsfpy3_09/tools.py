@@ -0,0 +1,444 @@
+"""Tools for restructuring GSF files"""
+import struct
+from functools import reduce
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from gsfpy3_09 import GsfFile, _read_into, open_gsf
+from gsfpy3_09.columnar import DEFAULT_BLOCK_SIZE, iter_ping_blocks
+from gsfpy3_09.enums import FileMode, RecordType, SeekOption
+from gsfpy3_09.gsfDataID import c_gsfDataID
+from gsfpy3_09.gsfRecords import c_gsfRecords
+from gsfpy3_09.lines import find_survey_lines
+from gsfpy3_09.summary import SUMMARY_BEAM_FIELDS, SwathSummary, summarise
+
+# Each record starts with the size of its data and its identifier, both big-endian,
+# followed by a checksum where flagged in the identifier and then the data, which is
+# padded to a multiple of four bytes
+_RECORD_HEADER = struct.Struct(">II")
+_CHECKSUM_FLAG = 0x80000000
+_CHECKSUM_SIZE = 4
+_RECORD_ID_MASK = 0x003FFFFF
+
+# Ping data starts with the ping time, in seconds and nanoseconds
+_PING_TIME = struct.Struct(">II")
+
+_COPY_BUFFER_SIZE = 1 << 20
+
+# Records written afresh to each new file rather than copied
+_NOT_COPIED = (
+    RecordType.GSF_RECORD_HEADER,
+    RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY,
+)
+
+# Records describing the state of the survey system, the most recent of which are
+# repeated at the start of each part of a split file so that every part is complete
+_STATE_RECORDS = (
+    RecordType.GSF_RECORD_PROCESSING_PARAMETERS,
+    RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE,
+)
+
+# Units in which split() may measure the length of each part
+SPLIT_BY = ("time", "records", "size")
+
+
+class _RawRecord(NamedTuple):
+    record_type: int
+    # Position of the record amongst those of its type, counting from 1
+    record_number: int
+    offset: int
+    length: int
+    # Seconds since the beginning of the epoch, for ping records
+    ping_time: Optional[float]
+
+
+def _scan_records(path: Union[str, Path]) -> List[_RawRecord]:
+    """
+    Reads the framing of every record in a file, without decoding the records
+    :raises ValueError: Raised if the file ends part way through a record
+    """
+    records = []
+    counts: Dict[int, int] = {}
+    offset = 0
+    with open(path, "rb") as gsf_file:
+        while True:
+            header = gsf_file.read(_RECORD_HEADER.size)
+            if not header:
+                break
+            if len(header) < _RECORD_HEADER.size:
+                raise ValueError(f"Truncated record at byte {offset} of {path}")
+
+            data_size, identifier = _RECORD_HEADER.unpack(header)
+            record_type = identifier & _RECORD_ID_MASK
+            data_offset = _RECORD_HEADER.size
+            if identifier & _CHECKSUM_FLAG:
+                data_offset += _CHECKSUM_SIZE
+
+            ping_time = None
+            if record_type == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING:
+                gsf_file.seek(offset + data_offset)
+                seconds, nanoseconds = _PING_TIME.unpack(gsf_file.read(_PING_TIME.size))
+                ping_time = seconds + nanoseconds * 1e-9
+
+            counts[record_type] = counts.get(record_type, 0) + 1
+            length = data_offset + data_size
+            records.append(
+                _RawRecord(record_type, counts[record_type], offset, length, ping_time)
+            )
+            offset += length
+            gsf_file.seek(offset)
+
+    if offset != Path(path).stat().st_size:
+        raise ValueError(f"Truncated record at byte {records[-1].offset} of {path}")
+    return records
+
+
+class _Segment(NamedTuple):
+    source_path: Path
+    records: Sequence[_RawRecord]
+
+
+class _RecordCopier:
+    """
+    Writes new GSF files from the records of others. Records are copied as raw
+    bytes, apart from the first ping of each run of records, which is decoded and
+    re-encoded through libgsf so that it carries the scale factors that the pings
+    after it may rely on. Only the most recent source is kept open, as libgsf allows
+    few files to be open at once. Sources are read sequentially, rewinding only when
+    a ping precedes the last one read, unless use_index is set, when pings are read
+    by record number through each source's index.
+    """
+
+    def __init__(self, use_index: bool = False):
+        self._use_index = use_index
+        self._source_path: Optional[Path] = None
+        self._source_file: Optional[GsfFile] = None
+        # Number of pings read from the source since it was opened or rewound
+        self._pings_read = 0
+        self._data_id = c_gsfDataID()
+        self._records = c_gsfRecords()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._source_file is not None:
+            self._source_file.close()
+
+    def write_file(
+        self, target_path: Path, summary: SwathSummary, segments: Iterable[_Segment]
+    ):
+        """
+        Creates a file holding a summary record, unless the summary is empty, followed
+        by the records of each segment other than header and summary records
+        """
+        with open_gsf(target_path, FileMode.GSF_CREATE) as target_file:
+            if not summary.is_empty:
+                summary_records = c_gsfRecords()
+                summary.to_summary(summary_records.summary)
+                target_file.write(
+                    summary_records, RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY
+                )
+
+        for source_path, records in segments:
+            records = [
+                record for record in records if record.record_type not in _NOT_COPIED
+            ]
+            first_ping = next(
+                (
+                    index
+                    for index, record in enumerate(records)
+                    if record.record_type == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+                ),
+                len(records),
+            )
+            _copy_raw(source_path, target_path, records[:first_ping])
+            if first_ping < len(records):
+                self._encode_ping(source_path, target_path, records[first_ping])
+                _copy_raw(source_path, target_path, records[first_ping + 1 :])
+
+    def _encode_ping(self, source_path: Path, target_path: Path, record: _RawRecord):
+        if source_path != self._source_path:
+            if self._source_file is not None:
+                self._source_file.close()
+                self._source_file = None
+            mode = (
+                FileMode.GSF_READONLY_INDEX
+                if self._use_index
+                else FileMode.GSF_READONLY
+            )
+            self._source_file = open_gsf(source_path, mode)
+            self._source_path = source_path
+            self._pings_read = 0
+
+        if self._use_index:
+            self._read_ping(record.record_number)
+        else:
+            if record.record_number <= self._pings_read:
+                self._source_file.seek(SeekOption.GSF_REWIND)
+                self._pings_read = 0
+            while self._pings_read < record.record_number:
+                self._read_ping()
+                self._pings_read += 1
+        with open_gsf(target_path, FileMode.GSF_APPEND) as target_file:
+            target_file.write(
+                self._records, RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+            )
+
+    def _read_ping(self, record_number: int = 0):
+        _read_into(
+            self._source_file,
+            RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING,
+            self._data_id,
+            self._records,
+            record_number,
+        )
+
+
+def _copy_raw(source_path: Path, target_path: Path, records: Sequence[_RawRecord]):
+    """
+    Appends the bytes of the given records to the target, copying runs of adjacent
+    records in one go through a single buffer
+    """
+    if not records:
+        return
+    buffer = bytearray(_COPY_BUFFER_SIZE)
+    with open(source_path, "rb") as source, open(target_path, "ab") as target:
+        start = end = records[0].offset
+        for record in records:
+            if record.offset != end:
+                _copy_range(source, target, start, end, buffer)
+                start = record.offset
+            end = record.offset + record.length
+        _copy_range(source, target, start, end, buffer)
+
+
+def _copy_range(source, target, start: int, end: int, buffer: bytearray):
+    source.seek(start)
+    view = memoryview(buffer)
+    remaining = end - start
+    while remaining > 0:
+        size = source.readinto(view[: min(remaining, len(buffer))])
+        target.write(view[:size])
+        remaining -= size
+
+
+def _part_path(
+    path: Union[str, Path], target_dir: Union[str, Path], number: int
+) -> Path:
+    path = Path(path)
+    return Path(target_dir) / f"{path.stem}_{number:03d}{path.suffix}"
+
+
+def _write_parts(
+    path: Union[str, Path],
+    target_dir: Union[str, Path],
+    records: Sequence[_RawRecord],
+    first_record_numbers: Sequence[int],
+    summaries: Sequence[SwathSummary],
+    use_index: bool = False,
+) -> List[Path]:
+    """
+    Writes the parts of a file, each starting at the ping with the given record
+    number. Records preceding the first ping of a part belong to the part before,
+    or to the first part, and each part after the first also starts with the most
+    recent state records.
+    """
+    Path(target_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(path)
+    ping_indices = [
+        index
+        for index, record in enumerate(records)
+        if record.record_type == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+    ]
+    starts = [0] + [ping_indices[number - 1] for number in first_record_numbers[1:]]
+    ends = starts[1:] + [len(records)]
+
+    part_paths = []
+    state: Dict[int, _RawRecord] = {}
+    with _RecordCopier(use_index) as copier:
+        for number, (start, end, summary) in enumerate(zip(starts, ends, summaries), 1):
+            part_path = _part_path(path, target_dir, number)
+            state_records = [
+                state[record_type]
+                for record_type in _STATE_RECORDS
+                if record_type in state
+            ]
+            copier.write_file(
+                part_path,
+                summary,
+                [_Segment(path, state_records), _Segment(path, records[start:end])],
+            )
+            state.update(
+                (record.record_type, record)
+                for record in records[start:end]
+                if record.record_type in _STATE_RECORDS
+            )
+            part_paths.append(part_path)
+    return part_paths
+
+
+def _summarise_parts(
+    path: Union[str, Path],
+    first_record_numbers: Sequence[int],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> List[SwathSummary]:
+    """
+    Summarises the pings of each part of a file in one pass over the file
+    """
+    summaries = [SwathSummary()] * len(first_record_numbers)
+    with open_gsf(path) as gsf_file:
+        for block in iter_ping_blocks(gsf_file, SUMMARY_BEAM_FIELDS, block_size):
+            parts = (
+                np.searchsorted(first_record_numbers, block.record_numbers, "right") - 1
+            )
+            for part in np.unique(parts):
+                summaries[part] = summaries[part].merge(
+                    SwathSummary.from_ping_block(block.select(parts == part))
+                )
+    return summaries
+
+
+def split(
+    path: Union[str, Path],
+    every: float,
+    by: str = "records",
+    target_dir: Optional[Union[str, Path]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_index: bool = False,
+) -> List[Path]:
+    """
+    Splits a GSF file into parts, each starting with a ping. Parts are named after
+    the file, numbered from 1, and each starts with a summary record of its own
+    pings, followed by the most recent processing parameters and sound velocity
+    profile records. Records are copied as raw bytes wherever possible.
+    :param path: Location of the GSF file to split
+    :param every: Length of each part: the time span of its pings in seconds when
+                  split by "time", its number of pings when split by "records" or
+                  its approximate size in bytes when split by "size". Parts split by
+                  time start at multiples of this span after the first ping.
+    :param by: One of SPLIT_BY
+    :param target_dir: Directory to write the parts to, created if necessary, by
+                       default that of the file
+    :param block_size: Maximum number of pings per block
+    :param use_index: Whether to find the pings to re-encode through the index of
+                      each source file, which libgsf builds alongside the file on
+                      first use and reuses after that, rather than by reading through
+                      the file
+    :return: Locations of the parts, in order
+    :raises ValueError: Raised if by is not one of SPLIT_BY, every is not positive or
+                        every is not a whole number of pings when split by "records"
+    :raises GsfException: Raised if anything went wrong
+    """
+    if by not in SPLIT_BY:
+        raise ValueError(f"Cannot split by {by}, only by one of {SPLIT_BY}")
+    if every <= 0:
+        raise ValueError("Length of each part must be positive")
+    if by == "records" and every != int(every):
+        raise ValueError("Parts split by records must be a whole number of pings")
+
+    records = _scan_records(path)
+    pings = [
+        record
+        for record in records
+        if record.record_type == RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+    ]
+    if by == "records":
+        starts = np.arange(0, len(pings), int(every))
+    elif by == "time":
+        times = np.array([ping.ping_time for ping in pings])
+        windows = np.floor((times - times[:1]) / every)
+        starts = np.flatnonzero(np.diff(windows, prepend=np.nan) != 0)
+    else:
+        offsets = np.array([ping.offset for ping in pings])
+        starts = []
+        if pings:
+            starts.append(0)
+            while True:
+                start = int(np.searchsorted(offsets, offsets[starts[-1]] + every))
+                if start >= len(pings):
+                    break
+                starts.append(start)
+    first_record_numbers = [int(start) + 1 for start in starts] or [1]
+
+    summaries = _summarise_parts(path, first_record_numbers, block_size)
+    return _write_parts(
+        path,
+        Path(path).parent if target_dir is None else target_dir,
+        records,
+        first_record_numbers,
+        summaries,
+        use_index,
+    )
+
+
+def split_survey_lines(
+    path: Union[str, Path],
+    target_dir: Union[str, Path],
+    azimuth_change: float,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_index: bool = False,
+) -> List[Path]:
+    """
+    Splits a GSF file into one file per survey line (see
+    lines.find_survey_lines()), in the same way as split().
+    :param path: Location of the GSF file to split
+    :param target_dir: Directory to write the parts to, created if necessary
+    :param azimuth_change: Heading change (degrees) beyond which a new line starts
+    :param block_size: Maximum number of pings per block
+    :param use_index: Whether to find the pings to re-encode through the index of
+                      each source file, which libgsf builds alongside the file on
+                      first use and reuses after that, rather than by reading through
+                      the file
+    :return: Locations of the parts, in line order
+    :raises GsfException: Raised if anything went wrong
+    """
+    with open_gsf(path) as gsf_file:
+        lines = find_survey_lines(gsf_file, azimuth_change, block_size)
+
+    return _write_parts(
+        path,
+        target_dir,
+        _scan_records(path),
+        [line.first_record_number for line in lines] or [1],
+        [line.summary for line in lines] or [SwathSummary()],
+        use_index,
+    )
+
+
+def merge(
+    paths: Iterable[Union[str, Path]],
+    target_path: Union[str, Path],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_index: bool = False,
+) -> SwathSummary:
+    """
+    Merges GSF files into one, holding a summary record of all their pings followed
+    by the records of each file in turn, other than their header and summary records.
+    Records are copied as raw bytes wherever possible.
+    :param paths: Locations of the GSF files to merge, in order
+    :param target_path: Location of the merged file to create
+    :param block_size: Maximum number of pings per block
+    :param use_index: Whether to find the pings to re-encode through the index of
+                      each source file, which libgsf builds alongside the file on
+                      first use and reuses after that, rather than by reading through
+                      the file
+    :return: Summary of the merged file
+    :raises GsfException: Raised if anything went wrong
+    """
+    paths = [Path(path) for path in paths]
+    summaries = []
+    for path in paths:
+        with open_gsf(path) as gsf_file:
+            summaries.append(summarise(gsf_file, block_size))
+    summary = reduce(SwathSummary.merge, summaries, SwathSummary())
+
+    with _RecordCopier(use_index) as copier:
+        copier.write_file(
+            Path(target_path),
+            summary,
+            (_Segment(path, _scan_records(path)) for path in paths),
+        )
+    return summary
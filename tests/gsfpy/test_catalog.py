@@ -0,0 +1,86 @@
+import os
+import sqlite3
+
+from assertpy import assert_that
+
+from gsfpy.catalog import CatalogUpdate, main, query_catalog, update_catalog
+
+
+def test_update_catalog_is_incremental(
+    gsf_test_data_03_08, gsf_test_data_03_09, tmp_path
+):
+    # Arrange
+    catalog = tmp_path.parent / f"{tmp_path.name}.sqlite"
+    (tmp_path / "not_gsf.gsf").write_bytes(b"Not a GSF file at all")
+
+    # Act
+    first = update_catalog(catalog, [tmp_path], max_workers=1)
+    second = update_catalog(catalog, [tmp_path], max_workers=1)
+    stat = gsf_test_data_03_09.path.stat()
+    os.utime(gsf_test_data_03_09.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    third = update_catalog(catalog, [tmp_path], max_workers=1)
+
+    # Assert
+    assert_that(first).is_equal_to(CatalogUpdate(added=2, failed=1))
+    assert_that(second).is_equal_to(CatalogUpdate(unchanged=3))
+    assert_that(third).is_equal_to(CatalogUpdate(updated=1, unchanged=2))
+
+    with sqlite3.connect(str(catalog)) as connection:
+        rows = connection.execute(
+            "SELECT gsf_version, number_pings, min_latitude, error FROM files "
+            "ORDER BY path"
+        ).fetchall()
+    assert_that([row[:2] for row in rows]).is_equal_to(
+        [("3.06", 8), ("3.09", 3), (None, None)]
+    )
+    assert_that(rows[0][2]).is_close_to(8.7115166, 1e-7)
+    assert_that(rows[2][3]).starts_with("ValueError")
+
+
+def test_update_catalog_prunes_removed_files(
+    gsf_test_data_03_08, gsf_test_data_03_09, tmp_path
+):
+    # Arrange
+    catalog = tmp_path.parent / f"{tmp_path.name}.sqlite"
+    update_catalog(catalog, [tmp_path], max_workers=1)
+    gsf_test_data_03_08.path.unlink()
+
+    # Act
+    update = update_catalog(catalog, [tmp_path], max_workers=1, prune=True)
+
+    # Assert
+    assert_that(update).is_equal_to(CatalogUpdate(unchanged=1, removed=1))
+    assert_that(query_catalog(catalog)).is_equal_to([str(gsf_test_data_03_09.path)])
+
+
+def test_query_catalog(gsf_test_data_03_08, gsf_test_data_03_09, tmp_path):
+    # Arrange
+    catalog = tmp_path.parent / f"{tmp_path.name}.sqlite"
+    update_catalog(catalog, [tmp_path], max_workers=1)
+
+    # Act
+    in_2016 = query_catalog(catalog, start_time=1451606400.0, end_time=1483228800.0)
+    near_caribbean = query_catalog(catalog, bounds=(10.0, -70.0, 20.0, -60.0))
+    nowhere = query_catalog(catalog, bounds=(-10.0, 0.0, -5.0, 5.0))
+
+    # Assert
+    assert_that(in_2016).is_equal_to([str(gsf_test_data_03_08.path)])
+    assert_that(near_caribbean).is_equal_to([str(gsf_test_data_03_09.path)])
+    assert_that(nowhere).is_empty()
+
+
+def test_main(gsf_test_data_03_08, gsf_test_data_03_09, tmp_path, capsys):
+    # Arrange
+    catalog = str(tmp_path.parent / f"{tmp_path.name}.sqlite")
+
+    # Act
+    update_status = main(["update", catalog, str(tmp_path), "--workers", "1"])
+    update_output = capsys.readouterr().out
+    query_status = main(["query", catalog, "--start", "2018-01-01"])
+    query_output = capsys.readouterr().out
+
+    # Assert
+    assert_that(update_status).is_zero()
+    assert_that(update_output).starts_with("added 2, updated 0, unchanged 0")
+    assert_that(query_status).is_zero()
+    assert_that(query_output.splitlines()).is_equal_to([str(gsf_test_data_03_09.path)])
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Set
+
+import pytest
+from assertpy import assert_that
+
+_ROOT = Path(__file__).parent.parent.parent
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="Imports are only deferred from Python 3.7"
+)
+
+
+def _imported_modules(statements: str) -> Set[str]:
+    """
+    Runs statements in a new interpreter
+    :return: Names of the modules they imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statements],
+        cwd=_ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    # Lines are of the form "import time: <self> | <cumulative> | <indented module>"
+    return {line.split("|")[2].strip() for line in completed.stderr.splitlines()[1:]}
+
+
+def test_import_gsfpy_defers_versioned_package():
+    # Act
+    modules = _imported_modules("import gsfpy")
+
+    # Assert
+    assert_that(modules).contains("gsfpy")
+    assert_that(modules).does_not_contain("gsfpy3_08", "gsfpy3_09")
+
+
+def test_import_gsfpy_submodule_defers_records():
+    # Act
+    modules = _imported_modules("from gsfpy.enums import RecordType")
+
+    # Assert
+    assert_that(modules).contains("gsfpy.enums", "gsfpy3_08.enums")
+    assert_that(modules).does_not_contain("gsfpy3_08.gsfRecords")
+
+
+def test_gsfpy_members_are_mirrored_on_first_use():
+    # Act
+    modules = _imported_modules(
+        "import gsfpy\n"
+        "import gsfpy3_08\n"
+        "assert gsfpy.open_gsf is gsfpy3_08.open_gsf\n"
+        "assert gsfpy.gsfRecords.c_gsfRecords is gsfpy3_08.c_gsfRecords\n"
+        "namespace = {}\n"
+        "exec('from gsfpy import *', namespace)\n"
+        "assert namespace['GsfFile'] is gsfpy3_08.GsfFile"
+    )
+
+    # Assert
+    assert_that(modules).contains("gsfpy3_08.gsfRecords")
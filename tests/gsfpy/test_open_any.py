@@ -0,0 +1,73 @@
+import pytest
+from assertpy import assert_that
+
+import gsfpy
+import gsfpy3_08
+import gsfpy3_09
+from gsfpy3_09.enums import FileMode, RecordType
+
+
+def test_read_gsf_version(gsf_test_data_03_08, gsf_test_data_03_09):
+    # Act
+    versions = [
+        gsfpy.read_gsf_version(gsf_test_data_03_08.path),
+        gsfpy.read_gsf_version(gsf_test_data_03_09.path),
+    ]
+
+    # Assert
+    assert_that(versions).is_equal_to([(3, 6), (3, 9)])
+
+
+def test_read_gsf_version_fails_for_other_files(tmp_path):
+    # Arrange
+    path = tmp_path / "not_gsf.gsf"
+    path.write_bytes(b"Not a GSF file at all")
+
+    # Assert
+    assert_that(gsfpy.read_gsf_version).raises(ValueError).when_called_with(path)
+
+
+@pytest.mark.parametrize(
+    "gsf_version, package_version",
+    [((3, 6), "3_08"), ((3, 8), "3_08"), ((3, 9), "3_09"), ((3, 10), "3_09")],
+)
+def test_get_gsf_package_version(gsf_version, package_version):
+    assert_that(gsfpy.get_gsf_package_version(gsf_version)).is_equal_to(package_version)
+
+
+def test_open_any_mixed_versions(gsf_test_data_03_08, gsf_test_data_03_09):
+    # Act
+    number_pings = []
+    for path, package in [
+        (gsf_test_data_03_08.path, gsfpy3_08),
+        (gsf_test_data_03_09.path, gsfpy3_09),
+        (gsf_test_data_03_08.path, gsfpy3_08),
+    ]:
+        with gsfpy.open_any(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+            assert_that(gsf_file).is_instance_of(package.GsfFile)
+            number_pings.append(
+                gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            )
+
+    # Assert
+    assert_that(number_pings).is_equal_to([8, 3, 8])
+
+
+def test_open_any_fails_to_create(gsf_test_data_03_09):
+    assert_that(gsfpy.open_any).raises(ValueError).when_called_with(
+        gsf_test_data_03_09.path, FileMode.GSF_CREATE
+    )
+
+
+def test_inspect_mixed_versions(gsf_test_data_03_08, gsf_test_data_03_09):
+    # Act
+    inventories = [
+        gsfpy.inspect(gsf_test_data_03_08.path),
+        gsfpy.inspect(gsf_test_data_03_09.path),
+    ]
+
+    # Assert
+    assert_that([inventory.number_pings for inventory in inventories]).is_equal_to(
+        [8, 3]
+    )
+    assert_that(inventories[1]).is_instance_of(gsfpy3_09.inventory.FileInventory)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import arrow, open_gsf
+from gsfpy3_08.arrow import iter_record_batches, ping_schema, write_parquet
+from gsfpy3_08.columnar import iter_ping_blocks
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_requires_pyarrow(monkeypatch):
+    monkeypatch.setattr(arrow, "pa", None)
+
+    assert_that(ping_schema).raises(ImportError).when_called_with(["depth"])
+
+
+def test_iter_record_batches(gsf_test_data_03_08: GsfDatafile):
+    pa = pytest.importorskip("pyarrow")
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        (block,) = iter_ping_blocks(gsf_file, ["depth"])
+        batches = list(iter_record_batches(gsf_file, ["depth"], 5))
+
+    assert_that([batch.num_rows for batch in batches]).is_equal_to([5, 3])
+    table = pa.Table.from_batches(batches)
+    assert_that(table.schema.field("ping_time").type).is_equal_to(
+        pa.timestamp("us", tz="UTC")
+    )
+    depths = table.column("depth").to_pylist()
+    assert_that([len(depth) for depth in depths]).is_equal_to(
+        block.number_beams.tolist()
+    )
+    assert_that(np.array_equal(depths[0], block["depth"][0])).is_true()
+
+
+def test_iter_record_batches_fixed_size(gsf_test_data_03_08: GsfDatafile):
+    pa = pytest.importorskip("pyarrow")
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        (batch,) = iter_record_batches(gsf_file, ["beam_flags"], fixed_size_beams=500)
+        assert_that(list).raises(ValueError).when_called_with(
+            iter_record_batches(gsf_file, ["beam_flags"], fixed_size_beams=100)
+        )
+
+    assert_that(batch.schema.field("beam_flags").type).is_equal_to(
+        pa.list_(pa.uint8(), 500)
+    )
+
+
+def test_write_parquet(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    target_path = tmp_path / "pings.parquet"
+
+    number_pings = write_parquet(
+        gsf_test_data_03_08.path, target_path, ["depth", "beam_flags"], 3
+    )
+
+    parquet_file = pq.ParquetFile(target_path)
+    assert_that(number_pings).is_equal_to(8)
+    assert_that(parquet_file.metadata.num_row_groups).is_equal_to(3)
+    assert_that(parquet_file.schema_arrow).is_equal_to(
+        ping_schema(["depth", "beam_flags"])
+    )
+    assert_that(
+        parquet_file.read(columns=["record_number"]).column(0).to_pylist()
+    ).is_equal_to(list(range(1, 9)))
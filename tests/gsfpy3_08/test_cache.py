@@ -0,0 +1,73 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.cache import PingCache, materialise
+from gsfpy3_08.columnar import iter_ping_blocks
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_materialise(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    store_dir = tmp_path / "cache"
+
+    cache = materialise(gsf_test_data_03_08.path, store_dir, ["depth", "beam_flags"], 3)
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        (expected,) = iter_ping_blocks(gsf_file, ["depth", "beam_flags"])
+    blocks = list(PingCache(store_dir).iter_ping_blocks(["depth"]))
+    assert_that(cache.number_pings).is_equal_to(8)
+    assert_that([block.number_pings for block in blocks]).is_equal_to([3, 3, 2])
+    assert_that(blocks[0]).does_not_contain("beam_flags")
+    assert_that(
+        np.array_equal(
+            np.concatenate([block.ping_time for block in blocks]), expected.ping_time
+        )
+    ).is_true()
+    assert_that(
+        np.array_equal(
+            np.concatenate([block["depth"] for block in blocks]),
+            expected["depth"],
+            equal_nan=True,
+        )
+    ).is_true()
+
+
+def test_materialise_reuses_current_cache(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    path = tmp_path / "survey.gsf"
+    shutil.copy(gsf_test_data_03_08.path, path)
+    store_dir = tmp_path / "cache"
+    materialise(path, store_dir, ["depth"])
+    manifest_mtime_ns = (store_dir / "cache.json").stat().st_mtime_ns
+
+    assert_that(materialise(path, store_dir, ["depth"]).is_current()).is_true()
+    assert_that((store_dir / "cache.json").stat().st_mtime_ns).is_equal_to(
+        manifest_mtime_ns
+    )
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert_that(PingCache(store_dir).is_current()).is_false()
+    assert_that(materialise(path, store_dir, ["depth"]).is_current()).is_true()
+
+
+def test_materialise_adds_missing_fields(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    materialise(gsf_test_data_03_08.path, tmp_path, ["depth"])
+
+    cache = materialise(gsf_test_data_03_08.path, tmp_path, ["depth", "beam_flags"])
+
+    assert_that(cache.beam_fields).is_equal_to(["depth", "beam_flags"])
+
+
+def test_iter_ping_blocks_uncached_field(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    cache = materialise(gsf_test_data_03_08.path, tmp_path, ["depth"])
+
+    with pytest.raises(ValueError):
+        list(cache.iter_ping_blocks(["beam_flags"]))
+
+
+def test_no_cache(tmp_path):
+    assert_that(PingCache).raises(FileNotFoundError).when_called_with(tmp_path)
@@ -0,0 +1,129 @@
+from ctypes import c_double
+from threading import Event, Thread
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.columnar import (
+    BEAM_ARRAY_SUBRECORDS,
+    iter_ping_blocks,
+    set_beam_array,
+    write_beam_columns,
+)
+from gsfpy3_08.enums import FileMode, RecordType, SeekOption
+from gsfpy3_08.gsfSwathBathyPing import c_gsfSwathBathyPing
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_iter_ping_blocks(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        blocks = list(iter_ping_blocks(gsf_file, ["depth", "beam_flags"], block_size=3))
+        _, first_ping = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+    assert_that([block.number_pings for block in blocks]).is_equal_to([3, 3, 2])
+    assert_that(blocks[2].record_numbers.tolist()).is_equal_to([7, 8])
+    assert_that(blocks[0]["depth"].shape).is_equal_to(
+        (3, gsf_test_data_03_08.num_beams)
+    )
+    assert_that(blocks[0]["beam_flags"].dtype).is_equal_to(np.uint8)
+    assert_that(blocks[0].fields).does_not_contain("travel_time")
+    assert_that(blocks[0].beam_mask.all()).is_true()
+    assert_that(blocks[0]["depth"][0].tolist()).is_equal_to(
+        first_ping.mb_ping.depth[: gsf_test_data_03_08.num_beams]
+    )
+    assert_that(blocks[0].ping_time[0]).is_close_to(1458759353.856, 0.001)
+
+
+def test_iter_ping_blocks_while_another_thread_seeks(
+    gsf_test_data_03_08: GsfDatafile,
+):
+    stop = Event()
+
+    def seek_to_end(gsf_file):
+        while not stop.is_set():
+            gsf_file.seek(SeekOption.GSF_END_OF_FILE)
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        seeker = Thread(target=seek_to_end, args=(gsf_file,))
+        seeker.start()
+        try:
+            number_pings = [
+                sum(block.number_pings for block in iter_ping_blocks(gsf_file, [], 1))
+                for _ in range(20)
+            ]
+        finally:
+            stop.set()
+            seeker.join()
+
+    # Seeks wait until each pass over the file is complete, rather than cutting it short
+    assert_that(set(number_pings)).is_equal_to({8})
+
+
+def test_iter_ping_blocks_closed_early_rewinds_and_releases_file(
+    gsf_test_data_03_08: GsfDatafile,
+):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        blocks = iter_ping_blocks(gsf_file, ["depth"], block_size=3)
+        first_block = next(blocks)
+        blocks.close()
+        _, first_ping = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        seeker = Thread(target=gsf_file.seek, args=(SeekOption.GSF_REWIND,))
+        seeker.start()
+        seeker.join(timeout=5)
+
+    assert_that(seeker.is_alive()).is_false()
+    assert_that(first_ping.mb_ping.depth[0]).is_equal_to(first_block["depth"][0][0])
+
+
+def test_iter_ping_blocks_indexed(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        (sequential,) = iter_ping_blocks(gsf_file, ["depth"])
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        (indexed,) = iter_ping_blocks(gsf_file, ["depth"])
+
+    assert_that(indexed.record_numbers.tolist()).is_equal_to(list(range(1, 9)))
+    assert_that(np.array_equal(indexed["depth"], sequential["depth"])).is_true()
+
+
+def test_iter_ping_blocks_by_record_number(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        (all_pings,) = iter_ping_blocks(gsf_file, ["depth"])
+        (some_pings,) = iter_ping_blocks(gsf_file, ["depth"], record_numbers=[2, 5])
+
+    assert_that(some_pings.record_numbers.tolist()).is_equal_to([2, 5])
+    assert_that(
+        np.array_equal(some_pings["depth"], all_pings["depth"][[1, 4]])
+    ).is_true()
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        assert_that(list).raises(ValueError).when_called_with(
+            iter_ping_blocks(gsf_file, ["depth"], record_numbers=[2])
+        )
+
+
+def test_write_beam_columns(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        (block,) = iter_ping_blocks(gsf_file, ["depth"])
+        depth = block["depth"] + 1.0
+        depth[0, 0] = np.nan
+        write_beam_columns(gsf_file, block.record_numbers, {"depth": depth})
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        (updated,) = iter_ping_blocks(gsf_file, ["depth"])
+
+    assert_that(updated["depth"][0, 0]).is_equal_to(block["depth"][0, 0])
+    assert_that(np.allclose(updated["depth"][:, 1:], depth[:, 1:], atol=0.01)).is_true()
+
+
+def test_set_beam_array_allocates_array_and_scale_factor():
+    mb_ping = c_gsfSwathBathyPing()
+    mb_ping.number_beams = 3
+    mb_ping.depth = (c_double * 3)(10.0, 20.0, 30.0)
+
+    set_beam_array(mb_ping, "nominal_depth", np.array([9.9, 19.9, 29.9]))
+
+    subrecord_id = BEAM_ARRAY_SUBRECORDS["nominal_depth"]
+    assert_that(mb_ping.nominal_depth[:3]).is_equal_to([9.9, 19.9, 29.9])
+    assert_that(
+        mb_ping.scaleFactors.scaleTable[subrecord_id - 1].multiplier
+    ).is_greater_than(0)
@@ -0,0 +1,114 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08.grid import Grid, GridSpec, grid_file, grid_files
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+_SPEC = GridSpec(
+    min_latitude=0.0,
+    min_longitude=0.0,
+    cell_size=1.0,
+    number_rows=3,
+    number_columns=5,
+    tile_size=2,
+)
+
+# Extents of the footprints of the pings in the test file
+_TEST_FILE_SPEC = GridSpec.from_bounds(
+    8.6884, 167.4417, 8.7325, 167.5116, cell_size=0.001, tile_size=16
+)
+
+
+def test_grid_spec_from_bounds():
+    spec = GridSpec.from_bounds(0.0, 10.0, 1.0, 10.5, cell_size=0.25)
+
+    assert_that(spec.number_rows).is_equal_to(5)
+    assert_that(spec.number_columns).is_equal_to(3)
+    assert_that(spec.number_tile_columns).is_equal_to(1)
+
+
+def test_add_soundings(tmp_path):
+    grid = Grid(tmp_path / "grid", _SPEC)
+
+    added = grid.add_soundings(
+        latitude=[0.5, 0.5, 0.5, 2.5, 2.5, 9.0, 0.5],
+        longitude=[0.5, 0.5, 0.5, 4.5, 4.5, 0.0, 0.5],
+        depth=[10.0, 20.0, 30.0, 5.0, 7.0, 1.0, np.nan],
+        vertical_error=[1.96, 1.96, 0.98, 1.96, 0.0, 1.96, 1.96],
+    )
+
+    assert_that(added).is_equal_to(5)
+    assert_that(grid.tile_keys()).is_equal_to([(0, 0), (1, 2)])
+    count = grid.surface("count")
+    assert_that(count.shape).is_equal_to((3, 5))
+    assert_that(int(count.sum())).is_equal_to(5)
+    assert_that(grid.surface("mean")[0, 0]).is_equal_to(20.0)
+    assert_that(grid.surface("min")[0, 0]).is_equal_to(10.0)
+    assert_that(grid.surface("max")[2, 4]).is_equal_to(7.0)
+    assert_that(grid.surface("std")[0, 0]).is_close_to(np.std([10, 20, 30]), 1e-12)
+    # Weights of 1, 1 and 4, and no weight without an uncertainty
+    assert_that(grid.surface("weighted_mean")[0, 0]).is_close_to(25.0, 1e-12)
+    assert_that(grid.surface("weighted_mean")[2, 4]).is_equal_to(5.0)
+    assert_that(np.isnan(grid.surface("mean")[1, 1])).is_true()
+
+
+def test_merge(tmp_path):
+    rng = np.random.default_rng(0)
+    latitude = rng.uniform(0.0, 3.0, 1000)
+    longitude = rng.uniform(0.0, 5.0, 1000)
+    depth = rng.normal(100.0, 5.0, 1000)
+
+    whole = Grid(tmp_path / "whole", _SPEC)
+    whole.add_soundings(latitude, longitude, depth)
+    merged = Grid(tmp_path / "merged", _SPEC)
+    for part in np.array_split(np.arange(1000), 3):
+        partial = Grid(tmp_path / f"part{part[0]}", _SPEC)
+        partial.add_soundings(latitude[part], longitude[part], depth[part])
+        merged.merge(partial)
+
+    for statistic in ("count", "mean", "min", "max", "std"):
+        assert_that(
+            np.allclose(merged.surface(statistic), whole.surface(statistic))
+        ).is_true()
+
+
+def test_grid_layout_mismatch(tmp_path):
+    Grid(tmp_path / "grid", _SPEC)
+
+    assert_that(Grid(tmp_path / "grid").spec).is_equal_to(_SPEC)
+    assert_that(Grid).raises(ValueError).when_called_with(
+        tmp_path / "grid", _SPEC._replace(cell_size=0.5)
+    )
+    assert_that(Grid).raises(FileNotFoundError).when_called_with(tmp_path / "none")
+
+
+def test_grid_file(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    grid = Grid(tmp_path / "grid", _TEST_FILE_SPEC)
+
+    added = grid_file(gsf_test_data_03_08.path, grid, block_size=3)
+
+    # 8 pings of 432 beams, of which 1087 are flagged
+    assert_that(added).is_equal_to(8 * 432 - 1087)
+    assert_that(int(grid.surface("count").sum())).is_equal_to(added)
+    assert_that(float(np.nanmin(grid.surface("min")))).is_close_to(3862.43, 0.01)
+    assert_that(float(np.nanmax(grid.surface("max")))).is_close_to(4145.0, 0.01)
+
+
+def test_grid_files(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    single = Grid(tmp_path / "single", _TEST_FILE_SPEC)
+    grid_file(gsf_test_data_03_08.path, single)
+
+    added = grid_files(
+        [gsf_test_data_03_08.path],
+        tmp_path / "grid",
+        _TEST_FILE_SPEC,
+        max_workers=2,
+    )
+
+    assert_that(added).is_equal_to({str(gsf_test_data_03_08.path): 2369})
+    grid = Grid(tmp_path / "grid")
+    assert_that(grid.tile_keys()).is_equal_to(single.tile_keys())
+    assert_that(
+        np.array_equal(grid.surface("count"), single.surface("count"))
+    ).is_true()
+    assert_that(list((tmp_path / "grid").glob("tmp*"))).is_empty()
@@ -4,8 +4,9 @@ from os import path
 
 from assertpy import assert_that
 
-from gsfpy3_08 import GsfException, open_gsf
-from gsfpy3_08.enums import FileMode, RecordType, SeekOption
+from gsfpy3_08 import GsfEndOfFile, GsfException, GsfTooManyOpenFiles, open_gsf
+from gsfpy3_08.constants import GSF_MAX_OPEN_FILES
+from gsfpy3_08.enums import FileMode, ReadStatus, RecordType, SeekOption
 from gsfpy3_08.gsfRecords import c_gsfRecords
 
 
@@ -173,6 +174,73 @@ def test_get_number_records_failure(gsf_test_data_03_08):
         ).is_equal_to("[-3] GSF Error illegal access mode")
 
 
+def test_try_read_success(gsf_test_data_03_08):
+    """
+    Read every record of the test GSF file into the same buffers without raising an
+    exception at the end of the file.
+    """
+    # Act
+    number_records = 0
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        result = gsf_file.try_read()
+        while result.status == ReadStatus.OK:
+            number_records += 1
+            result = gsf_file.try_read(data_id=result.data_id, records=result.records)
+
+    # Assert
+    assert_that(number_records).is_equal_to(125)
+    assert_that(result.status).is_equal_to(ReadStatus.END_OF_FILE)
+    assert_that(result.error_code).is_equal_to(-23)
+    assert_that(result.exception()).is_instance_of(GsfEndOfFile)
+
+
+def test_try_read_failure(gsf_test_data_03_08):
+    """
+    Read the next ping of the test GSF file in GSF_READONLY_INDEX mode, which needs a
+    record number, and verify the error is reported rather than raised.
+    """
+    # Act
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        result = gsf_file.try_read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+    # Assert
+    assert_that(result.status).is_equal_to(ReadStatus.ERROR)
+    assert_that(result.error_code).is_equal_to(-43)
+    assert_that(type(result.exception())).is_equal_to(GsfException)
+
+
+def test_read_end_of_file_raises_GsfEndOfFile(gsf_test_data_03_08):
+    """
+    Read beyond the end of the test GSF file and verify the exception.
+    """
+    # Act
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        gsf_file.seek(SeekOption.GSF_END_OF_FILE)
+        assert_that(gsf_file.read).raises(GsfEndOfFile).when_called_with().is_equal_to(
+            "[-23] GSF End of File Encountered"
+        )
+
+
+def test_open_gsf_raises_GsfTooManyOpenFiles(gsf_test_data_03_08):
+    """
+    Open the test GSF file more times than libgsf allows and verify the exception.
+    """
+    # Act
+    gsf_files = []
+    try:
+        for _ in range(GSF_MAX_OPEN_FILES + 1):
+            gsf_files.append(open_gsf(gsf_test_data_03_08.path))
+    except GsfException as ex:
+        exception = ex
+    finally:
+        for gsf_file in gsf_files:
+            gsf_file.close()
+
+    # Assert
+    assert_that(exception).is_instance_of(GsfTooManyOpenFiles)
+    assert_that(exception.error_code).is_equal_to(-11)
+
+
 def _new_comment(comment: bytes) -> c_gsfRecords:
     record = c_gsfRecords()
     record.comment.comment_time.tvsec = c_int(1000)
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+from assertpy import assert_that
+
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+_ROOT = Path(__file__).parent.parent.parent
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="Imports are only deferred from Python 3.7"
+)
+
+
+def _import_times(statements: str) -> Dict[str, int]:
+    """
+    Runs statements in a new interpreter, timing the imports they make
+    :return: Cumulative time in microseconds taken to import each module imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statements],
+        cwd=_ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    # Lines are of the form "import time: <self> | <cumulative> | <indented module>"
+    times = {}
+    for line in completed.stderr.splitlines()[1:]:
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_defers_records_and_libgsf():
+    # Act
+    times = _import_times(
+        "import gsfpy3_08.bindings as bindings\n"
+        "assert isinstance(bindings._libgsf, bindings._LibGsf)"
+    )
+
+    # Assert
+    assert_that(times).contains_key("gsfpy3_08", "gsfpy3_08.enums")
+    assert_that(times).does_not_contain_key(
+        "gsfpy3_08.gsfRecords", "gsfpy3_08.gsfSensorSpecific"
+    )
+
+
+def test_read_imports_records_and_loads_libgsf(gsf_test_data_03_08: GsfDatafile):
+    # Act
+    times = _import_times(
+        "import gsfpy3_08\n"
+        f"with gsfpy3_08.open_gsf({str(gsf_test_data_03_08.path)!r}) as gsf_file:\n"
+        "    gsf_file.read()\n"
+        "assert not isinstance(gsfpy3_08.bindings._libgsf, gsfpy3_08.bindings._LibGsf)"
+    )
+
+    # Assert
+    assert_that(times).contains_key("gsfpy3_08.gsfRecords")
+
+
+def test_c_gsfRecords_is_imported_on_first_use():
+    # Act
+    times = _import_times(
+        "import gsfpy3_08\n"
+        "from gsfpy3_08.gsfRecords import c_gsfRecords\n"
+        "assert gsfpy3_08.c_gsfRecords is c_gsfRecords\n"
+        "assert 'c_gsfRecords' in dir(gsfpy3_08)"
+    )
+
+    # Assert
+    assert_that(times).contains_key("gsfpy3_08.gsfRecords")
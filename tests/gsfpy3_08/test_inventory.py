@@ -0,0 +1,45 @@
+from assertpy import assert_that
+
+from gsfpy3_08.enums import RecordType, ScaledSwathBathySubRecord
+from gsfpy3_08.inventory import inspect
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_inspect(gsf_test_data_03_08: GsfDatafile):
+    inventory = inspect(gsf_test_data_03_08.path)
+
+    assert_that(inventory.record_counts).is_equal_to(
+        {
+            RecordType.GSF_RECORD_HEADER: 1,
+            RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING: 8,
+            RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE: 1,
+            RecordType.GSF_RECORD_PROCESSING_PARAMETERS: 1,
+            RecordType.GSF_RECORD_COMMENT: 2,
+            RecordType.GSF_RECORD_HISTORY: 1,
+            RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY: 1,
+            RecordType.GSF_RECORD_ATTITUDE: 111,
+        }
+    )
+    assert_that(inventory.start_time).is_close_to(1458759353.856, 0.001)
+    assert_that(inventory.end_time).is_close_to(1458759418.333, 0.001)
+    assert_that(inventory.min_latitude).is_equal_to(8.7115166)
+    assert_that(inventory.max_latitude).is_equal_to(8.713204)
+    assert_that(inventory.min_longitude).is_equal_to(167.4759172)
+    assert_that(inventory.max_longitude).is_equal_to(167.4765838)
+    assert_that(inventory.sensor_ids).is_equal_to([131])
+    assert_that(inventory.number_beams).is_equal_to({432: 8})
+    assert_that(inventory.subrecords).contains(
+        ScaledSwathBathySubRecord.GSF_SWATH_BATHY_SUBRECORD_DEPTH_ARRAY,
+        ScaledSwathBathySubRecord.GSF_SWATH_BATHY_SUBRECORD_BEAM_ANGLE_FORWARD_ARRAY,
+    )
+    assert_that(inventory.subrecords).does_not_contain(
+        ScaledSwathBathySubRecord.GSF_SWATH_BATHY_SUBRECORD_ECHO_WIDTH_ARRAY
+    )
+    # The writer recorded scale factors for arrays the pings do not hold
+    assert_that(inventory.scaled_subrecords).is_length(27)
+
+
+def test_inspect_with_index(gsf_test_data_03_08: GsfDatafile):
+    assert_that(inspect(gsf_test_data_03_08.path, use_index=True)).is_equal_to(
+        inspect(gsf_test_data_03_08.path)
+    )
@@ -12,9 +12,11 @@ def test_libgsf_load_fails_with_incorrect_path(mocker):
         expected_errmsg_start = "Cannot load shared library"
 
         # Act
-        import gsfpy3_08  # noqa
+        import gsfpy3_08.bindings  # noqa
 
-        reload(gsfpy3_08)
+        # libgsf is loaded when first called rather than when imported
+        reload(gsfpy3_08.bindings)
+        gsfpy3_08.bindings.gsfIntError()
 
     # Assert
     assert_that(str(context.value)).starts_with(expected_errmsg_start)
@@ -17,9 +17,11 @@ def test_libgsf_load_succeeds_with_valid_path(mocker):
         )
 
         # Act
-        import gsfpy3_08  # noqa
+        import gsfpy3_08.bindings  # noqa
 
-        reload(gsfpy3_08)
+        # libgsf is loaded when first called rather than when imported
+        reload(gsfpy3_08.bindings)
+        gsfpy3_08.bindings.gsfIntError()
 
     except Exception:
         # Assert
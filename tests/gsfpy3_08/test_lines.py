@@ -0,0 +1,66 @@
+from ctypes import byref, c_double
+from functools import reduce
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.bindings import gsfIsNewSurveyLine
+from gsfpy3_08.enums import RecordType
+from gsfpy3_08.lines import find_survey_lines, is_new_line, new_line_indices
+from gsfpy3_08.summary import SwathSummary, summarise
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_is_new_line():
+    new_line = is_new_line(np.array([10.0, 30.0, 350.0, 345.0, 200.0]), 0.0, 20.0)
+
+    assert_that(new_line.tolist()).is_equal_to([False, True, False, True, True])
+
+
+def test_new_line_indices():
+    heading = [0.0] * 10 + [5.0] * 10 + [30.0] * 30 + [200.0] * 40 + [190.0] * 10
+    heading += [350.0] * 5 + [10.0] * 5
+
+    assert_that(new_line_indices(heading, 10.0).tolist()).is_equal_to(
+        [20, 50, 100, 105]
+    )
+    assert_that(new_line_indices(heading, 10.0, 180.0).tolist()).is_equal_to(
+        [0, 20, 50, 100, 105]
+    )
+    assert_that(new_line_indices([], 10.0).tolist()).is_empty()
+
+
+def test_new_line_indices_matches_libgsf(gsf_test_data_03_08: GsfDatafile):
+    rng = np.random.default_rng(0)
+    heading = np.cumsum(rng.normal(0.0, 3.0, 1000)) % 360.0
+    last_heading = c_double(heading[0])
+    expected = []
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        # libgsf only detects new lines once a ping has been read
+        _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        for index, value in enumerate(heading):
+            records.mb_ping.heading = value
+            if gsfIsNewSurveyLine(
+                gsf_file.handle, byref(records), 20.0, byref(last_heading)
+            ):
+                expected.append(index)
+
+    assert_that(expected).is_not_empty()
+    assert_that(new_line_indices(heading, 20.0).tolist()).is_equal_to(expected)
+
+
+def test_find_survey_lines(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        lines = find_survey_lines(gsf_file, 20.0, block_size=3)
+        summary = summarise(gsf_file)
+
+    assert_that(
+        [(line.first_record_number, line.last_record_number) for line in lines]
+    ).is_equal_to([(1, 1), (2, 3), (4, 6), (7, 8)])
+    assert_that([line.number_pings for line in lines]).is_equal_to([1, 2, 3, 2])
+    assert_that(lines[0].summary.start_time).is_equal_to(summary.start_time)
+    assert_that(lines[3].summary.end_time).is_equal_to(summary.end_time)
+    merged = reduce(SwathSummary.merge, (line.summary for line in lines))
+    assert_that(merged).is_equal_to(summary)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.enums import RecordType, SeekOption
+from gsfpy3_08.params import UNKNOWN_PARAM_VALUE, MBParams
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def _read_mb_params(gsf_file) -> MBParams:
+    _, records = gsf_file.read(RecordType.GSF_RECORD_PROCESSING_PARAMETERS)
+    return MBParams.from_records(records)
+
+
+def test_mb_params(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        params = _read_mb_params(gsf_file)
+
+    assert_that(params.time).is_close_to(1458759363.225, 1e-3)
+    assert_that(params.number_arrays).is_equal_to(1)
+    assert_that(params.start_of_epoch).is_equal_to("REFERENCE TIME=1970/001 00:00:00")
+    assert_that(params["roll_compensated"]).is_equal_to(1)
+    assert_that(params.fields).contains("vessel_type", "to_apply", "applied")
+
+    transducer = params.to_apply.transducer
+    assert_that(transducer.shape).is_equal_to((2, 3))
+    assert_that(transducer[0].tolist()).is_equal_to([0.0, 0.0, 0.0])
+    assert_that(transducer[1].tolist()).is_equal_to([UNKNOWN_PARAM_VALUE] * 3)
+    assert_that(params.to_apply["transducer_x_offset"].shape).is_equal_to((2,))
+    assert_that(params.to_apply["mru_pitch_bias"]).is_instance_of(float)
+
+    known = params.to_apply.known()
+    assert_that(known.transducer[0].tolist()).is_equal_to([0.0, 0.0, 0.0])
+    assert_that(bool(np.isnan(known.transducer[1]).all())).is_true()
+    assert_that(params.offsets().antenna.shape).is_equal_to((3,))
+
+    assert_that(bytes(params.to_c())).is_equal_to(
+        bytes(MBParams(params.to_c(), params.time, 1).to_c())
+    )
+
+
+def test_mb_params_immutable_and_hashable(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        params = _read_mb_params(gsf_file)
+        gsf_file.seek(SeekOption.GSF_REWIND)
+        reparsed = _read_mb_params(gsf_file)
+
+    assert_that(reparsed).is_not_same_as(params)
+    assert_that(reparsed).is_equal_to(params)
+    assert_that(hash(reparsed)).is_equal_to(hash(params))
+    assert_that({params: "cached"}[reparsed]).is_equal_to("cached")
+    assert_that(params.applied).is_equal_to(reparsed.applied)
+
+    with pytest.raises(ValueError):
+        params.to_apply.transducer[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        params.to_apply["draft"][0] = 1.0
+
+
+def test_gsf_file_mb_params(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        assert_that(gsf_file.mb_params).is_none()
+        gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        assert_that(gsf_file.mb_params).is_none()
+
+        gsf_file.seek(SeekOption.GSF_REWIND)
+        while gsf_file.try_read().data_id.recordID != (
+            RecordType.GSF_RECORD_PROCESSING_PARAMETERS
+        ):
+            pass
+        params = gsf_file.mb_params
+        assert_that(params).is_not_none()
+
+        # Parsed once per processing parameters record, not per ping
+        gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        assert_that(gsf_file.mb_params).is_same_as(params)
+
+        gsf_file.seek(SeekOption.GSF_REWIND)
+        gsf_file.read(RecordType.GSF_RECORD_PROCESSING_PARAMETERS)
+        assert_that(gsf_file.mb_params).is_not_same_as(params)
+        assert_that(gsf_file.mb_params).is_equal_to(params)
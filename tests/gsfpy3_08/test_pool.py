@@ -0,0 +1,119 @@
+import shutil
+
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import GsfException, open_gsf
+from gsfpy3_08.enums import FileMode, RecordType, SeekOption
+from gsfpy3_08.pool import GsfFilePool, PoolStats
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+_PING = RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+
+
+@pytest.fixture
+def paths(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    paths = [tmp_path / f"line_{number}.gsf" for number in range(3)]
+    for path in paths:
+        shutil.copy(gsf_test_data_03_08.path, path)
+    return paths
+
+
+def _ping_times(path):
+    with open_gsf(path) as gsf_file:
+        return [gsf_file.read(_PING)[1].mb_ping.ping_time.tv_nsec for _ in range(8)]
+
+
+def test_read_by_record_number(paths):
+    with GsfFilePool(2) as pool:
+        for record_number in (1, 2, 3):
+            for path in paths:
+                _, records = pool.read(path, _PING, record_number)
+                assert_that(records.mb_ping.number_beams).is_greater_than(0)
+
+        assert_that(pool.open_paths).is_length(2)
+        assert_that(pool.stats).is_equal_to(
+            PoolStats(hits=0, misses=9, reopens=6, evictions=7)
+        )
+
+
+def test_sequential_reads_resume_after_eviction(paths):
+    expected = _ping_times(paths[0])
+
+    with GsfFilePool(2, FileMode.GSF_READONLY) as pool:
+        ping_times = {path: [] for path in paths}
+        for _ in range(8):
+            for path in paths:
+                _, records = pool.read(path, _PING)
+                ping_times[path].append(records.mb_ping.ping_time.tv_nsec)
+
+    for path in paths:
+        assert_that(ping_times[path]).is_equal_to(expected)
+
+
+def test_records_outlive_eviction(paths):
+    with open_gsf(paths[0]) as gsf_file:
+        _, records = gsf_file.read(_PING, 1)
+        expected = records.mb_ping.depth[: records.mb_ping.number_beams]
+
+    with GsfFilePool(2) as pool:
+        _, records = pool.read(paths[0], _PING, 1)
+        for record_number in (1, 2, 3):
+            pool.read(paths[1], _PING, record_number)
+            pool.read(paths[2], _PING, record_number)
+
+        assert_that(pool.open_paths).does_not_contain(paths[0].resolve())
+        depth = records.mb_ping.depth[: records.mb_ping.number_beams]
+        assert_that(depth).is_equal_to(expected)
+
+
+def test_seek_is_remembered(paths):
+    expected = _ping_times(paths[0])
+
+    with GsfFilePool(1, FileMode.GSF_READONLY) as pool:
+        for _ in range(5):
+            pool.read(paths[0], _PING)
+        pool.seek(paths[0], SeekOption.GSF_PREVIOUS_RECORD)
+        pool.read(paths[1], _PING)
+        _, records = pool.read(paths[0], _PING)
+        assert_that(records.mb_ping.ping_time.tv_nsec).is_equal_to(expected[4])
+
+        pool.seek(paths[0], SeekOption.GSF_REWIND)
+        pool.evict(paths[0])
+        _, records = pool.read(paths[0], _PING)
+        assert_that(records.mb_ping.ping_time.tv_nsec).is_equal_to(expected[0])
+
+
+def test_hits(paths):
+    with GsfFilePool() as pool:
+        pool.get_number_records(paths[0], _PING)
+        assert_that(pool.get_number_records(paths[0], _PING)).is_equal_to(8)
+
+        assert_that(pool.stats).is_equal_to(PoolStats(hits=1, misses=1))
+
+
+def test_makes_room_for_files_opened_elsewhere(paths):
+    # Leave libgsf room for just one more open file
+    other_files = []
+    try:
+        while True:
+            other_files.append(open_gsf(paths[2]))
+    except GsfException:
+        other_files.pop().close()
+
+    try:
+        with GsfFilePool() as pool:
+            pool.read(paths[0], _PING, 1)
+            pool.read(paths[1], _PING, 1)
+
+            assert_that(pool.open_paths).is_equal_to((paths[1].resolve(),))
+            assert_that(pool.stats.evictions).is_equal_to(1)
+    finally:
+        for gsf_file in other_files:
+            gsf_file.close()
+
+
+def test_mode_must_not_allow_writing():
+    assert_that(GsfFilePool).raises(ValueError).when_called_with(
+        2, FileMode.GSF_UPDATE_INDEX
+    )
@@ -0,0 +1,46 @@
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.provenance import (
+    read_comments,
+    read_history,
+    read_provenance,
+    read_provenance_files,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_read_comments_and_history(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        comments = read_comments(gsf_file)
+        history = read_history(gsf_file)
+
+    assert_that(comments.time).is_length(2)
+    assert_that(comments.time[0]).is_close_to(1458759363.0, 1.0)
+    assert_that(comments.comment[0]).starts_with("Bathy converted from HIPS file")
+    assert_that(comments.comment[1]).starts_with("SVP_FILE_NAME: CONVERT")
+
+    assert_that(history.time.tolist()).is_length(1)
+    assert_that(history.host_name).is_equal_to(["SWEEPER"])
+    assert_that(history.operator_name).is_equal_to(["dsowers"])
+    assert_that(history.command_line).is_equal_to(["HIPStoGSF"])
+    assert_that(history.comment).is_equal_to(["version 9.0.20"])
+
+
+def test_read_provenance_with_index(gsf_test_data_03_08: GsfDatafile):
+    sequential = read_provenance(gsf_test_data_03_08.path)
+    indexed = read_provenance(gsf_test_data_03_08.path, use_index=True)
+
+    assert_that(indexed.comments.comment).is_equal_to(sequential.comments.comment)
+    assert_that(indexed.history.time.tolist()).is_equal_to(
+        sequential.history.time.tolist()
+    )
+
+
+def test_read_provenance_files(gsf_test_data_03_08: GsfDatafile):
+    provenance = read_provenance_files([gsf_test_data_03_08.path], max_workers=1)
+
+    assert_that(provenance).contains_key(str(gsf_test_data_03_08.path))
+    assert_that(
+        provenance[str(gsf_test_data_03_08.path)].history.command_line
+    ).is_equal_to(["HIPStoGSF"])
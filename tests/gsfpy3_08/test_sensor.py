@@ -0,0 +1,113 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.enums import FileMode, RecordType, SensorSpecificSubRecord
+from gsfpy3_08.gsfSensorSpecific import c_gsfSensorSpecific
+from gsfpy3_08.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_08.sensor import (
+    SENSOR_SPECIFIC_MEMBERS,
+    decode_sensor_specific,
+    read_sensor_columns,
+    sensor_specific,
+    sensor_specific_member,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_sensor_specific_members():
+    union_members = {name for name, _ in c_gsfSensorSpecific._fields_}
+    assert_that(union_members).contains(*SENSOR_SPECIFIC_MEMBERS.values())
+    assert_that(sensor_specific_member(131)).is_equal_to("gsfEM3Specific")
+    assert_that(sensor_specific_member(149)).is_equal_to("gsfEM4Specific")
+    assert_that(sensor_specific_member(154)).is_none()
+    assert_that(
+        sensor_specific_member(
+            SensorSpecificSubRecord.GSF_SWATH_BATHY_SUBRECORD_UNKNOWN
+        )
+    ).is_none()
+
+
+def test_decode_sensor_specific(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        mb_ping = records.mb_ping
+        assert_that(sensor_specific(mb_ping)).is_instance_of(
+            type(mb_ping.sensor_data.gsfEM3Specific)
+        )
+        decoded = decode_sensor_specific(mb_ping)
+
+    assert_that(mb_ping.sensor_id).is_equal_to(
+        SensorSpecificSubRecord.GSF_SWATH_BATHY_SUBRECORD_EM3002D_SPECIFIC
+    )
+    assert_that(decoded).contains_key("model_number", "surface_velocity", "run_time")
+    assert_that(decoded).does_not_contain_key("spare")
+    assert_that(decoded["run_time"].shape).is_equal_to((2,))
+    assert_that(decoded["run_time"].dtype["dg_time"]).is_equal_to(np.float64)
+
+
+def test_decode_sensor_specific_em4_sectors():
+    mb_ping = c_gsfSwathBathyPing()
+    mb_ping.sensor_id = (
+        SensorSpecificSubRecord.GSF_SWATH_BATHY_SUBRECORD_EM2040_SPECIFIC
+    )
+    em4 = mb_ping.sensor_data.gsfEM4Specific
+    em4.model_number = 2040
+    em4.transmit_sectors = 2
+    em4.sector[0].center_frequency = 300.0
+    em4.sector[1].center_frequency = 320.0
+    em4.sector[2].center_frequency = 340.0
+
+    decoded = decode_sensor_specific(mb_ping)
+    em4.model_number = 0
+
+    assert_that(decoded["model_number"]).is_equal_to(2040)
+    assert_that(decoded["sector"]["center_frequency"].tolist()).is_equal_to(
+        [300.0, 320.0]
+    )
+    assert_that(decoded["sector"].dtype.names).does_not_contain("spare")
+
+
+def test_decode_sensor_specific_unknown_sensor():
+    mb_ping = c_gsfSwathBathyPing()
+    mb_ping.sensor_id = 154
+
+    assert_that(sensor_specific(mb_ping)).is_none()
+    assert_that(decode_sensor_specific(mb_ping)).is_none()
+
+
+def test_read_sensor_columns(gsf_test_data_03_08: GsfDatafile):
+    ping = RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        for record_number in (2, 5):
+            _, records = gsf_file.read(ping, record_number)
+            em3 = records.mb_ping.sensor_data.gsfEM3Specific
+            em3.surface_velocity = 1480.0 + record_number
+            em3.model_number = record_number
+            gsf_file.write(records, ping, record_number)
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        columns = read_sensor_columns(
+            gsf_file, ["surface_velocity", "model_number", "power"]
+        )
+
+    assert_that(columns.record_numbers.tolist()).is_equal_to(list(range(1, 9)))
+    assert_that(columns.sensor_id.tolist()).is_equal_to([131] * 8)
+    assert_that(columns.ping_time).is_length(8)
+    assert_that(columns.columns["surface_velocity"][[1, 4]].tolist()).is_equal_to(
+        [1482.0, 1485.0]
+    )
+    assert_that(columns.columns["model_number"].dtype).is_equal_to(np.int32)
+    assert_that(columns.columns["model_number"].tolist()).is_equal_to(
+        [0, 2, 0, 0, 5, 0, 0, 0]
+    )
+    # power is not a field of EM3 subrecords, and is held as int or double by others
+    assert_that(columns.columns["power"].dtype).is_equal_to(np.float64)
+    assert_that(bool(np.isnan(columns.columns["power"]).all())).is_true()
+
+
+def test_read_sensor_columns_unknown_fields(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        assert_that(read_sensor_columns).raises(ValueError).when_called_with(
+            gsf_file, ["surface_velocity", "run_time", "not_a_field"]
+        ).is_equal_to("Unknown sensor specific fields: ['not_a_field', 'run_time']")
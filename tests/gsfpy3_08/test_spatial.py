@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.columnar import PingBlock
+from gsfpy3_08.spatial import (
+    BoundingBox,
+    FootprintIndex,
+    GsfDataset,
+    load_footprint_index,
+    ping_footprints,
+    sidecar_path,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+# Meters per degree of latitude used by the footprint approximation
+_METERS_PER_DEGREE = 111319.49
+
+
+def _ping_block(across_track, heading) -> PingBlock:
+    across_track = np.array(across_track, dtype=np.float64)
+    number_pings = across_track.shape[0]
+    return PingBlock(
+        np.arange(1, number_pings + 1),
+        np.zeros(number_pings),
+        {
+            "across_track": across_track,
+            "along_track": np.zeros_like(across_track),
+            "latitude": np.zeros(number_pings),
+            "longitude": np.zeros(number_pings),
+            "heading": np.array(heading, dtype=np.float64),
+            "number_beams": np.full(number_pings, across_track.shape[1]),
+        },
+    )
+
+
+def test_ping_footprints():
+    block = _ping_block(
+        across_track=[
+            [-100.0, 0.0, 200.0],
+            [-100.0, np.nan, 200.0],
+            [50.0, 60, np.nan],
+        ],
+        heading=[0.0, 90.0, 0.0],
+    )
+
+    footprints = ping_footprints(block) * _METERS_PER_DEGREE
+
+    # Heading north, starboard is to the east
+    assert_that(footprints[0].tolist()).is_equal_to([0.0, -100.0, 0.0, 200.0])
+    # Heading east, starboard is to the south
+    assert_that(np.allclose(footprints[1], [-200.0, 0.0, 100.0, 0.0])).is_true()
+    # Ping position is always within the footprint
+    assert_that(footprints[2].tolist()).is_equal_to([0.0, 0.0, 0.0, 60.0])
+
+
+def test_footprint_index_query_bbox():
+    footprints = np.array([[i, i, i + 0.5, i + 0.5] for i in range(10)], dtype=float)
+    index = FootprintIndex(np.arange(1, 11), footprints, node_size=3)
+
+    assert_that(index.bounds).is_equal_to(BoundingBox(0.0, 0.0, 9.5, 9.5))
+    assert_that(index.query_bbox(BoundingBox(2.2, 2.2, 4.0, 4.0)).tolist()).is_equal_to(
+        [3, 4, 5]
+    )
+    assert_that(index.query_bbox(BoundingBox(20, 20, 21, 21)).tolist()).is_empty()
+
+
+def test_load_footprint_index(gsf_test_data_03_08: GsfDatafile):
+    index = load_footprint_index(gsf_test_data_03_08.path)
+
+    assert_that(str(sidecar_path(gsf_test_data_03_08.path))).exists()
+    assert_that(index.record_numbers.tolist()).is_equal_to(list(range(1, 9)))
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        built = FootprintIndex.build(gsf_file, block_size=3)
+    assert_that(np.array_equal(built.footprints, index.footprints)).is_true()
+
+    reloaded = FootprintIndex.load(
+        sidecar_path(gsf_test_data_03_08.path), gsf_test_data_03_08.path
+    )
+    assert_that(np.array_equal(reloaded.footprints, index.footprints)).is_true()
+
+    # Modifying the GSF file makes its sidecar stale
+    with open(gsf_test_data_03_08.path, "ab") as gsf_file:
+        gsf_file.write(b"\0")
+    assert_that(
+        FootprintIndex.load(
+            sidecar_path(gsf_test_data_03_08.path), gsf_test_data_03_08.path
+        )
+    ).is_none()
+
+
+def test_gsf_dataset(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    index_path = tmp_path / "survey.npz"
+    path = str(gsf_test_data_03_08.path)
+
+    dataset = GsfDataset([path], index_path=index_path, max_workers=1)
+
+    assert_that(str(index_path)).exists()
+    assert_that(dataset.query_bbox(8.6886, 167.47, 8.689, 167.48)).is_equal_to(
+        [(path, 7), (path, 8)]
+    )
+    assert_that(dataset.query_bbox(0.0, 0.0, 1.0, 1.0)).is_empty()
+
+    reopened = GsfDataset([path], index_path=index_path)
+    found = [
+        (found_path, record_number, records.mb_ping.number_beams)
+        for found_path, record_number, records in reopened.read_bbox(
+            8.6886, 167.47, 8.689, 167.48
+        )
+    ]
+    assert_that(found).is_equal_to([(path, 7, 432), (path, 8, 432)])
+
+
+def test_gsf_dataset_query_polygon(gsf_test_data_03_08: GsfDatafile):
+    path = str(gsf_test_data_03_08.path)
+    dataset = GsfDataset([path], max_workers=1)
+
+    # The footprints of five pings intersect the bounding box of either triangle, but
+    # the beams of only one of them fall within the south eastern triangle
+    assert_that(dataset.query_bbox(8.72, 167.50, 8.735, 167.52)).is_length(5)
+    assert_that(
+        dataset.query_polygon([(8.72, 167.50), (8.735, 167.52), (8.72, 167.52)])
+    ).is_equal_to([(path, 1)])
+    assert_that(
+        dataset.query_polygon([(8.72, 167.50), (8.735, 167.52), (8.735, 167.50)])
+    ).is_empty()
+    with pytest.raises(ValueError):
+        dataset.query_polygon([(8.72, 167.50), (8.735, 167.52)])
@@ -0,0 +1,84 @@
+from ctypes import sizeof
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.enums import RecordType
+from gsfpy3_08.gsfMBOffsets import c_gsfMBOffsets
+from gsfpy3_08.gsfScaleFactors import c_gsfScaleFactors
+from gsfpy3_08.gsfSensorSpecific import c_gsfSensorSpecific
+from gsfpy3_08.gsfSingleBeamPing import c_gsfSingleBeamPing
+from gsfpy3_08.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_08.gsfSwathBathySummary import c_gsfSwathBathySummary
+from gsfpy3_08.structured import (
+    SWATH_BATHY_SUMMARY_DTYPE,
+    as_structured,
+    stack_structures,
+    structured_dtype,
+    to_structure,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_structured_dtype_sizes():
+    for structure_type in (
+        c_gsfSwathBathySummary,
+        c_gsfSingleBeamPing,
+        c_gsfScaleFactors,
+        c_gsfMBOffsets,
+        c_gsfSensorSpecific,
+    ):
+        assert_that(structured_dtype(structure_type).itemsize).is_equal_to(
+            sizeof(structure_type)
+        )
+
+
+def test_structured_dtype_pointers():
+    assert_that(structured_dtype).raises(TypeError).when_called_with(
+        c_gsfSwathBathyPing
+    ).contains("c_gsfSwathBathyPing.depth")
+
+
+def test_as_structured(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY)
+        summary = records.summary
+        view = as_structured(summary)
+
+        assert_that(view.dtype).is_equal_to(SWATH_BATHY_SUMMARY_DTYPE)
+        assert_that(view.shape).is_equal_to((1,))
+        assert_that(view["min_depth"][0]).is_equal_to(summary.min_depth)
+        assert_that(view["start_time"]["tv_sec"][0]).is_equal_to(
+            summary.start_time.tv_sec
+        )
+
+        view["max_depth"] = 1234.5
+        assert_that(summary.max_depth).is_equal_to(1234.5)
+
+
+def test_stack_structures(gsf_test_data_03_08: GsfDatafile):
+    scale_factors = []
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        for _ in range(3):
+            _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            scale_factors.append(
+                c_gsfScaleFactors.from_buffer_copy(records.mb_ping.scaleFactors)
+            )
+
+    table = stack_structures(scale_factors, c_gsfScaleFactors)
+
+    assert_that(table.shape).is_equal_to((3,))
+    assert_that(table["numArraySubrecords"].tolist()).is_equal_to(
+        [factors.numArraySubrecords for factors in scale_factors]
+    )
+    assert_that(table["scaleTable"].shape[0]).is_equal_to(3)
+    round_trip = to_structure(table[2], c_gsfScaleFactors)
+    assert_that(bytes(round_trip)).is_equal_to(bytes(scale_factors[2]))
+    assert_that(stack_structures([], c_gsfScaleFactors).dtype).is_equal_to(
+        structured_dtype(c_gsfScaleFactors)
+    )
+    assert_that(to_structure).raises(ValueError).when_called_with(
+        table[0], c_gsfMBOffsets
+    )
+    assert_that(np.shares_memory(table, as_structured(scale_factors[0]))).is_false()
@@ -0,0 +1,137 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.columnar import PingBlock
+from gsfpy3_08.enums import FileMode, PingFlag, RecordType
+from gsfpy3_08.summary import (
+    SwathSummary,
+    read_summary,
+    summarise,
+    summarise_files,
+    update_summary,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+_SUMMARY_A = SwathSummary(10.0, 20.0, -1.0, 100.0, 1.0, 101.0, 5.0, 50.0)
+_SUMMARY_B = SwathSummary(15.0, 30.0, -2.0, 100.5, 0.5, 102.0, 2.0, 40.0)
+_SUMMARY_C = SwathSummary(5.0, 12.0, 0.0, 99.0, 3.0, 100.0, 10.0, 60.0)
+
+
+def _ping_block(depth, beam_flags, ping_flags) -> PingBlock:
+    depth = np.array(depth, dtype=np.float64)
+    number_pings = depth.shape[0]
+    return PingBlock(
+        np.arange(1, number_pings + 1),
+        np.arange(number_pings, dtype=np.float64),
+        {
+            "depth": depth,
+            "beam_flags": np.array(beam_flags, dtype=np.float64),
+            "ping_flags": np.array(ping_flags),
+            "latitude": np.arange(number_pings, dtype=np.float64),
+            "longitude": -np.arange(number_pings, dtype=np.float64),
+            "number_beams": np.full(number_pings, depth.shape[1]),
+        },
+    )
+
+
+def test_merge():
+    assert_that(_SUMMARY_A.merge(_SUMMARY_B).merge(_SUMMARY_C)).is_equal_to(
+        _SUMMARY_A.merge(_SUMMARY_B.merge(_SUMMARY_C))
+    )
+    assert_that(_SUMMARY_A.merge(_SUMMARY_B)).is_equal_to(
+        SwathSummary(10.0, 30.0, -2.0, 100.0, 1.0, 102.0, 2.0, 50.0)
+    )
+    assert_that(SwathSummary().merge(_SUMMARY_A)).is_equal_to(_SUMMARY_A)
+    assert_that(SwathSummary().is_empty).is_true()
+    assert_that(_SUMMARY_A.is_empty).is_false()
+
+
+def test_from_ping_block():
+    block = _ping_block(
+        depth=[[10.0, 20.0, 30.0], [5.0, 40.0, np.nan], [1.0, 100.0, 1.0]],
+        beam_flags=[[0, 0, 1], [0, 0, 0], [0, 0, 0]],
+        ping_flags=[0, 0, PingFlag.GSF_IGNORE_PING],
+    )
+
+    summary = SwathSummary.from_ping_block(block)
+
+    assert_that(summary).is_equal_to(
+        SwathSummary(0.0, 1.0, 0.0, -1.0, 1.0, 0.0, 5.0, 40.0)
+    )
+
+
+def test_from_ping_block_all_ignored():
+    block = _ping_block(
+        depth=[[10.0]], beam_flags=[[0]], ping_flags=[PingFlag.GSF_IGNORE_PING]
+    )
+
+    summary = SwathSummary.from_ping_block(block)
+
+    assert_that(summary.is_empty).is_true()
+    assert_that(summary.to_summary).raises(ValueError).when_called_with(None)
+
+
+def test_summarise(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        summary = summarise(gsf_file)
+        in_blocks = summarise(gsf_file, block_size=3)
+
+    assert_that(in_blocks).is_equal_to(summary)
+    assert_that(summary.start_time).is_close_to(1458759353.856, 1e-3)
+    assert_that(summary.end_time).is_close_to(1458759418.333, 1e-3)
+    assert_that(summary.min_latitude).is_close_to(8.7115166, 1e-7)
+    assert_that(summary.max_latitude).is_close_to(8.713204, 1e-7)
+    assert_that(summary.min_longitude).is_close_to(167.4759172, 1e-7)
+    assert_that(summary.max_longitude).is_close_to(167.4765838, 1e-7)
+    # Flagged beams are left out, as in the summary recorded in the file
+    assert_that(summary.min_depth).is_close_to(3862.43, 0.01)
+    assert_that(summary.max_depth).is_close_to(4145.0, 0.01)
+
+
+def test_summarise_files(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        expected = summarise(gsf_file)
+
+    summaries = summarise_files([gsf_test_data_03_08.path], max_workers=2)
+
+    assert_that(summaries).is_equal_to({str(gsf_test_data_03_08.path): expected})
+
+
+def test_update_summary(gsf_test_data_03_08: GsfDatafile):
+    summary = SwathSummary(1.5e9, 1.5e9 + 60.25, -1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+
+    written = update_summary(gsf_test_data_03_08.path, summary)
+
+    assert_that(written).is_equal_to(summary)
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(read_summary(gsf_file)).is_equal_to(summary)
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        ).is_equal_to(8)
+
+
+def test_update_summary_copy(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    no_summary_path = tmp_path / "no_summary.gsf"
+    target_path = tmp_path / "summary.gsf"
+    with open_gsf(
+        gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX
+    ) as source_file, open_gsf(no_summary_path, FileMode.GSF_CREATE) as target_file:
+        for record_number in range(1, 9):
+            _, records = source_file.read(
+                RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING, record_number
+            )
+            target_file.write(records, RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+    assert_that(update_summary).raises(ValueError).when_called_with(no_summary_path)
+
+    summary = update_summary(no_summary_path, target_path=target_path)
+
+    with open_gsf(target_path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        written = read_summary(gsf_file)
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        ).is_equal_to(8)
+    assert_that(written.start_time).is_close_to(summary.start_time, 1e-6)
+    assert_that(written.max_latitude).is_close_to(summary.max_latitude, 1e-7)
+    assert_that(written.min_depth).is_close_to(summary.min_depth, 0.01)
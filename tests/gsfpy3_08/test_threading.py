@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import GsfException, _iter_records, open_gsf
+from gsfpy3_08.columnar import iter_ping_blocks
+from gsfpy3_08.constants import GSF_READ_TO_END_OF_FILE
+from gsfpy3_08.enums import RecordType
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+# libgsf allows only four files to be open at once, and the bindings tests leave one
+# of them open
+_NUMBER_THREADS = 3
+
+
+def _read_depths(path) -> np.ndarray:
+    with open_gsf(path) as gsf_file:
+        (block,) = iter_ping_blocks(gsf_file, ["depth"])
+    return block["depth"]
+
+
+def test_parallel_reads(gsf_test_data_03_08: GsfDatafile):
+    expected = _read_depths(gsf_test_data_03_08.path)
+
+    with ThreadPoolExecutor(_NUMBER_THREADS) as executor:
+        depths = list(
+            executor.map(_read_depths, [gsf_test_data_03_08.path] * 3 * _NUMBER_THREADS)
+        )
+
+    for depth in depths:
+        assert_that(np.array_equal(depth, expected, equal_nan=True)).is_true()
+
+
+def _read_to_end(path) -> int:
+    with open_gsf(path) as gsf_file:
+        while True:
+            try:
+                gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            except GsfException as ex:
+                return ex.error_code
+
+
+def _open_missing(path) -> int:
+    try:
+        open_gsf(path)
+    except GsfException as ex:
+        return ex.error_code
+    raise AssertionError("File opened")
+
+
+def test_errors_are_those_of_the_failing_call(gsf_test_data_03_08: GsfDatafile):
+    tasks = [(_read_to_end, gsf_test_data_03_08.path), (_open_missing, "missing.gsf")]
+
+    with ThreadPoolExecutor(_NUMBER_THREADS) as executor:
+        futures = [
+            (function, executor.submit(function, path))
+            for function, path in tasks * 4 * _NUMBER_THREADS
+        ]
+        error_codes = [(function, future.result()) for function, future in futures]
+
+    for function, error_code in error_codes:
+        expected = GSF_READ_TO_END_OF_FILE if function is _read_to_end else -1
+        assert_that(error_code).is_equal_to(expected)
+
+
+def test_file_lock_is_reentrant(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        with gsf_file.lock:
+            data_id, _ = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+    assert_that(data_id.recordID).is_equal_to(
+        RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING
+    )
+
+
+def _lock_is_free(gsf_file) -> bool:
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(_acquire_and_release, gsf_file.lock).result()
+
+
+def _acquire_and_release(lock) -> bool:
+    acquired = lock.acquire(timeout=1)
+    if acquired:
+        lock.release()
+    return acquired
+
+
+def test_iter_records_closed_early_rewinds_and_releases_file(
+    gsf_test_data_03_08: GsfDatafile,
+):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        pings = _iter_records(gsf_file, RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        with closing(pings):
+            first_depth = next(pings).mb_ping.depth[0]
+            next(pings)
+
+        lock_is_free = _lock_is_free(gsf_file)
+        _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+    assert_that(lock_is_free).is_true()
+    assert_that(records.mb_ping.depth[0]).is_equal_to(first_depth)
@@ -0,0 +1,156 @@
+from ctypes import create_string_buffer
+
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.enums import FileMode, RecordType
+from gsfpy3_08.gsfRecords import c_gsfRecords
+from gsfpy3_08.summary import read_summary, summarise
+from gsfpy3_08.tools import merge, split, split_survey_lines
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+
+def test_split_survey_lines(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    target_dir = tmp_path / "lines"
+
+    parts = split_survey_lines(gsf_test_data_03_08.path, target_dir, 20.0)
+
+    stem = gsf_test_data_03_08.path.stem
+    assert_that(parts).is_equal_to(
+        [target_dir / f"{stem}_{number:03d}.gsf" for number in (1, 2, 3, 4)]
+    )
+
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        _, records = gsf_file.read(RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE, 1)
+        sound_speed = records.svp.sound_speed[0]
+
+    number_pings = []
+    for part in parts:
+        with open_gsf(part, FileMode.GSF_READONLY_INDEX) as gsf_file:
+            number_pings.append(
+                gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            )
+            assert_that(read_summary(gsf_file).start_time).is_close_to(
+                summarise(gsf_file).start_time, 1e-6
+            )
+            # Every part carries the sound velocity profile in effect
+            _, records = gsf_file.read(RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE, 1)
+            assert_that(records.svp.sound_speed[0]).is_equal_to(sound_speed)
+            assert_that(
+                gsf_file.get_number_records(RecordType.GSF_RECORD_PROCESSING_PARAMETERS)
+            ).is_equal_to(1)
+
+    assert_that(number_pings).is_equal_to([1, 2, 3, 2])
+
+
+def _number_pings(path) -> int:
+    with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        return gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+
+def _depths(path):
+    depths = []
+    with open_gsf(path) as gsf_file:
+        for _ in range(_number_pings(path)):
+            _, records = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            ping = records.mb_ping
+            depths.append([ping.depth[beam] for beam in range(ping.number_beams)])
+    return depths
+
+
+@pytest.mark.parametrize(
+    "by, every, number_pings",
+    [
+        ("records", 3, [3, 3, 2]),
+        ("time", 20.0, [3, 2, 2, 1]),
+        ("size", 60000, [4, 4]),
+    ],
+)
+def test_split(gsf_test_data_03_08: GsfDatafile, tmp_path, by, every, number_pings):
+    parts = split(gsf_test_data_03_08.path, every, by, tmp_path)
+
+    assert_that([_number_pings(part) for part in parts]).is_equal_to(number_pings)
+    for part in parts:
+        with open_gsf(part, FileMode.GSF_READONLY_INDEX) as gsf_file:
+            summary = read_summary(gsf_file)
+            expected = summarise(gsf_file)
+            assert_that(summary.start_time).is_close_to(expected.start_time, 1e-6)
+            assert_that(summary.max_depth).is_close_to(expected.max_depth, 0.01)
+            assert_that(
+                gsf_file.get_number_records(RecordType.GSF_RECORD_PROCESSING_PARAMETERS)
+            ).is_equal_to(1)
+
+
+def test_split_unknown_unit(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    assert_that(split).raises(ValueError).when_called_with(
+        gsf_test_data_03_08.path, 1, "beams", tmp_path
+    )
+
+
+def test_merge(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    parts = split(gsf_test_data_03_08.path, 3, "records", tmp_path / "parts")
+    merged_path = tmp_path / "merged.gsf"
+
+    summary = merge(parts, merged_path)
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        expected = summarise(gsf_file)
+    assert_that(summary).is_equal_to(expected)
+    assert_that(_depths(merged_path)).is_equal_to(_depths(gsf_test_data_03_08.path))
+    with open_gsf(merged_path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY)
+        ).is_equal_to(1)
+        assert_that(read_summary(gsf_file).end_time).is_close_to(
+            expected.end_time, 1e-6
+        )
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_split_and_merge_index_sources_only_when_asked(
+    gsf_test_data_03_08: GsfDatafile, tmp_path, use_index
+):
+    parts = split(
+        gsf_test_data_03_08.path, 3, "records", tmp_path / "parts", use_index=use_index
+    )
+    merged_path = tmp_path / "merged.gsf"
+    merge(parts, merged_path, use_index=use_index)
+
+    # libgsf writes an index alongside each file it opens for direct access
+    index_files = [path for path in tmp_path.rglob("*.*") if path.suffix != ".gsf"]
+    assert_that(bool(index_files)).is_equal_to(use_index)
+    assert_that(_depths(merged_path)).is_equal_to(_depths(gsf_test_data_03_08.path))
+
+
+def _write_comment_only_file(path):
+    records = c_gsfRecords()
+    comment = b"No pings here"
+    records.comment.comment_length = len(comment)
+    records.comment.comment = create_string_buffer(comment)
+    with open_gsf(path, FileMode.GSF_CREATE) as gsf_file:
+        gsf_file.write(records, RecordType.GSF_RECORD_COMMENT)
+
+
+@pytest.mark.parametrize("by, every", [("records", 2), ("time", 10.0), ("size", 1000)])
+def test_split_file_without_pings(tmp_path, by, every):
+    path = tmp_path / "comments.gsf"
+    _write_comment_only_file(path)
+
+    parts = split(path, every, by, tmp_path / "parts")
+
+    assert_that(parts).is_length(1)
+    with open_gsf(parts[0], FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        ).is_zero()
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_COMMENT)
+        ).is_equal_to(1)
+
+
+@pytest.mark.parametrize("every", [0.5, 1.5])
+def test_split_by_fractional_records(gsf_test_data_03_08: GsfDatafile, tmp_path, every):
+    assert_that(split).raises(ValueError).when_called_with(
+        gsf_test_data_03_08.path, every, "records", tmp_path
+    )
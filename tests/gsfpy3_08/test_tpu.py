@@ -0,0 +1,156 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.columnar import PingBlock, iter_ping_blocks
+from gsfpy3_08.svp import NOMINAL_SOUND_SPEED
+from gsfpy3_08.tpu import (
+    CONFIDENCE_95,
+    InstallationOffsets,
+    TpuModel,
+    compute_tpu,
+    iter_tpu,
+    read_installation_offsets,
+    supports_recalculate_tpu,
+    update_tpu,
+    update_tpu_files,
+)
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+_NO_UNCERTAINTY = TpuModel(
+    position=0.0,
+    heading=0.0,
+    roll=0.0,
+    pitch=0.0,
+    heave=0.0,
+    heave_fraction=0.0,
+    draft=0.0,
+    surface_sound_speed=0.0,
+    sound_speed=0.0,
+)
+
+
+def _ping_block(depth, across_track, ping_time, **beam_arrays) -> PingBlock:
+    depth = np.array(depth, dtype=np.float64)
+    number_pings = depth.shape[0]
+    columns = {
+        "depth": depth,
+        "across_track": np.array(across_track, dtype=np.float64),
+        "along_track": np.zeros_like(depth),
+        "roll": np.zeros(number_pings),
+        "pitch": np.zeros(number_pings),
+        "heave": np.zeros(number_pings),
+    }
+    columns.update(
+        (field, np.array(values, dtype=np.float64))
+        for field, values in beam_arrays.items()
+    )
+    return PingBlock(
+        np.arange(1, number_pings + 1), np.array(ping_time, dtype=np.float64), columns
+    )
+
+
+def _offsets(time: float, draft: float) -> InstallationOffsets:
+    return InstallationOffsets(
+        time=time,
+        draft=draft,
+        transducer=np.zeros(3),
+        antenna=np.zeros(3),
+        mru=np.zeros(3),
+    )
+
+
+def test_compute_tpu_sonar_and_position():
+    block = _ping_block(
+        [[100.0, 100.0]],
+        [[-50.0, 50.0]],
+        [0.0],
+        sonar_vert_uncert=[[0.5, 0.25]],
+    )
+
+    tpu = compute_tpu(block, model=_NO_UNCERTAINTY._replace(position=2.0))
+
+    assert_that(
+        np.allclose(tpu.vertical_error, CONFIDENCE_95 * np.array([0.5, 0.25]))
+    ).is_true()
+    assert_that(np.allclose(tpu.horizontal_error, CONFIDENCE_95 * 2.0)).is_true()
+
+
+def test_compute_tpu_attitude():
+    block = _ping_block([[100.0, 100.0, np.nan]], [[0.0, 100.0, 0.0]], [0.0])
+    roll = np.radians(1.0)
+
+    tpu = compute_tpu(block, model=_NO_UNCERTAINTY._replace(roll=1.0))
+
+    assert_that(
+        np.allclose(
+            tpu.vertical_error[0, :2], CONFIDENCE_95 * roll * np.array([0, 100])
+        )
+    ).is_true()
+    assert_that(
+        np.allclose(tpu.horizontal_error[0, :2], CONFIDENCE_95 * roll * 100.0)
+    ).is_true()
+    assert_that(np.isnan(tpu.vertical_error[0, 2])).is_true()
+
+
+def test_compute_tpu_uses_offsets_in_effect():
+    block = _ping_block([[100.0], [100.0], [100.0]], [[0.0], [0.0], [0.0]], [5, 15, 25])
+    offsets = [_offsets(10.0, 2.0), _offsets(20.0, 4.0)]
+
+    tpu = compute_tpu(block, offsets, _NO_UNCERTAINTY._replace(sound_speed=15.0))
+
+    expected = CONFIDENCE_95 * np.array([[98.0], [98.0], [96.0]]) * 15.0
+    assert_that(
+        np.allclose(tpu.vertical_error, expected / NOMINAL_SOUND_SPEED)
+    ).is_true()
+
+
+def test_iter_tpu(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        assert_that(supports_recalculate_tpu(gsf_file)).is_true()
+        offsets = read_installation_offsets(gsf_file)
+        results = list(iter_tpu(gsf_file, block_size=5))
+
+    assert_that(offsets).is_length(1)
+    assert_that(offsets[0].time).is_close_to(1458759363.225, 1e-3)
+    assert_that(offsets[0].draft).is_equal_to(0.0)
+    assert_that([block.number_pings for block, _ in results]).is_equal_to([5, 3])
+    for _, tpu in results:
+        assert_that(bool((tpu.vertical_error > 0).all())).is_true()
+        assert_that(bool((tpu.horizontal_error > 0).all())).is_true()
+
+
+def test_update_tpu(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    target_path = tmp_path / "tpu.gsf"
+    model = TpuModel(position=2.0)
+
+    assert_that(update_tpu).raises(ValueError).when_called_with(
+        gsf_test_data_03_08.path
+    )
+    assert_that(
+        update_tpu(gsf_test_data_03_08.path, target_path=target_path)
+    ).is_equal_to(8)
+    # The copy holds the error arrays, so can now be updated in place
+    assert_that(update_tpu(target_path, model)).is_equal_to(8)
+
+    with open_gsf(gsf_test_data_03_08.path) as gsf_file:
+        ((_, expected),) = iter_tpu(gsf_file, model)
+    with open_gsf(target_path) as gsf_file:
+        (updated,) = iter_ping_blocks(gsf_file, ["vertical_error", "horizontal_error"])
+
+    for field in ("vertical_error", "horizontal_error"):
+        assert_that(
+            np.allclose(updated[field], getattr(expected, field), atol=0.01)
+        ).is_true()
+
+
+def test_update_tpu_files(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    target_dir = tmp_path / "tpu"
+    target_dir.mkdir()
+
+    updated = update_tpu_files(
+        [gsf_test_data_03_08.path], target_dir=target_dir, max_workers=2
+    )
+
+    assert_that(updated).is_equal_to({str(gsf_test_data_03_08.path): 8})
+    assert_that(str(target_dir / gsf_test_data_03_08.path.name)).exists()
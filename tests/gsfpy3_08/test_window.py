@@ -0,0 +1,69 @@
+import shutil
+
+from assertpy import assert_that
+
+from gsfpy3_08 import open_gsf
+from gsfpy3_08.enums import FileMode
+from gsfpy3_08.window import bisect_time, extract_time_window, index_time
+from tests.gsfpy3_08.conftest import GsfDatafile
+
+FIRST_PING_TIME = 1458759353.856
+LAST_PING_TIME = 1458759418.333
+
+
+def test_index_time(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(index_time(gsf_file, 1)).is_close_to(FIRST_PING_TIME, 1e-6)
+        assert_that(index_time(gsf_file, 8)).is_close_to(LAST_PING_TIME, 1e-6)
+
+
+def test_bisect_time(gsf_test_data_03_08: GsfDatafile):
+    with open_gsf(gsf_test_data_03_08.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(bisect_time(gsf_file, FIRST_PING_TIME - 1)).is_equal_to(1)
+        assert_that(bisect_time(gsf_file, FIRST_PING_TIME + 10)).is_equal_to(3)
+        assert_that(bisect_time(gsf_file, LAST_PING_TIME)).is_equal_to(8)
+        assert_that(bisect_time(gsf_file, LAST_PING_TIME + 1)).is_equal_to(9)
+
+
+def test_extract_time_window(gsf_test_data_03_08: GsfDatafile, tmp_path):
+    paths = [tmp_path / "first.gsf", tmp_path / "second.gsf"]
+    for path in paths:
+        shutil.copy(gsf_test_data_03_08.path, path)
+
+    window = list(
+        extract_time_window(
+            paths, FIRST_PING_TIME + 10, FIRST_PING_TIME + 40, ["depth"], 2, False
+        )
+    )
+
+    assert_that([path for path, _ in window]).is_equal_to(
+        [paths[0], paths[0], paths[1], paths[1]]
+    )
+    assert_that(
+        [int(number) for _, block in window for number in block.record_numbers]
+    ).is_equal_to([3, 4, 5, 3, 4, 5])
+    assert_that(window[0].block).contains("depth").does_not_contain("amplitude")
+
+
+def test_extract_time_window_by_summary(gsf_test_data_03_08: GsfDatafile):
+    # The test file's summary record starts with its second ping
+    window_start = FIRST_PING_TIME - 1
+    window_end = FIRST_PING_TIME + 1
+
+    by_summary = extract_time_window(
+        [gsf_test_data_03_08.path], window_start, window_end
+    )
+    by_index = extract_time_window(
+        [gsf_test_data_03_08.path], window_start, window_end, use_summaries=False
+    )
+
+    assert_that(list(by_summary)).is_empty()
+    assert_that([window.block.number_pings for window in by_index]).is_equal_to([1])
+
+
+def test_extract_time_window_outside_files(gsf_test_data_03_08: GsfDatafile):
+    window = extract_time_window(
+        [gsf_test_data_03_08.path], LAST_PING_TIME + 1, LAST_PING_TIME + 10
+    )
+
+    assert_that(list(window)).is_empty()
@@ -0,0 +1,15 @@
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_09.arrow import write_parquet
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_write_parquet(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    target_path = tmp_path / "pings.parquet"
+
+    number_pings = write_parquet(gsf_test_data_03_09.path, target_path, ["depth"])
+
+    assert_that(number_pings).is_equal_to(3)
+    assert_that(pq.read_table(target_path).num_rows).is_equal_to(3)
@@ -5,6 +5,7 @@ from ctypes import (
     c_char,
     c_double,
     c_int,
+    c_int64,
     c_long,
     c_longlong,
     c_ubyte,
@@ -261,7 +262,7 @@ def test_gsfIndexTime_success(gsf_test_data_03_09):
     multibeam ping record.
     """
     file_handle = c_int(0)
-    sec = c_int(-1)
+    sec = c_int64(-1)
     nsec = c_long(-1)
 
     return_value = gsfpy3_09.bindings.gsfOpen(
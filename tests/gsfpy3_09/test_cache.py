@@ -0,0 +1,13 @@
+from assertpy import assert_that
+
+from gsfpy3_09.cache import materialise
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_materialise(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    cache = materialise(gsf_test_data_03_09.path, tmp_path, ["depth"])
+
+    (block,) = cache.iter_ping_blocks()
+    assert_that(cache.is_current()).is_true()
+    assert_that(block.number_pings).is_equal_to(3)
+    assert_that(block["depth"].shape[0]).is_equal_to(3)
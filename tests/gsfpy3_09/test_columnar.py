@@ -0,0 +1,45 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.columnar import PING_FIELDS, iter_ping_blocks, write_beam_columns
+from gsfpy3_09.enums import FileMode
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_iter_ping_blocks(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        blocks = list(iter_ping_blocks(gsf_file, block_size=2))
+
+    assert_that([block.number_pings for block in blocks]).is_equal_to([2, 1])
+    assert_that(blocks[0].number_beams.tolist()).is_equal_to([7, 7])
+    assert_that(blocks[0].fields).contains(*PING_FIELDS)
+    assert_that(blocks[1]["depth"][0, :3].tolist()).is_equal_to([346.64, 35.92, 380.56])
+    assert_that(blocks[1]["beam_flags"][0, :2].tolist()).is_equal_to([1, 0])
+    # Beam arrays absent from the pings read as NaN
+    assert_that(np.isnan(blocks[0]["travel_time"]).all()).is_true()
+
+
+def test_iter_ping_blocks_unknown_field(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        blocks = iter_ping_blocks(gsf_file, ["depth", "not_a_field"])
+        assert_that(next).raises(ValueError).when_called_with(blocks)
+
+
+def test_write_beam_columns(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        (block,) = iter_ping_blocks(gsf_file, ["depth"])
+        depth = block["depth"] * 1.01
+        write_beam_columns(gsf_file, block.record_numbers, {"depth": depth})
+
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        (updated,) = iter_ping_blocks(gsf_file, ["depth"])
+
+    assert_that(np.allclose(updated["depth"], depth, atol=0.01)).is_true()
+
+
+def test_write_beam_columns_requires_update_mode(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        assert_that(write_beam_columns).raises(ValueError).when_called_with(
+            gsf_file, [1], {"depth": np.zeros((1, 7))}
+        )
@@ -0,0 +1,17 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09.grid import Grid, GridSpec, grid_file
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_grid_file(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    spec = GridSpec.from_bounds(17.84, -64.6, 17.85, -64.59, cell_size=0.001)
+    grid = Grid(tmp_path / "grid", spec)
+
+    added = grid_file(gsf_test_data_03_09.path, grid)
+
+    # The test file holds no across track distances, so no soundings have positions
+    assert_that(added).is_equal_to(0)
+    assert_that(grid.tile_keys()).is_empty()
+    assert_that(np.isnan(grid.surface("mean")).all()).is_true()
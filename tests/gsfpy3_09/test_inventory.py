@@ -0,0 +1,42 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09.enums import RecordType, ScaledSwathBathySubRecord
+from gsfpy3_09.inventory import inspect
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_inspect(gsf_test_data_03_09: GsfDatafile):
+    inventory = inspect(gsf_test_data_03_09.path)
+
+    assert_that(inventory.size).is_equal_to(gsf_test_data_03_09.path.stat().st_size)
+    assert_that(inventory.record_counts).is_equal_to(
+        {
+            RecordType.GSF_RECORD_HEADER: 1,
+            RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING: 3,
+            RecordType.GSF_RECORD_COMMENT: 1,
+            RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY: 1,
+        }
+    )
+    assert_that(inventory.number_pings).is_equal_to(3)
+    assert_that(inventory.start_time).is_close_to(1541193704.56, 0.001)
+    assert_that(inventory.end_time).is_equal_to(inventory.start_time)
+    assert_that(inventory.sensor_ids).is_equal_to([0])
+    assert_that(inventory.number_beams).is_equal_to({7: 3})
+    assert_that(inventory.subrecords).is_equal_to(
+        [
+            ScaledSwathBathySubRecord.GSF_SWATH_BATHY_SUBRECORD_DEPTH_ARRAY,
+            ScaledSwathBathySubRecord.GSF_SWATH_BATHY_SUBRECORD_BEAM_FLAGS_ARRAY,
+        ]
+    )
+    assert_that(inventory.scaled_subrecords).is_equal_to(inventory.subrecords)
+    assert_that(inventory.contains_amplitude).is_false()
+    assert_that(inventory.contains_imagery).is_false()
+
+
+def test_inspect_with_index(gsf_test_data_03_09: GsfDatafile):
+    sequential = inspect(gsf_test_data_03_09.path)
+    indexed = inspect(gsf_test_data_03_09.path, use_index=True)
+
+    assert_that(indexed).is_equal_to(sequential)
+    assert_that(np.isnan(indexed.start_time)).is_false()
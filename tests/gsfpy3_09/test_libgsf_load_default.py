@@ -10,9 +10,11 @@ def test_libgsf_load_succeeds_with_no_path(mocker):
         mocker.patch.dict(os.environ, {})
 
         # Act
-        import gsfpy3_09  # noqa
+        import gsfpy3_09.bindings  # noqa
 
-        reload(gsfpy3_09)
+        # libgsf is loaded when first called rather than when imported
+        reload(gsfpy3_09.bindings)
+        gsfpy3_09.bindings.gsfIntError()
 
     except Exception:
         # Assert
@@ -17,9 +17,11 @@ def test_libgsf_load_succeeds_with_valid_path(mocker):
         )
 
         # Act
-        import gsfpy3_09  # noqa
+        import gsfpy3_09.bindings  # noqa
 
-        reload(gsfpy3_09)
+        # libgsf is loaded when first called rather than when imported
+        reload(gsfpy3_09.bindings)
+        gsfpy3_09.bindings.gsfIntError()
 
     except Exception:
         # Assert
@@ -0,0 +1,21 @@
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.lines import find_survey_lines, new_line_indices
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_new_line_indices():
+    heading = [350.0, 355.0, 5.0, 20.0, 25.0, 200.0]
+
+    # As with libgsf, changes across north start a new line beyond 10 degrees
+    assert_that(new_line_indices(heading, 15.0).tolist()).is_equal_to([2, 4, 5])
+
+
+def test_find_survey_lines(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        lines = find_survey_lines(gsf_file, 10.0)
+
+    assert_that(lines).is_length(1)
+    assert_that(lines[0].first_record_number).is_equal_to(1)
+    assert_that(lines[0].last_record_number).is_equal_to(3)
@@ -0,0 +1,37 @@
+from ctypes import byref
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.bindings import gsfInitializeMBParams
+from gsfpy3_09.gsfMBParams import c_gsfMBParams
+from gsfpy3_09.params import MBParams
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def _initialised_params() -> c_gsfMBParams:
+    params = c_gsfMBParams()
+    gsfInitializeMBParams(byref(params))
+    return params
+
+
+def test_mb_params_unknown():
+    c_params = _initialised_params()
+    params = MBParams(c_params, time=1.0, number_arrays=1)
+
+    assert_that(bool(np.isnan(params.offsets().transducer).all())).is_true()
+    assert_that(params).is_equal_to(MBParams(_initialised_params(), 1.0, 1))
+    assert_that(params).is_not_equal_to(MBParams(c_params, 2.0, 1))
+
+    c_params.to_apply.transducer_x_offset[0] = 1.5
+    changed = MBParams(c_params, time=1.0, number_arrays=1)
+    assert_that(changed).is_not_equal_to(params)
+    assert_that(changed.offsets().transducer[0, 0]).is_equal_to(1.5)
+
+
+def test_gsf_file_mb_params_none(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        while gsf_file.try_read().status == 0:
+            pass
+        assert_that(gsf_file.mb_params).is_none()
@@ -0,0 +1,14 @@
+from assertpy import assert_that
+
+from gsfpy3_09.enums import FileMode, RecordType
+from gsfpy3_09.pool import GsfFilePool, PoolStats
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_read(gsf_test_data_03_09: GsfDatafile):
+    with GsfFilePool(1, FileMode.GSF_READONLY) as pool:
+        pool.read(gsf_test_data_03_09.path, RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        pool.evict(gsf_test_data_03_09.path)
+        pool.read(gsf_test_data_03_09.path, RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+        assert_that(pool.stats).is_equal_to(PoolStats(misses=2, reopens=1))
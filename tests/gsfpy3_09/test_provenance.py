@@ -0,0 +1,13 @@
+from assertpy import assert_that
+
+from gsfpy3_09.provenance import read_provenance
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_read_provenance(gsf_test_data_03_09: GsfDatafile):
+    provenance = read_provenance(gsf_test_data_03_09.path)
+
+    assert_that(provenance.comments.comment).is_equal_to(["My comment"])
+    assert_that(provenance.comments.time.tolist()).is_equal_to([0.0])
+    assert_that(provenance.history.time).is_length(0)
+    assert_that(provenance.history.host_name).is_empty()
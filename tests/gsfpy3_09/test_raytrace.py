@@ -0,0 +1,116 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09.raytrace import launch_vectors, nominal_depth, ray_trace
+from gsfpy3_09.svp import SoundVelocityProfile, SvpLayers
+
+
+def _layers(depth, sound_speed) -> SvpLayers:
+    return SoundVelocityProfile(
+        observation_time=0.0,
+        application_time=0.0,
+        latitude=0.0,
+        longitude=0.0,
+        depth=np.array(depth, dtype=np.float64),
+        sound_speed=np.array(sound_speed, dtype=np.float64),
+    ).to_layers()
+
+
+def test_launch_vectors():
+    x, y, z = launch_vectors(np.array([0.0, 90.0, -90.0]), np.array([90.0, 90.0, 0.0]))
+
+    assert_that(np.allclose(x, [0.0, -1.0, 0.0])).is_true()
+    assert_that(np.allclose(y, [0.0, 0.0, 1.0])).is_true()
+    assert_that(np.allclose(z, [1.0, 0.0, 0.0])).is_true()
+
+
+def test_ray_trace_constant_sound_speed():
+    layers = _layers([0.0, 100.0], [1500.0, 1500.0])
+
+    xyz = ray_trace(layers, np.array([0.2, 0.2, 0.2]), np.array([0.0, 30.0, -30.0]))
+
+    slant_depth = 150.0 * np.cos(np.radians(30.0))
+    assert_that(np.allclose(xyz.depth, [150.0, slant_depth, slant_depth])).is_true()
+    assert_that(np.allclose(xyz.across_track, [0.0, -75.0, 75.0])).is_true()
+    assert_that(np.allclose(xyz.along_track, 0.0)).is_true()
+
+
+def test_ray_trace_vertical_in_gradient():
+    gradient = 0.05
+    layers = _layers([0.0, 5000.0], [1500.0, 1500.0 + gradient * 5000.0])
+    travel_time = np.array([0.5, 2.0, 8.0])
+
+    xyz = ray_trace(layers, travel_time, np.zeros(3))
+
+    # Beyond the deepest layer the sound speed is constant
+    in_profile = 1500.0 * np.expm1(gradient * travel_time[:2] / 2) / gradient
+    time_below = travel_time[2] / 2 - np.log(1750.0 / 1500.0) / gradient
+    below_profile = 5000.0 + 1750.0 * time_below
+    assert_that(np.allclose(xyz.depth, np.append(in_profile, below_profile))).is_true()
+    assert_that(np.allclose(xyz.across_track, 0.0)).is_true()
+
+
+def test_ray_trace_layer_boundaries_do_not_change_result():
+    coarse = _layers([0.0, 1000.0, 3000.0], [1540.0, 1490.0, 1520.0])
+    fine = _layers(
+        np.linspace(0.0, 3000.0, 13),
+        np.interp(
+            np.linspace(0.0, 3000.0, 13),
+            [0.0, 1000.0, 3000.0],
+            [1540.0, 1490.0, 1520.0],
+        ),
+    )
+    travel_time = np.full(5, 3.0)
+    beam_angle = np.array([-60.0, -30.0, 0.0, 30.0, 60.0])
+
+    coarse_xyz = ray_trace(coarse, travel_time, beam_angle)
+    fine_xyz = ray_trace(fine, travel_time, beam_angle)
+
+    for coarse_values, fine_values in zip(coarse_xyz, fine_xyz):
+        assert_that(np.allclose(coarse_values, fine_values, atol=1e-6)).is_true()
+
+
+def test_ray_trace_port_starboard_symmetry():
+    layers = _layers([0.0, 1000.0, 3000.0], [1540.0, 1490.0, 1520.0])
+
+    xyz = ray_trace(layers, np.full(2, 2.5), np.array([50.0, -50.0]))
+
+    assert_that(xyz.across_track[0]).is_negative()
+    assert_that(xyz.across_track[0]).is_close_to(-xyz.across_track[1], 1e-9)
+    assert_that(xyz.depth[0]).is_close_to(xyz.depth[1], 1e-9)
+
+
+def test_ray_trace_attitude_and_beam_angle_forward():
+    layers = _layers([0.0, 1000.0, 3000.0], [1540.0, 1490.0, 1520.0])
+
+    rolled = ray_trace(layers, 2.0, 0.0, roll=10.0)
+    tilted = ray_trace(layers, 2.0, 10.0)
+    forward = ray_trace(layers, 2.0, 0.0, beam_angle_forward=80.0)
+
+    for rolled_value, tilted_value in zip(rolled, tilted):
+        assert_that(float(rolled_value)).is_close_to(float(tilted_value), 1e-9)
+    assert_that(float(forward.along_track)).is_positive()
+    assert_that(float(forward.across_track)).is_close_to(0.0, 1e-9)
+
+
+def test_ray_trace_transducer_depth_and_invalid_beams():
+    layers = _layers([0.0, 100.0], [1500.0, 1500.0])
+
+    xyz = ray_trace(
+        layers, np.array([0.2, np.nan]), np.array([0.0, 0.0]), transducer_depth=5.0
+    )
+
+    assert_that(xyz.depth[0]).is_close_to(155.0, 1e-9)
+    assert_that(np.isnan(xyz.depth[1])).is_true()
+
+
+def test_nominal_depth():
+    depth = nominal_depth(
+        np.array([0.2, 0.2, 0.2]),
+        np.array([0.0, 60.0, 0.0]),
+        np.array([90.0, 90.0, 0.0]),
+        transducer_depth=2.0,
+    )
+
+    assert_that(np.allclose(depth[:2], [152.0, 77.0])).is_true()
+    assert_that(np.isnan(depth[2])).is_true()
@@ -23,6 +23,19 @@ def test_read(gsf_test_data: GsfDatafile):
         # fmt: on
 
 
+def test_read_position(gsf_test_data_03_09: GsfDatafile):
+    with gsfpy3_09.open_gsf(
+        gsf_test_data_03_09.path, FileMode.GSF_READONLY
+    ) as gsf_file:
+        _, record = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING, 1)
+
+    # The test file was surveyed off the US Virgin Islands
+    assert_that(record.mb_ping.latitude).is_between(-90, 90)
+    assert_that(record.mb_ping.longitude).is_between(-180, 180)
+    assert_that(record.mb_ping.latitude).is_close_to(17.8471517, 1e-7)
+    assert_that(record.mb_ping.longitude).is_close_to(-64.5970738, 1e-7)
+
+
 def test_write_update_sequential(gsf_test_data: GsfDatafile):
     with gsfpy3_09.open_gsf(gsf_test_data.path, FileMode.GSF_UPDATE) as gsf_file:
         _, record = gsf_file.read(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
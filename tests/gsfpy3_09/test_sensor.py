@@ -0,0 +1,45 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import SensorSpecificSubRecord
+from gsfpy3_09.gsfSensorSpecific import c_gsfSensorSpecific
+from gsfpy3_09.gsfSwathBathyPing import c_gsfSwathBathyPing
+from gsfpy3_09.sensor import (
+    SENSOR_SPECIFIC_MEMBERS,
+    decode_sensor_specific,
+    read_sensor_columns,
+    sensor_specific_member,
+)
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_sensor_specific_members():
+    union_members = {name for name, _ in c_gsfSensorSpecific._fields_}
+    assert_that(union_members).contains(*SENSOR_SPECIFIC_MEMBERS.values())
+    assert_that(sensor_specific_member(156)).is_equal_to("gsfKMallSpecific")
+
+
+def test_decode_sensor_specific_kmall_sectors():
+    mb_ping = c_gsfSwathBathyPing()
+    mb_ping.sensor_id = SensorSpecificSubRecord.GSF_SWATH_BATHY_SUBRECORD_KMALL_SPECIFIC
+    kmall = mb_ping.sensor_data.gsfKMallSpecific
+    kmall.numTxSectors = 3
+    for number, sector in enumerate(kmall.sector):
+        sector.txSectorNumb = number
+    kmall.numExtraDetectionClasses = 1
+
+    decoded = decode_sensor_specific(mb_ping)
+
+    assert_that(decoded["sector"]["txSectorNumb"].tolist()).is_equal_to([0, 1, 2])
+    assert_that(decoded["extraDetClassInfo"]).is_length(1)
+    assert_that(decoded).does_not_contain_key("spare")
+
+
+def test_read_sensor_columns_unknown_sensor(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        columns = read_sensor_columns(gsf_file, ["pingRate_Hz", "numTxSectors"])
+
+    assert_that(columns.sensor_id.tolist()).is_equal_to([0, 0, 0])
+    assert_that(bool(np.isnan(columns.columns["pingRate_Hz"]).all())).is_true()
+    assert_that(columns.columns["numTxSectors"].tolist()).is_equal_to([0, 0, 0])
@@ -0,0 +1,75 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import FileMode
+from gsfpy3_09.singlebeam import (
+    read_single_beam_pings,
+    single_beam_ping_times,
+    write_single_beam_pings,
+)
+from gsfpy3_09.structured import SINGLE_BEAM_PING_DTYPE
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def _pings(number_pings: int) -> np.ndarray:
+    pings = np.zeros(number_pings, dtype=SINGLE_BEAM_PING_DTYPE)
+    pings["ping_time"]["tv_sec"] = 1600000000 + np.arange(number_pings)
+    pings["ping_time"]["tv_nsec"] = 500000000
+    pings["latitude"] = 50.0 + np.arange(number_pings) * 0.001
+    pings["longitude"] = -4.0
+    pings["depth"] = 20.0 + np.arange(number_pings)
+    pings["tide_corrector"] = 1.5
+    pings["positioning_system_type"] = 2
+    pings["sensor_id"] = 201
+    pings["sensor_data"]["gsfEchotracSpecific"]["navigation_error"] = 7
+    return pings
+
+
+def test_write_and_read_single_beam_pings(tmp_path):
+    path = tmp_path / "single_beam.gsf"
+    pings = _pings(5)
+
+    with open_gsf(path, FileMode.GSF_CREATE) as gsf_file:
+        assert_that(write_single_beam_pings(gsf_file, pings)).is_equal_to(5)
+
+    with open_gsf(path) as gsf_file:
+        read = read_single_beam_pings(gsf_file)
+        assert_that(read_single_beam_pings(gsf_file)).is_length(5)
+
+    assert_that(read.dtype).is_equal_to(SINGLE_BEAM_PING_DTYPE)
+    assert_that(read.tobytes()).is_equal_to(pings.tobytes())
+    assert_that(single_beam_ping_times(read).tolist()).is_equal_to(
+        [1600000000.5 + ping for ping in range(5)]
+    )
+
+
+def test_update_single_beam_pings(tmp_path):
+    path = tmp_path / "single_beam.gsf"
+    with open_gsf(path, FileMode.GSF_CREATE) as gsf_file:
+        write_single_beam_pings(gsf_file, _pings(4))
+
+    with open_gsf(path, FileMode.GSF_UPDATE_INDEX) as gsf_file:
+        pings = read_single_beam_pings(gsf_file, [2, 4])
+        pings["depth"] += 100.0
+        write_single_beam_pings(gsf_file, pings, [2, 4])
+
+    with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        depth = read_single_beam_pings(gsf_file)["depth"]
+
+    assert_that(depth.tolist()).is_equal_to([20.0, 121.0, 22.0, 123.0])
+
+
+def test_read_single_beam_pings_none(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        pings = read_single_beam_pings(gsf_file)
+
+    assert_that(pings).is_length(0)
+    assert_that(pings.dtype).is_equal_to(SINGLE_BEAM_PING_DTYPE)
+
+
+def test_write_single_beam_pings_dtype(tmp_path):
+    with open_gsf(tmp_path / "single_beam.gsf", FileMode.GSF_CREATE) as gsf_file:
+        assert_that(write_single_beam_pings).raises(ValueError).when_called_with(
+            gsf_file, np.zeros(1, dtype=[("depth", np.float64)])
+        )
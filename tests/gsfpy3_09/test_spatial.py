@@ -0,0 +1,28 @@
+from assertpy import assert_that
+
+from gsfpy3_09.spatial import GsfDataset
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_gsf_dataset(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    path = str(gsf_test_data_03_09.path)
+
+    dataset = GsfDataset([path], index_path=tmp_path / "survey.npz", max_workers=1)
+
+    assert_that(dataset.query_bbox(17.8, -64.6, 17.9, -64.5)).is_equal_to(
+        [(path, 1), (path, 2), (path, 3)]
+    )
+    assert_that(dataset.query_bbox(17.9, -64.6, 18.0, -64.5)).is_empty()
+
+
+def test_gsf_dataset_query_polygon(gsf_test_data_03_09: GsfDatafile):
+    path = str(gsf_test_data_03_09.path)
+    dataset = GsfDataset([path], max_workers=1)
+
+    # The pings have no across track distances, so only their positions are tested
+    assert_that(
+        dataset.query_polygon([(17.8, -64.6), (17.9, -64.6), (17.9, -64.5)])
+    ).is_equal_to([(path, 1), (path, 2), (path, 3)])
+    assert_that(
+        dataset.query_polygon([(17.8, -64.6), (17.8, -64.5), (17.9, -64.5)])
+    ).is_empty()
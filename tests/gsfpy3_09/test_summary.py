@@ -0,0 +1,30 @@
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import FileMode
+from gsfpy3_09.summary import SwathSummary, read_summary, summarise, update_summary
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_merge():
+    summary = SwathSummary(10.0, 20.0, -1.0, 100.0, 1.0, 101.0, 5.0, 50.0)
+
+    assert_that(summary.merge(SwathSummary())).is_equal_to(summary)
+    assert_that(summary.merge(summary)).is_equal_to(summary)
+
+
+def test_update_summary(gsf_test_data_03_09: GsfDatafile):
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        expected = summarise(gsf_file, block_size=2)
+
+    written = update_summary(gsf_test_data_03_09.path, block_size=2)
+
+    assert_that(written).is_equal_to(expected)
+    assert_that(written.min_latitude).is_close_to(17.8471517, 1e-7)
+    assert_that(written.min_longitude).is_close_to(-64.5970738, 1e-7)
+    assert_that(written.start_time).is_close_to(1541193704.56, 1e-3)
+    with open_gsf(gsf_test_data_03_09.path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        summary = read_summary(gsf_file)
+    assert_that(summary.min_depth).is_close_to(written.min_depth, 0.01)
+    assert_that(summary.max_depth).is_close_to(written.max_depth, 0.01)
+    assert_that(summary.max_latitude).is_close_to(written.max_latitude, 1e-7)
@@ -0,0 +1,94 @@
+from ctypes import c_double
+
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import FileMode, RecordType
+from gsfpy3_09.gsfRecords import c_gsfRecords
+from gsfpy3_09.svp import SoundVelocityProfile, SvpCatalogue, load_svp_catalogue
+
+
+def _profile(application_time, latitude=0.0, longitude=0.0):
+    return SoundVelocityProfile(
+        observation_time=application_time - 60,
+        application_time=application_time,
+        latitude=latitude,
+        longitude=longitude,
+        depth=np.array([2.0, 10.0, 10.0, 50.0]),
+        sound_speed=np.array([1500.0, 1490.0, 1480.0, 1510.0]),
+    )
+
+
+def _write_svp(gsf_file, application_time, depth, sound_speed):
+    record = c_gsfRecords()
+    record.svp.observation_time.tv_sec = application_time - 60
+    record.svp.application_time.tv_sec = application_time
+    record.svp.number_points = len(depth)
+    record.svp.depth = (c_double * len(depth))(*depth)
+    record.svp.sound_speed = (c_double * len(sound_speed))(*sound_speed)
+    gsf_file.write(record, RecordType.GSF_RECORD_SOUND_VELOCITY_PROFILE)
+
+
+def test_load_svp_catalogue(tmp_path):
+    path = tmp_path / "svp.gsf"
+    with open_gsf(path, FileMode.GSF_CREATE) as gsf_file:
+        _write_svp(gsf_file, 2000, [0.0, 100.0], [1500.0, 1480.0])
+        _write_svp(gsf_file, 1000, [0.0, 50.0, 200.0], [1520.0, 1510.0, 1490.0])
+
+    catalogue = load_svp_catalogue(path)
+
+    assert_that(len(catalogue)).is_equal_to(2)
+    assert_that(catalogue.application_times.tolist()).is_equal_to([1000.0, 2000.0])
+    assert_that(catalogue[0].depth.tolist()).is_equal_to([0.0, 50.0, 200.0])
+    assert_that(catalogue[1].sound_speed.tolist()).is_equal_to([1500.0, 1480.0])
+    assert_that(catalogue[1].observation_time).is_equal_to(1940.0)
+
+
+def test_profile_in_effect_at_time():
+    catalogue = SvpCatalogue([_profile(300.0), _profile(100.0), _profile(200.0)])
+
+    assert_that(catalogue.index_at(50.0)).is_equal_to(0)
+    assert_that(catalogue.index_at(100.0)).is_equal_to(0)
+    assert_that(catalogue.index_at(250.0)).is_equal_to(1)
+    assert_that(catalogue.profile_at(1000.0).application_time).is_equal_to(300.0)
+    assert_that(
+        catalogue.indices_at(np.array([0.0, 150.0, 200.0, 301.0])).tolist()
+    ).is_equal_to([0, 0, 1, 2])
+
+
+def test_nearest_profile_by_position():
+    catalogue = SvpCatalogue(
+        [
+            _profile(100.0, latitude=50.0, longitude=-1.0),
+            _profile(200.0, latitude=50.0, longitude=1.0),
+            _profile(300.0, latitude=50.0, longitude=1.1),
+        ]
+    )
+
+    assert_that(catalogue.nearest_index(50.0, -0.9)).is_equal_to(0)
+    assert_that(catalogue.nearest_index(50.0, 1.2)).is_equal_to(2)
+    assert_that(catalogue.nearest_index(50.0, 1.2, time=250.0)).is_equal_to(1)
+    assert_that(
+        catalogue.nearest_index(50.0, -0.9, time=250.0, max_age=60.0)
+    ).is_equal_to(1)
+
+
+def test_layers_derived_and_cached():
+    catalogue = SvpCatalogue([_profile(100.0)])
+
+    layers = catalogue.layers(0)
+
+    assert_that(layers.depth.tolist()).is_equal_to([0.0, 2.0, 10.0, 50.0])
+    assert_that(layers.sound_speed.tolist()).is_equal_to(
+        [1500.0, 1500.0, 1490.0, 1510.0]
+    )
+    assert_that(layers.gradient.tolist()).is_equal_to([0.0, -1.25, 0.5])
+    assert_that(layers.number_layers).is_equal_to(3)
+    assert_that(catalogue.layers_at(500.0)).is_same_as(layers)
+
+
+def test_empty_catalogue():
+    catalogue = SvpCatalogue([])
+
+    assert_that(catalogue.profile_at).raises(LookupError).when_called_with(0.0)
@@ -0,0 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import FileMode, RecordType
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def _count_pings(path) -> int:
+    with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+        return gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+
+
+def test_parallel_reads(gsf_test_data_03_09: GsfDatafile):
+    with ThreadPoolExecutor(4) as executor:
+        counts = list(executor.map(_count_pings, [gsf_test_data_03_09.path] * 8))
+
+    assert_that(counts).is_equal_to([3] * 8)
@@ -0,0 +1,69 @@
+from ctypes import create_string_buffer
+
+import pytest
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.enums import FileMode, RecordType
+from gsfpy3_09.gsfRecords import c_gsfRecords
+from gsfpy3_09.tools import merge, split, split_survey_lines
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+
+def test_split_survey_lines(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    parts = split_survey_lines(gsf_test_data_03_09.path, tmp_path, 10.0)
+
+    assert_that(parts).is_length(1)
+    with open_gsf(parts[0], FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        ).is_equal_to(3)
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHY_SUMMARY)
+        ).is_equal_to(1)
+
+
+def test_split_and_merge(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    parts = split(gsf_test_data_03_09.path, 2, "records", tmp_path)
+    merge(parts, tmp_path / "merged.gsf")
+
+    number_pings = []
+    for path in parts + [tmp_path / "merged.gsf"]:
+        with open_gsf(path, FileMode.GSF_READONLY_INDEX) as gsf_file:
+            number_pings.append(
+                gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+            )
+    assert_that(number_pings).is_equal_to([2, 1, 3])
+
+
+def _write_comment_only_file(path):
+    records = c_gsfRecords()
+    comment = b"No pings here"
+    records.comment.comment_length = len(comment)
+    records.comment.comment = create_string_buffer(comment)
+    with open_gsf(path, FileMode.GSF_CREATE) as gsf_file:
+        gsf_file.write(records, RecordType.GSF_RECORD_COMMENT)
+
+
+@pytest.mark.parametrize("by, every", [("records", 2), ("time", 10.0), ("size", 1000)])
+def test_split_file_without_pings(tmp_path, by, every):
+    path = tmp_path / "comments.gsf"
+    _write_comment_only_file(path)
+
+    parts = split(path, every, by, tmp_path / "parts")
+
+    assert_that(parts).is_length(1)
+    with open_gsf(parts[0], FileMode.GSF_READONLY_INDEX) as gsf_file:
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_SWATH_BATHYMETRY_PING)
+        ).is_zero()
+        assert_that(
+            gsf_file.get_number_records(RecordType.GSF_RECORD_COMMENT)
+        ).is_equal_to(1)
+
+
+@pytest.mark.parametrize("every", [0.5, 1.5])
+def test_split_by_fractional_records(gsf_test_data_03_09: GsfDatafile, tmp_path, every):
+    assert_that(split).raises(ValueError).when_called_with(
+        gsf_test_data_03_09.path, every, "records", tmp_path
+    )
@@ -0,0 +1,125 @@
+import numpy as np
+from assertpy import assert_that
+
+from gsfpy3_09 import open_gsf
+from gsfpy3_09.columnar import PingBlock, iter_ping_blocks
+from gsfpy3_09.svp import NOMINAL_SOUND_SPEED
+from gsfpy3_09.tpu import (
+    CONFIDENCE_95,
+    InstallationOffsets,
+    TpuModel,
+    compute_tpu,
+    update_tpu,
+)
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+_NO_UNCERTAINTY = TpuModel(
+    position=0.0,
+    heading=0.0,
+    roll=0.0,
+    pitch=0.0,
+    heave=0.0,
+    heave_fraction=0.0,
+    draft=0.0,
+    surface_sound_speed=0.0,
+    sound_speed=0.0,
+)
+
+
+def _ping_block(depth, across_track, ping_time, **beam_arrays) -> PingBlock:
+    depth = np.array(depth, dtype=np.float64)
+    number_pings = depth.shape[0]
+    columns = {
+        "depth": depth,
+        "across_track": np.array(across_track, dtype=np.float64),
+        "along_track": np.zeros_like(depth),
+        "roll": np.zeros(number_pings),
+        "pitch": np.zeros(number_pings),
+        "heave": np.zeros(number_pings),
+    }
+    columns.update(
+        (field, np.array(values, dtype=np.float64))
+        for field, values in beam_arrays.items()
+    )
+    return PingBlock(
+        np.arange(1, number_pings + 1), np.array(ping_time, dtype=np.float64), columns
+    )
+
+
+def _offsets(time: float, draft: float) -> InstallationOffsets:
+    return InstallationOffsets(
+        time=time,
+        draft=draft,
+        transducer=np.zeros(3),
+        antenna=np.zeros(3),
+        mru=np.zeros(3),
+    )
+
+
+def test_compute_tpu_sonar_and_position():
+    block = _ping_block(
+        [[100.0, 100.0]],
+        [[-50.0, 50.0]],
+        [0.0],
+        sonar_vert_uncert=[[0.5, 0.25]],
+        sonar_horz_uncert=[[0.0, np.nan]],
+    )
+
+    tpu = compute_tpu(block, model=_NO_UNCERTAINTY._replace(position=2.0))
+
+    assert_that(
+        np.allclose(tpu.vertical_error, CONFIDENCE_95 * np.array([0.5, 0.25]))
+    ).is_true()
+    assert_that(np.allclose(tpu.horizontal_error, CONFIDENCE_95 * 2.0)).is_true()
+
+
+def test_compute_tpu_attitude():
+    block = _ping_block([[100.0, 100.0, np.nan]], [[0.0, 100.0, 0.0]], [0.0])
+    roll = np.radians(1.0)
+
+    tpu = compute_tpu(block, model=_NO_UNCERTAINTY._replace(roll=1.0))
+
+    assert_that(
+        np.allclose(
+            tpu.vertical_error[0, :2], CONFIDENCE_95 * roll * np.array([0, 100])
+        )
+    ).is_true()
+    assert_that(
+        np.allclose(tpu.horizontal_error[0, :2], CONFIDENCE_95 * roll * 100.0)
+    ).is_true()
+    assert_that(np.isnan(tpu.vertical_error[0, 2])).is_true()
+
+
+def test_compute_tpu_uses_offsets_in_effect():
+    block = _ping_block([[100.0], [100.0], [100.0]], [[0.0], [0.0], [0.0]], [5, 15, 25])
+    offsets = [_offsets(10.0, 2.0), _offsets(20.0, 4.0)]
+
+    tpu = compute_tpu(block, offsets, _NO_UNCERTAINTY._replace(sound_speed=15.0))
+
+    expected = CONFIDENCE_95 * np.array([[98.0], [98.0], [96.0]]) * 15.0
+    assert_that(
+        np.allclose(tpu.vertical_error, expected / NOMINAL_SOUND_SPEED)
+    ).is_true()
+
+
+def test_update_tpu(gsf_test_data_03_09: GsfDatafile, tmp_path):
+    target_path = tmp_path / "tpu.gsf"
+
+    # Pings without error arrays cannot be updated in place
+    assert_that(update_tpu).raises(ValueError).when_called_with(
+        gsf_test_data_03_09.path
+    )
+    assert_that(
+        update_tpu(gsf_test_data_03_09.path, target_path=target_path)
+    ).is_equal_to(3)
+
+    with open_gsf(gsf_test_data_03_09.path) as gsf_file:
+        (source,) = iter_ping_blocks(gsf_file, ["depth"])
+    with open_gsf(target_path) as gsf_file:
+        (target,) = iter_ping_blocks(
+            gsf_file, ["depth", "vertical_error", "horizontal_error"]
+        )
+
+    assert_that(np.array_equal(target["depth"], source["depth"])).is_true()
+    assert_that(np.isfinite(target["vertical_error"]).all()).is_true()
+    assert_that(np.isfinite(target["horizontal_error"]).all()).is_true()
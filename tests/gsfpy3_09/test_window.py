@@ -0,0 +1,23 @@
+from assertpy import assert_that
+
+from gsfpy3_09.window import extract_time_window
+from tests.gsfpy3_09.conftest import GsfDatafile
+
+PING_TIME = 1541193704.56
+
+
+def test_extract_time_window(gsf_test_data_03_09: GsfDatafile):
+    window = list(
+        extract_time_window(
+            [gsf_test_data_03_09.path],
+            PING_TIME - 1,
+            PING_TIME + 1,
+            use_summaries=False,
+        )
+    )
+
+    assert_that(window).is_length(1)
+    assert_that(window[0].block.number_pings).is_equal_to(3)
+    assert_that(
+        list(extract_time_window([gsf_test_data_03_09.path], 0, PING_TIME - 1))
+    ).is_empty()